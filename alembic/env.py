@@ -19,6 +19,7 @@ from app.core.config import settings
 from app.db.session import Base
 # Import all models here so that Alembic can see them and autogenerate migrations.
 from app.db.base import * # noqa
+from app.services.audit_log_partition import PARTITION_NAME_PATTERN
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -31,6 +32,12 @@ if config.config_file_name is not None:
 # Set the target metadata for autogenerate support.
 target_metadata = Base.metadata
 
+def include_name(name, type_, parent_names):
+    """Leaves the audit_log partitions, which are managed at runtime, out of autogenerate."""
+    if type_ == "table":
+        return PARTITION_NAME_PATTERN.match(name) is None
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = settings.DATABASE_URL
@@ -39,6 +46,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -58,30 +66,12 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
             context.run_migrations()
 
-            sql_script_path = Path(__file__).parent / "sql" / "cap_audit_log.sql"
-            if sql_script_path.is_file():
-                # Only execute if the table exists
-                result = connection.execute(
-                    sa.text("""
-                        SELECT EXISTS (
-                            SELECT 1 
-                            FROM information_schema.tables 
-                            WHERE table_name = 'audit_log'
-                        );
-                    """)
-                )
-                table_exists = result.scalar()
-                if table_exists:
-                    sql = sql_script_path.read_text()
-                    connection.execute(sa.text(sql))
-
-
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,35 @@
+"""recalculate draft totals
+
+Revision ID: 3f9a1c7d2e54
+Revises: b64452ea0af8
+Create Date: 2026-10-19 11:02:17.530412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7d2e54'
+down_revision = 'b64452ea0af8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # total_price is now maintained incrementally, so every draft must start from
+    # sum(signed item prices) - discount, including drafts that have no items yet.
+    op.execute("""
+        UPDATE transaction AS t
+        SET total_price = COALESCE((
+            SELECT SUM(CASE WHEN ti.transaction_type = 'SELL' THEN ti.total_price ELSE -ti.total_price END)
+            FROM transaction_item AS ti
+            WHERE ti.transaction_id = t.id
+        ), 0) - t.discount
+        WHERE t.status = 'DRAFT'
+    """)
+
+
+def downgrade() -> None:
+    # Data-only migration; the recalculated totals stay valid.
+    pass
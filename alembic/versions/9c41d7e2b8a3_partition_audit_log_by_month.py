@@ -0,0 +1,109 @@
+"""partition audit_log by month
+
+Revision ID: 9c41d7e2b8a3
+Revises: 17acaaf2fee3
+Create Date: 2026-10-19 14:12:40.118203
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9c41d7e2b8a3'
+down_revision = '17acaaf2fee3'
+branch_labels = None
+depends_on = None
+
+# Months created ahead of the current one; the application keeps this many from then on.
+MONTHS_AHEAD = 3
+COLUMNS = "id, created_at, updated_at, user_id, operation, table_name, before_state, after_state"
+
+
+def _create_audit_log(table_name, **kwargs):
+    op.create_table(table_name,
+    sa.Column('user_id', sa.UUID(), nullable=True, comment='The user who performed the action. Can be null for system actions.'),
+    sa.Column('operation', sa.Enum('CREATE', 'UPDATE', 'DELETE', name='operationtype', native_enum=False), nullable=False),
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('before_state', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='The state of the record before the change (for UPDATE and DELETE).'),
+    sa.Column('after_state', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='The state of the record after the change (for CREATE and UPDATE).'),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=kwargs.pop('created_at_nullable')),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    kwargs.pop('primary_key'),
+    **kwargs
+    )
+
+
+def _next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def upgrade() -> None:
+    # Retention is now done by dropping whole partitions, so the row cap trigger that
+    # alembic/env.py used to install (and its DELETEs) goes away.
+    op.execute("DROP TRIGGER IF EXISTS audit_log_capper ON audit_log")
+    op.execute("DROP FUNCTION IF EXISTS cap_audit_log_table()")
+
+    op.rename_table('audit_log', 'audit_log_unpartitioned')
+    op.execute("ALTER INDEX audit_log_pkey RENAME TO audit_log_unpartitioned_pkey")
+    op.drop_index('ix_audit_log_user_id', table_name='audit_log_unpartitioned')
+    op.drop_index('ix_audit_log_table_name', table_name='audit_log_unpartitioned')
+    op.drop_index('ix_audit_log_operation', table_name='audit_log_unpartitioned')
+
+    # The partition key must be part of the primary key.
+    _create_audit_log(
+        'audit_log',
+        created_at_nullable=False,
+        primary_key=sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(op.f('ix_audit_log_created_at'), 'audit_log', ['created_at'], unique=False)
+    op.create_index(op.f('ix_audit_log_operation'), 'audit_log', ['operation'], unique=False)
+    op.create_index(op.f('ix_audit_log_table_name'), 'audit_log', ['table_name'], unique=False)
+    op.create_index(op.f('ix_audit_log_user_id'), 'audit_log', ['user_id'], unique=False)
+
+    # One partition per UTC month, from the oldest existing row to a few months ahead.
+    bind = op.get_bind()
+    now = datetime.now(timezone.utc)
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_log_unpartitioned")).scalar()
+    month = min(oldest or now, now).astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE audit_log_p{month:%Y_%m} PARTITION OF audit_log "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        )
+        month = _next_month(month)
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+
+    op.execute(f"""
+        INSERT INTO audit_log ({COLUMNS})
+        SELECT id, COALESCE(created_at, updated_at, now()), updated_at, user_id, operation, table_name, before_state, after_state
+        FROM audit_log_unpartitioned
+    """)
+    op.drop_table('audit_log_unpartitioned')
+
+
+def downgrade() -> None:
+    op.rename_table('audit_log', 'audit_log_partitioned')
+    op.drop_index('ix_audit_log_user_id', table_name='audit_log_partitioned')
+    op.drop_index('ix_audit_log_table_name', table_name='audit_log_partitioned')
+    op.drop_index('ix_audit_log_operation', table_name='audit_log_partitioned')
+    op.drop_index('ix_audit_log_created_at', table_name='audit_log_partitioned')
+    op.execute("ALTER INDEX audit_log_pkey RENAME TO audit_log_partitioned_pkey")
+
+    _create_audit_log('audit_log', created_at_nullable=True, primary_key=sa.PrimaryKeyConstraint('id'))
+    op.create_index(op.f('ix_audit_log_operation'), 'audit_log', ['operation'], unique=False)
+    op.create_index(op.f('ix_audit_log_table_name'), 'audit_log', ['table_name'], unique=False)
+    op.create_index(op.f('ix_audit_log_user_id'), 'audit_log', ['user_id'], unique=False)
+
+    op.execute(f"INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_partitioned")
+    # Dropping the parent drops its partitions too.
+    op.drop_table('audit_log_partitioned')
@@ -0,0 +1,34 @@
+"""restrict deleting folded inventory snapshots
+
+Revision ID: f01527065f6d
+Revises: 1f4b48794857
+Create Date: 2026-10-19 10:30:10.713402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f01527065f6d'
+down_revision = '1f4b48794857'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A NULL inventory_id means "pending", so deleting a snapshot must not produce one:
+    # its folded changes would be applied again by the next flush.
+    op.drop_constraint('inventory_change_inventory_id_fkey', 'inventory_change', type_='foreignkey')
+    op.create_foreign_key(
+        'inventory_change_inventory_id_fkey', 'inventory_change', 'inventory',
+        ['inventory_id'], ['id'], ondelete='RESTRICT',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('inventory_change_inventory_id_fkey', 'inventory_change', type_='foreignkey')
+    op.create_foreign_key(
+        'inventory_change_inventory_id_fkey', 'inventory_change', 'inventory',
+        ['inventory_id'], ['id'], ondelete='SET NULL',
+    )
@@ -49,7 +49,8 @@ def get_current_user(
     if token_data.sub is None:
         raise credentials_exception
         
-    user = user_repo.get(db, id=token_data.sub)
+    # The investor profile comes along so investor screens need no extra lookups.
+    user = user_repo.get_with_profile(db, id=token_data.sub)
     if not user:
         raise credentials_exception
     
@@ -13,12 +13,15 @@ from app.api.v1 import (
     audit_logs,
     transactions,
     transaction_items,
+    quotes,
+    reports,
     account_ledgers,
     payments,
     backup,
     investors_admin,
     investors_me,
-    investments
+    investments,
+    profit_distributions
 )
 
 # --- Main API Router ---
@@ -54,10 +57,13 @@ api_router.include_router(
 api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
 api_router.include_router(transactions.router, prefix="/transactions", tags=["Transactions"])
 api_router.include_router(transaction_items.router, prefix="/transaction-items", tags=["Transaction Items"])
+api_router.include_router(quotes.router, prefix="/quotes", tags=["Quotes"])
 api_router.include_router(account_ledgers.router, prefix="/account-ledgers", tags=["Account Ledgers"])
 api_router.include_router(payments.router, prefix="/payments", tags=["Payments"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 
 # --- Investor Endpoints ---
 api_router.include_router(investors_me.router, prefix="/investors", tags=["Investors - Me"]) # it should be before investor-admin
 api_router.include_router(investors_admin.router, prefix="/investors", tags=["Investors - Admin"])
-api_router.include_router(investments.router, prefix="/investments", tags=["Investments"])
\ No newline at end of file
+api_router.include_router(investments.router, prefix="/investments", tags=["Investments"])
+api_router.include_router(profit_distributions.router, prefix="/profit-distributions", tags=["Profit Distributions"])
\ No newline at end of file
@@ -20,8 +20,10 @@ tags_metadata = [
     # --- Financial Transaction Groups ---
     {"name": "Transactions", "description": "Endpoints for creating and managing sales and purchase transactions."},
     {"name": "Transaction Items", "description": "Endpoints for managing the individual line items within a transaction."},
+    {"name": "Quotes", "description": "Endpoints for pricing candidate lines without recording a transaction."},
     {"name": "Account Ledgers", "description": "Endpoints for tracking debts and credits with contacts."},
     {"name": "Payments", "description": "Endpoints for recording and managing financial payments."},
+    {"name": "Reports", "description": "[Admin Only] Endpoints for precomputed business reports."},
 
     # --- Investor Groups ---
     {"name": "Investors - Admin", "description": "[Admin Only] Endpoints for creating and managing investors."},
@@ -5,7 +5,7 @@ from typing import List, Optional
 
 from app.api import deps
 from app.models.user import User
-from app.schema.account_ledger import AccountLedgerCreate, AccountLedgerUpdate, AccountLedgerPublic
+from app.schema.account_ledger import AccountLedgerCreate, AccountLedgerUpdate, AccountLedgerPublic, DebtAgingReport
 from app.schema.error import ErrorDetail
 from app.services.account_ledger import account_ledger_service
 
@@ -63,6 +63,29 @@ def search_account_ledgers(
         limit=limit
     )
 
+@router.get(
+    "/aging",
+    response_model=DebtAgingReport,
+    summary="Debt Aging Report",
+    description=(
+        "Splits all outstanding debt into buckets by deadline: not due, due within 7 days, overdue 0-30, 31-60, "
+        "61-90 and over 90 days, and no deadline. Returns the shop-wide totals and a page of contacts ordered by "
+        "total debt. The report is cached for a short time and refreshed whenever a debt changes."
+    ),
+    responses={
+        200: {"description": "The debt aging report."},
+        401: {"model": ErrorDetail, "description": "Unauthorized"},
+    }
+)
+def get_debt_aging_report(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+    contact_id: Optional[uuid.UUID] = Query(None, description="Only list this contact. The shop-wide totals are unaffected."),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+):
+    return account_ledger_service.get_aging_report(db, contact_id=contact_id, skip=skip, limit=limit)
+
 @router.get(
     "/{ledger_id}",
     response_model=AccountLedgerPublic,
@@ -1,22 +1,132 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
 from app.api import deps
 from app.models.user import User, UserRole
 from app.models.enums.audit_log import OperationType
-from app.schema.audit_log import AuditLogPublic
+from app.schema.audit_log import AuditLogPublic, AuditRecordState, AuditWriterStats
 from app.schema.error import ErrorDetail
 from app.services.audit_log import audit_log_service
+from app.services.export import GZIP_MEDIA_TYPE, NDJSON_MEDIA_TYPE, export_service
 
 router = APIRouter()
 
+@router.get(
+    "/writer-stats",
+    response_model=AuditWriterStats,
+    summary="[Admin] Audit Writer Statistics",
+    description=(
+        "Reports the background audit writer of the worker serving the request: queue depth, "
+        "written and deferred rows, failures and the last batch, plus the outbox backlog. "
+        "In 'sync' mode the writer is idle and the counters stay at zero."
+    ),
+    dependencies=[Depends(deps.require_role([UserRole.ADMIN]))],
+    responses={
+        401: {"model": ErrorDetail, "description": "Unauthorized"},
+        403: {"model": ErrorDetail, "description": "Forbidden"},
+    }
+)
+def get_audit_writer_stats(db: Session = Depends(deps.get_db)):
+    return audit_log_service.get_writer_stats(db)
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="[Admin] Export Audit Logs",
+    description=(
+        "Streams every audit entry matching the filters as NDJSON (one JSON object per line), oldest first, "
+        "with the username of the acting user. There is no page size; rows are read from the database in batches. "
+        "Set `compress` to receive a gzip file. A time range keeps the export to the monthly partitions it covers."
+    ),
+    dependencies=[Depends(deps.require_role([UserRole.ADMIN]))],
+    responses={
+        200: {
+            "description": "The export file.",
+            "content": {NDJSON_MEDIA_TYPE: {}, GZIP_MEDIA_TYPE: {}},
+        },
+        401: {"model": ErrorDetail, "description": "Unauthorized"},
+        403: {"model": ErrorDetail, "description": "Forbidden"},
+    }
+)
+def export_audit_logs(
+    user_id: Optional[uuid.UUID] = Query(None, description="Filter by the user who performed the action."),
+    operation: Optional[OperationType] = Query(None, description="Filter by the type of operation."),
+    table_name: Optional[str] = Query(None, description="Filter by the name of the table that was affected (case-insensitive, partial match)."),
+    start_time: Optional[datetime] = Query(None, description="Only entries created at or after this time."),
+    end_time: Optional[datetime] = Query(None, description="Only entries created before this time."),
+    compress: bool = Query(False, description="Gzip-compress the export."),
+):
+    content = export_service.stream_audit_logs(
+        compress=compress,
+        user_id=user_id,
+        operation=operation,
+        table_name=table_name,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    filename = f"audit_logs_{timestamp}.ndjson" + (".gz" if compress else "")
+    return StreamingResponse(
+        content,
+        media_type=GZIP_MEDIA_TYPE if compress else NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get(
+    "/records/{table_name}/{record_id}/history",
+    response_model=List[AuditLogPublic],
+    summary="[Admin] Record Change History",
+    description="Returns every audit entry of one record (e.g. a payment or a transaction), oldest first.",
+    dependencies=[Depends(deps.require_role([UserRole.ADMIN]))],
+    responses={
+        401: {"model": ErrorDetail, "description": "Unauthorized"},
+        403: {"model": ErrorDetail, "description": "Forbidden"},
+        404: {"model": ErrorDetail, "description": "No audit history found for this record."},
+    }
+)
+def get_record_history(
+    table_name: str,
+    record_id: uuid.UUID,
+    db: Session = Depends(deps.get_db),
+):
+    return audit_log_service.get_record_history(db, table_name=table_name, record_id=record_id)
+
+@router.get(
+    "/records/{table_name}/{record_id}/state",
+    response_model=AuditRecordState,
+    summary="[Admin] Record State at a Point in Time",
+    description=(
+        "Rebuilds the column values of one record at the given time by applying its audit entries "
+        "up to then in order. `complete` is false when the creation of the record is no longer in "
+        "the audit log (e.g. removed by retention), in which case only the columns changed since are known."
+    ),
+    dependencies=[Depends(deps.require_role([UserRole.ADMIN]))],
+    responses={
+        401: {"model": ErrorDetail, "description": "Unauthorized"},
+        403: {"model": ErrorDetail, "description": "Forbidden"},
+        404: {"model": ErrorDetail, "description": "No audit history found for this record at that time."},
+    }
+)
+def get_record_state(
+    table_name: str,
+    record_id: uuid.UUID,
+    at: Optional[datetime] = Query(None, description="The point in time; defaults to now."),
+    db: Session = Depends(deps.get_db),
+):
+    return audit_log_service.get_record_state(db, table_name=table_name, record_id=record_id, at=at)
+
 @router.get(
     "/",
     response_model=List[AuditLogPublic],
     summary="[Admin] Search Audit Logs",
-    description="Allows an administrator to search and filter the audit log to track changes.",
+    description=(
+        "Allows an administrator to search and filter the audit log to track changes. "
+        "The log is partitioned by month, so giving a time range keeps the search to the months it covers."
+    ),
     responses={
             200: {
             "description": "A list of audit log entries matching the criteria.",
@@ -33,6 +143,7 @@ router = APIRouter()
                                     "user_id": "f4b1b2b3-c4d5-6789-0123-456789abcdef",
                                     "operation": "UPDATE",
                                     "table_name": "user",
+                                    "record_id": "c1d2e3f4-a5b6-7890-1234-567890abcdef",
                                     "before_state": {
                                         "id": "c1d2e3f4-a5b6-7890-1234-567890abcdef",
                                         "full_name": "Old Name"
@@ -58,6 +169,8 @@ def search_audit_logs(
     user_id: Optional[uuid.UUID] = Query(None, description="Filter by the user who performed the action."),
     operation: Optional[OperationType] = Query(None, description="Filter by the type of operation."),
     table_name: Optional[str] = Query(None, description="Filter by the name of the table that was affected (case-insensitive, partial match)."),
+    start_time: Optional[datetime] = Query(None, description="Only entries created at or after this time."),
+    end_time: Optional[datetime] = Query(None, description="Only entries created before this time."),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
 ):
@@ -69,6 +182,8 @@ def search_audit_logs(
         user_id=user_id, 
         operation=operation, 
         table_name=table_name, 
+        start_time=start_time,
+        end_time=end_time,
         skip=skip, 
         limit=limit
     )
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, status, UploadFile, File, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import io
 from datetime import datetime
 
 from app.api import deps
@@ -26,24 +25,17 @@ router = APIRouter()
     }
 )
 def export_backup(
-    db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
 ):
     """
-    Generates and returns a JSON backup of the database.
+    Streams a JSON backup of the database, table by table.
     """
-    json_str = backup_service.export_data_as_json_str(db)
-    
-    # Create a file-like object in memory
-    file_obj = io.StringIO(json_str)
-    
     # Generate a filename with the current timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"goldshop_backup_{timestamp}.json"
     
     return StreamingResponse(
-        file_obj,  # directly stream from StringIO
-        # iter([file_obj.read()]),
+        backup_service.stream_export(),
         media_type="application/json",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -9,7 +9,9 @@ from app.models.enums.contact import ContactType
 from app.models.enums.permission import PermissionName
 from app.schema.contact import ContactCreate, ContactPublic, ContactUpdate
 from app.schema.error import ErrorDetail
+from app.schema.report import ContactRollupPublic
 from app.services.contact import contact_service
+from app.services.contact_rollup import contact_rollup_service
 
 
 router = APIRouter()
@@ -111,6 +113,26 @@ def read_contact_by_id(
     return contact_service.get_contact_by_id(db, contact_id=contact_id)
 
 
+@router.get(
+    "/{contact_id}/rollup",
+    response_model=ContactRollupPublic,
+    summary="Get a contact's financial rollup",
+    description="Returns the contact's lifetime sold and bought totals, approved payments, outstanding ledger debt and last activity, precomputed as the data changes.",
+    responses={
+        200: {"description": "Successful Response."},
+        401: {"description": "Unauthorized.", "model": ErrorDetail},
+        404: {"description": "Contact not found.", "model": ErrorDetail},
+    }
+)
+def read_contact_rollup(
+    contact_id: uuid.UUID,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    """Endpoint to get the precomputed financial standing of a contact."""
+    return contact_rollup_service.get_by_contact_id(db, contact_id=contact_id)
+
+
 @router.put(
     "/{contact_id}",
     response_model=ContactPublic,
@@ -1,14 +1,15 @@
 from typing import List
-from fastapi import APIRouter, Depends, status, Response
+from fastapi import APIRouter, Depends, Query, status, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.models.user import User
-from app.schema.investor import InvestorProfilePublic, InvestorPasswordUpdate
+from app.schema.investor import InvestorProfilePublic, InvestorPasswordUpdate, InvestorStatement
 from app.schema.investment import InvestmentPublic
 from app.schema.payment import PaymentPublic
 from app.schema.error import ErrorDetail
 from app.services.user import user_service
+from app.services.investor import investor_service
 from app.services.payment import payment_service
 
 router = APIRouter()
@@ -65,6 +66,29 @@ def get_my_payments(
     """Fetches a list of all payments associated with the currently logged-in investor."""
     return payment_service.search(db, current_user=current_user)
 
+@router.get(
+    "/me/statement",
+    response_model=InvestorStatement,
+    summary="[Investor] Get My Statement",
+    description=(
+        "Returns the investor's profile and one page of their statement, newest first: investments, "
+        "deposits and withdrawals with the invested total and credit balance after each entry."
+    ),
+    responses={
+        200: {"description": "The investor's profile and statement page."},
+        401: {"model": ErrorDetail, "description": "Unauthorized."},
+        403: {"model": ErrorDetail, "description": "User is not an investor."},
+    }
+)
+def get_my_statement(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_investor),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+):
+    """Returns one page of the logged-in investor's statement with running balances."""
+    return investor_service.get_statement(db, investor=current_user.investor_profile, skip=skip, limit=limit)
+
 @router.put(
     "/me/password",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, Query, status, Response
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+import io
 import uuid
 from typing import List, Optional
 from datetime import datetime
 
 from app.api import deps
-from app.models.user import User
-from app.schema.payment import PaymentCreate, PaymentUpdate, PaymentPublic
+from app.models.user import User, UserRole
+from app.schema.payment import PaymentCreate, PaymentUpdate, PaymentPublic, PaymentSearchWithAggregates
+from app.schema.reconciliation import ReconciliationResult
+from app.schema.bulk import BulkActionRequest, BulkActionResponse
 from app.schema.error import ErrorDetail
+from app.schema.export import ExportFormat
+from app.services.export import MEDIA_TYPES, export_service
 from app.services.payment import payment_service
+from app.services.reconciliation import reconciliation_service
 from app.models.enums.payment import PaymentMethod, PaymentDirection
 from app.models.enums.shared import ApprovalStatus
 
@@ -85,6 +92,189 @@ def search_payments(
         limit=limit
     )
 
+@router.get(
+    "/search/with-aggregates",
+    response_model=PaymentSearchWithAggregates,
+    summary="Search Payments with Aggregates",
+    description=(
+        "Same filters, sorting and paging as `/payments/search`. Alongside the page, returns counts and amount sums over "
+        "every matching payment: overall, per direction, and per direction by payment method, by status, and by both. "
+        "Both are computed in a single database query."
+    ),
+    responses={
+        200: {"description": "A page of payments and the aggregates of all payments matching the search criteria."},
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def search_payments_with_aggregates(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+    # Filters
+    payment_method: Optional[PaymentMethod] = Query(None),
+    direction: Optional[PaymentDirection] = Query(None),
+    status: Optional[ApprovalStatus] = Query(None),
+    photo_holder_id: Optional[uuid.UUID] = Query(None),
+    investor_id: Optional[uuid.UUID] = Query(None),
+    transaction_id: Optional[uuid.UUID] = Query(None),
+    account_ledger_id: Optional[uuid.UUID] = Query(None),
+    saved_bank_account_id: Optional[uuid.UUID] = Query(None),
+    recorder_id: Optional[uuid.UUID] = Query(None, description="[Admin Only] Filter by the user who recorded the payment."),
+    start_time: Optional[datetime] = Query(None, description="Search for payments created after this time."),
+    end_time: Optional[datetime] = Query(None, description="Search for payments created before this time."),
+    # Sorting
+    amount: Optional[int] = Query(None, description="Sort results by the closest match to this amount."),
+    # Pagination
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+):
+    return payment_service.search_with_aggregates(
+        db,
+        current_user=current_user,
+        payment_method=payment_method,
+        direction=direction,
+        status=status,
+        amount=amount,
+        photo_holder_id=photo_holder_id,
+        investor_id=investor_id,
+        transaction_id=transaction_id,
+        account_ledger_id=account_ledger_id,
+        saved_bank_account_id=saved_bank_account_id,
+        recorder_id=recorder_id,
+        start_time=start_time,
+        end_time=end_time,
+        skip=skip,
+        limit=limit
+    )
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export Payments",
+    description="Streams every payment matching the search criteria as a CSV or XLSX file. There is no page size; rows are read from the database in batches.",
+    responses={
+        200: {
+            "description": "The export file.",
+            "content": {"text/csv": {}, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {}},
+        },
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def export_payments(
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="File format of the export."),
+    # Filters
+    payment_method: Optional[PaymentMethod] = Query(None),
+    direction: Optional[PaymentDirection] = Query(None),
+    status: Optional[ApprovalStatus] = Query(None),
+    photo_holder_id: Optional[uuid.UUID] = Query(None),
+    investor_id: Optional[uuid.UUID] = Query(None),
+    transaction_id: Optional[uuid.UUID] = Query(None),
+    account_ledger_id: Optional[uuid.UUID] = Query(None),
+    saved_bank_account_id: Optional[uuid.UUID] = Query(None),
+    recorder_id: Optional[uuid.UUID] = Query(None, description="[Admin Only] Filter by the user who recorded the payment."),
+    start_time: Optional[datetime] = Query(None, description="Search for payments created after this time."),
+    end_time: Optional[datetime] = Query(None, description="Search for payments created before this time."),
+    # Sorting
+    amount: Optional[int] = Query(None, description="Sort results by the closest match to this amount."),
+):
+    content = export_service.stream_payments(
+        current_user=current_user,
+        export_format=export_format,
+        payment_method=payment_method,
+        direction=direction,
+        status=status,
+        amount=amount,
+        photo_holder_id=photo_holder_id,
+        investor_id=investor_id,
+        transaction_id=transaction_id,
+        account_ledger_id=account_ledger_id,
+        saved_bank_account_id=saved_bank_account_id,
+        recorder_id=recorder_id,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=payments_{timestamp}.{export_format.value}"}
+    )
+
+@router.post(
+    "/bulk/approve",
+    response_model=BulkActionResponse,
+    summary="Bulk Approve Payments",
+    description="Approves many payments in one database transaction, following the same rules as the single approve endpoint. Each payment is applied in its own savepoint, so one failure does not block the rest, and the combined inventory change is written as a single snapshot. Returns the outcome for every ID.",
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        422: {"model": ErrorDetail, "description": "Validation Error (e.g., duplicate IDs or too many IDs)"},
+    }
+)
+def bulk_approve_payments(
+    bulk_in: BulkActionRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    return payment_service.bulk_approve(db, payment_ids=bulk_in.ids, current_user=current_user)
+
+@router.post(
+    "/bulk/reject",
+    response_model=BulkActionResponse,
+    summary="Bulk Reject Payments",
+    description="Returns many payments to 'draft' in one database transaction, following the same rules as the single reject endpoint. Each payment is applied in its own savepoint and the combined inventory change is written as a single snapshot. Returns the outcome for every ID.",
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        422: {"model": ErrorDetail, "description": "Validation Error (e.g., duplicate IDs or too many IDs)"},
+    }
+)
+def bulk_reject_payments(
+    bulk_in: BulkActionRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    return payment_service.bulk_reject(db, payment_ids=bulk_in.ids, current_user=current_user)
+
+@router.post(
+    "/reconcile",
+    response_model=ReconciliationResult,
+    summary="[Admin] Reconcile a Bank Statement",
+    description=(
+        "Upload a CSV bank statement with `date` (YYYY-MM-DD) and `amount` columns (negative amounts are withdrawals) "
+        "and an optional `description` column. Each line is matched to a payment of any status with the same amount "
+        "and direction created within `window_days` of the line's date, optionally restricted to one saved bank account. "
+        "Lines with exactly one such payment are matched, lines with several are ambiguous, and the rest are unmatched. "
+        "Nothing is written."
+    ),
+    responses={
+        400: {"model": ErrorDetail, "description": "Invalid file type or a malformed statement line."},
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        404: {"model": ErrorDetail, "description": "Saved bank account not found."},
+    }
+)
+def reconcile_bank_statement(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+    file: UploadFile = File(..., description="The .csv bank statement to reconcile."),
+    saved_bank_account_id: Optional[uuid.UUID] = Query(None, description="Only match payments made through this saved bank account."),
+    window_days: int = Query(2, ge=0, le=31, description="How many days before or after a line's date a payment may have been recorded."),
+):
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file type. Please upload a .csv file.")
+
+    # The statement is parsed while it is read, so it never has to fit in memory as a whole.
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return reconciliation_service.reconcile(
+        db,
+        lines=reconciliation_service.parse_statement(text),
+        window_days=window_days,
+        saved_bank_account_id=saved_bank_account_id,
+    )
+
 @router.get(
     "/{payment_id}",
     response_model=PaymentPublic,
@@ -0,0 +1,88 @@
+import uuid
+from typing import List
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.models.user import User, UserRole
+from app.schema.error import ErrorDetail
+from app.schema.profit_distribution import ProfitDistributionCreate, ProfitDistributionPreview, ProfitDistributionPublic
+from app.services.profit_distribution import profit_distribution_service
+
+router = APIRouter()
+
+@router.post(
+    "/preview",
+    response_model=ProfitDistributionPreview,
+    summary="[Admin] Preview a Profit Distribution",
+    description="Computes each active investor's share of the profit by time-weighted invested capital over the period. Nothing is written.",
+    responses={
+        200: {"description": "The shares the distribution would credit."},
+        400: {"model": ErrorDetail, "description": "No active investor held capital during the period."},
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def preview_profit_distribution(
+    distribution_in: ProfitDistributionCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+):
+    return profit_distribution_service.preview(db, distribution_in=distribution_in)
+
+@router.post(
+    "/",
+    response_model=ProfitDistributionPublic,
+    status_code=status.HTTP_201_CREATED,
+    summary="[Admin] Apply a Profit Distribution",
+    description="Computes the shares like the preview and adds them to the investors' credit in a single database transaction.",
+    responses={
+        201: {"description": "The applied distribution with its shares."},
+        400: {"model": ErrorDetail, "description": "No active investor held capital during the period."},
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        409: {"model": ErrorDetail, "description": "A distribution already covers part of the period."},
+    }
+)
+def apply_profit_distribution(
+    distribution_in: ProfitDistributionCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+):
+    return profit_distribution_service.apply(db, distribution_in=distribution_in, current_user=current_user)
+
+@router.get(
+    "/",
+    response_model=List[ProfitDistributionPublic],
+    summary="[Admin] List Profit Distributions",
+    description="Lists the applied profit distributions with their shares.",
+    dependencies=[Depends(deps.require_role([UserRole.ADMIN]))],
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def list_profit_distributions(
+    db: Session = Depends(deps.get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+):
+    return profit_distribution_service.get_multi(db, skip=skip, limit=limit)
+
+@router.get(
+    "/{distribution_id}",
+    response_model=ProfitDistributionPublic,
+    summary="[Admin] Get Profit Distribution by ID",
+    description="Fetches a single applied profit distribution with its shares.",
+    dependencies=[Depends(deps.require_role([UserRole.ADMIN]))],
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        404: {"model": ErrorDetail, "description": "Profit distribution not found."},
+    }
+)
+def get_profit_distribution(
+    distribution_id: uuid.UUID,
+    db: Session = Depends(deps.get_db),
+):
+    return profit_distribution_service.get_by_id(db, distribution_id=distribution_id)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.models.user import User
+from app.schema.error import ErrorDetail
+from app.schema.quote import QuotePublic, QuoteRequest
+from app.services.quote import quote_service
+
+router = APIRouter()
+
+@router.post(
+    "/",
+    response_model=QuotePublic,
+    summary="Price Candidate Lines",
+    description="Prices many candidate transaction lines at once without storing anything. Empty ojrat, profit, tax and karat values are filled from the item's financial profile for the line's transaction type.",
+    responses={
+        200: {"description": "The priced lines and their combined total."},
+        401: {"model": ErrorDetail, "description": "User is not authenticated."},
+        404: {"model": ErrorDetail, "description": "One of the item_ids was not found."},
+    }
+)
+def create_quote(
+    quote_in: QuoteRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    """Calculates the prices the lines would get in a transaction."""
+    return quote_service.quote(db, quote_in=quote_in)
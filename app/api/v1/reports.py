@@ -0,0 +1,81 @@
+import uuid
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.models.user import User, UserRole
+from app.models.enums.item_type import ItemType
+from app.models.enums.transaction import TransactionType
+from app.schema.error import ErrorDetail
+from app.schema.report import DailySummaryPublic, ReadModelRebuildResult
+from app.services.contact_rollup import contact_rollup_service
+from app.services.daily_summary import daily_summary_service
+
+router = APIRouter()
+
+@router.get(
+    "/daily-summary",
+    response_model=List[DailySummaryPublic],
+    summary="[Admin] Daily Sales and Purchase Summary",
+    description="Returns the admin-approved transaction items aggregated per day, item type, transaction type and recorder. Days can be selected by Gregorian or Jalali (YYYY-MM-DD) range; both ends are inclusive.",
+    responses={
+        200: {"description": "The summary rows, newest day first."},
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def get_daily_summary(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+    start_day: Optional[date] = Query(None, description="First Gregorian day, e.g. 2025-09-20."),
+    end_day: Optional[date] = Query(None, description="Last Gregorian day, e.g. 2025-09-21."),
+    jalali_start_day: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="First Jalali day, e.g. 1404-06-29."),
+    jalali_end_day: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="Last Jalali day, e.g. 1404-06-30."),
+    recorder_id: Optional[uuid.UUID] = Query(None, description="Only include transactions recorded by this user."),
+    item_type: Optional[ItemType] = Query(None),
+    transaction_type: Optional[TransactionType] = Query(None),
+):
+    return daily_summary_service.search(
+        db,
+        start_day=start_day,
+        end_day=end_day,
+        jalali_start_day=jalali_start_day,
+        jalali_end_day=jalali_end_day,
+        recorder_id=recorder_id,
+        item_type=item_type,
+        transaction_type=transaction_type,
+    )
+
+@router.post(
+    "/daily-summary/rebuild",
+    response_model=ReadModelRebuildResult,
+    summary="[Admin] Rebuild the Daily Summary",
+    description="Recomputes the daily summary from all admin-approved transactions. Only needed after changing data outside the API (e.g. a manual fix in the database).",
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def rebuild_daily_summary(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+):
+    return ReadModelRebuildResult(rows=daily_summary_service.rebuild(db))
+
+@router.post(
+    "/contact-rollup/rebuild",
+    response_model=ReadModelRebuildResult,
+    summary="[Admin] Rebuild the Contact Rollups",
+    description="Recomputes every contact's rollup from transactions, payments and account ledgers. Only needed after changing data outside the API (e.g. a manual fix in the database).",
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+    }
+)
+def rebuild_contact_rollup(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+):
+    return ReadModelRebuildResult(rows=contact_rollup_service.rebuild(db))
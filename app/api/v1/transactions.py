@@ -2,6 +2,7 @@ import uuid
 from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -12,10 +13,16 @@ from app.schema.transaction import (
     TransactionCreate, 
     TransactionPublic, 
     TransactionUpdate, 
+    TransactionWithItemsCreate,
     TransactionWithItemsPublic
 )
+from app.schema.transaction_item import TransactionItemsBulkModify
+from app.schema.bulk import BulkActionRequest, BulkActionResponse
 from app.schema.error import ErrorDetail
+from app.schema.export import ExportFormat
+from app.services.export import MEDIA_TYPES, export_service
 from app.services.transaction import transaction_service
+from app.services.transaction_item import transaction_item_service
 
 router = APIRouter()
 
@@ -39,6 +46,26 @@ def create_transaction(
     """Creates the initial transaction entry. Items are added separately."""
     return transaction_service.create(db, transaction_in=transaction_in, current_user=current_user)
 
+@router.post(
+    "/with-items",
+    response_model=TransactionWithItemsPublic,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a Transaction with its Items",
+    description="Creates a new 'draft' transaction together with all of its line items in a single request. Item templates are validated at once and the total_price is calculated from the lines.",
+    responses={
+        201: {"description": "Transaction and items created successfully."},
+        401: {"model": ErrorDetail, "description": "User is not authenticated."},
+        404: {"model": ErrorDetail, "description": "The specified contact_id or one of the item_ids was not found."},
+    }
+)
+def create_transaction_with_items(
+    transaction_in: TransactionWithItemsCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    """Creates the transaction and every line item in one DB transaction."""
+    return transaction_item_service.create_transaction_with_items(db, transaction_in=transaction_in, current_user=current_user)
+
 @router.get(
     "/search", 
     response_model=List[TransactionPublic],
@@ -70,7 +97,7 @@ def search_transactions(
     "/search/detailed", 
     response_model=List[TransactionWithItemsPublic],
     summary="Search Transactions (Detailed View)",
-    description="Searches for transactions based on various criteria. This view INCLUDES the list of transaction items."
+    description="Searches for transactions based on various criteria. This view INCLUDES the list of transaction items, loaded for the whole page in one extra query."
 )
 def search_transactions_detailed(
     db: Session = Depends(deps.get_db),
@@ -90,9 +117,83 @@ def search_transactions_detailed(
     return transaction_service.search(
         db, current_user=current_user, recorder_id=recorder_id, contact_id=contact_id, status=status,
         start_time=start_time, end_time=end_time, item_title=item_title, item_id=item_id,
-        item_transaction_type=item_transaction_type, skip=skip, limit=limit
+        item_transaction_type=item_transaction_type, with_items=True, skip=skip, limit=limit
     )
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export Transactions",
+    description="Streams every transaction matching the search criteria as a CSV or XLSX file, with one row per transaction item. There is no page size; rows are read from the database in batches.",
+    responses={
+        200: {
+            "description": "The export file.",
+            "content": {"text/csv": {}, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {}},
+        },
+        401: {"model": ErrorDetail, "description": "User is not authenticated."},
+    }
+)
+def export_transactions(
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="File format of the export."),
+    recorder_id: Optional[uuid.UUID] = Query(None, description="Filter by the user who recorded the transaction."),
+    contact_id: Optional[uuid.UUID] = Query(None, description="Filter by the contact associated with the transaction."),
+    status: Optional[ApprovalStatus] = Query(None, description="Filter by transaction status."),
+    start_time: Optional[datetime] = Query(None, description="ISO 8601 format. e.g., 2025-09-20T10:00:00"),
+    end_time: Optional[datetime] = Query(None, description="ISO 8601 format. e.g., 2025-09-21T10:00:00"),
+    item_title: Optional[str] = Query(None, description="Find transactions containing an item with this title (partial match)."),
+    item_id: Optional[uuid.UUID] = Query(None, description="Find transactions containing a specific item ID."),
+    item_transaction_type: Optional[TransactionType] = Query(None, description="Find transactions containing a specific item transaction type."),
+):
+    """Admin can export all transactions. Regular users can only export their own."""
+    content = export_service.stream_transactions(
+        current_user=current_user, export_format=export_format, recorder_id=recorder_id, contact_id=contact_id,
+        status=status, start_time=start_time, end_time=end_time, item_title=item_title, item_id=item_id,
+        item_transaction_type=item_transaction_type,
+    )
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=transactions_{timestamp}.{export_format.value}"}
+    )
+
+@router.post(
+    "/bulk/approve",
+    response_model=BulkActionResponse,
+    summary="Bulk Approve Transactions",
+    description="Approves many transactions in one database transaction, following the same rules as the single approve endpoint. Each transaction is applied in its own savepoint, so one failure does not block the rest, and the combined inventory change is written as a single snapshot. Returns the outcome for every ID.",
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        422: {"model": ErrorDetail, "description": "Validation Error (e.g., duplicate IDs or too many IDs)"},
+    }
+)
+def bulk_approve_transactions(
+    bulk_in: BulkActionRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    return transaction_service.bulk_approve(db, transaction_ids=bulk_in.ids, current_user=current_user)
+
+@router.post(
+    "/bulk/reject",
+    response_model=BulkActionResponse,
+    summary="Bulk Reject Transactions",
+    description="Returns many transactions to 'draft' in one database transaction, following the same rules as the single reject endpoint. Each transaction is applied in its own savepoint and the combined inventory change is written as a single snapshot. Returns the outcome for every ID.",
+    responses={
+        401: {"model": ErrorDetail},
+        403: {"model": ErrorDetail},
+        422: {"model": ErrorDetail, "description": "Validation Error (e.g., duplicate IDs or too many IDs)"},
+    }
+)
+def bulk_reject_transactions(
+    bulk_in: BulkActionRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    return transaction_service.bulk_reject(db, transaction_ids=bulk_in.ids, current_user=current_user)
+
 @router.get(
     "/{transaction_id}", 
     response_model=TransactionWithItemsPublic,
@@ -154,6 +255,27 @@ def delete_transaction(
     transaction_service.delete(db, transaction_id=transaction_id, current_user=current_user)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+@router.post(
+    "/{transaction_id}/items/bulk",
+    response_model=TransactionWithItemsPublic,
+    summary="Bulk Modify Items of a Draft Transaction",
+    description="Creates, updates and deletes any number of items of a 'draft' transaction in a single request. The total_price is recalculated once.",
+    responses={
+        200: {"description": "Items modified successfully."},
+        400: {"model": ErrorDetail, "description": "Transaction is not in draft status."},
+        403: {"model": ErrorDetail, "description": "User does not have permission to modify this transaction."},
+        404: {"model": ErrorDetail, "description": "Transaction, one of its items, or an item template not found."},
+    }
+)
+def bulk_modify_transaction_items(
+    transaction_id: uuid.UUID,
+    items_in: TransactionItemsBulkModify,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_admin_or_user),
+):
+    """Applies all item changes in one DB transaction."""
+    return transaction_item_service.bulk_modify_items(db, transaction_id=transaction_id, items_in=items_in, current_user=current_user)
+
 @router.post(
     "/{transaction_id}/approve", 
     response_model=TransactionPublic,
@@ -5,7 +5,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
 from app.api.tags import tags_metadata
 from app.core import exceptions
+from app.core.idempotency import IdempotencyMiddleware
 from app.core import audit_listener  # Ensures the listener is registered on startup
+from app.services.audit_writer import audit_writer
+from app.services.audit_log_partition import audit_log_partition_service
+from app.db.session import SessionLocal
 from app.logging_config import setup_logging, logger
 from seeding.seeder import seed_all
 from app.core.config import settings
@@ -22,11 +26,16 @@ async def _lifespan(app: FastAPI):
     # The listener is registered via the import, but this is a good place
     # to explicitly state that auditing is being initialized.
     logger.info("SQLAlchemy audit listener initialized.")
+    with SessionLocal() as db:
+        audit_log_partition_service.ensure_partitions(db)
+    if settings.AUDIT_WRITE_MODE == "async":
+        audit_writer.start()
     
     seed_all()
     yield
     
     logger.info("--- Application Shutdown ---")
+    audit_writer.stop()
 
 # --- API Documentation Metadata ---
 _api_description = """
@@ -52,6 +61,8 @@ def create_app() -> FastAPI:
     )
 
     # --- Setup Middleware ---
+    # Added first so it runs inside CORS and replayed responses still get CORS headers.
+    app.add_middleware(IdempotencyMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],  # Allows all origins
@@ -0,0 +1,364 @@
+"""
+Columnar, compressed, chunked archive files for history rows that have left the database.
+
+An archive is a directory holding the rows of one table:
+
+    index.json          The columns, and for every chunk its file, row count, time range,
+                        value sets of the filter columns and the position of each column block.
+    chunk-000001.col    The column blocks of one chunk, each compressed with zlib.
+
+Readers memory-map chunk files and decompress only the blocks a query needs, in the chunks
+whose time range and value sets can match, so an archive never has to be restored to be read.
+Appending writes new chunk files and then replaces the index atomically.
+"""
+import mmap
+import os
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import orjson
+
+FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+# Chunks whose filter columns hold more distinct values than this keep no value set.
+MAX_VALUE_SET_SIZE = 256
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_NULL_INT = np.iinfo(np.int64).min
+_NULL_UUID = bytes(16)
+_COMPRESSION_LEVEL = 6
+
+
+class ColumnKind(str, Enum):
+    """How a column is stored. Numbers and times are int64 arrays; text and JSON are JSON arrays."""
+    UUID = "uuid"
+    TIMESTAMP = "timestamp"
+    INTEGER = "integer"
+    DECIMAL = "decimal"
+    TEXT = "text"
+    JSON = "json"
+
+
+@dataclass(frozen=True)
+class ArchiveColumn:
+    name: str
+    kind: ColumnKind
+    # Digits after the decimal point, for DECIMAL columns (stored as scaled integers).
+    scale: int = 0
+
+    def to_index(self) -> List[Any]:
+        return [self.name, self.kind.value, self.scale]
+
+    @classmethod
+    def from_index(cls, value: Sequence[Any]) -> "ArchiveColumn":
+        return cls(value[0], ColumnKind(value[1]), value[2])
+
+
+def to_microseconds(moment: datetime) -> int:
+    """Microseconds since the epoch, exactly (timestamps must be timezone-aware)."""
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def from_microseconds(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def encode_column(column: ArchiveColumn, values: Sequence[Any]) -> bytes:
+    """
+    Encodes one column of a chunk, before compression. Timestamps are stored as the
+    differences between consecutive values, which are small for rows in time order and
+    compress well; int64 wraparound keeps this exact even around nulls.
+    """
+    if column.kind == ColumnKind.UUID:
+        return b"".join(_NULL_UUID if value is None else _as_uuid(value).bytes for value in values)
+    if column.kind == ColumnKind.TIMESTAMP:
+        micros = np.fromiter((_NULL_INT if value is None else to_microseconds(value) for value in values), dtype=np.int64, count=len(values))
+        return np.diff(micros, prepend=np.int64(0)).tobytes()
+    if column.kind == ColumnKind.INTEGER:
+        return np.fromiter((_NULL_INT if value is None else value for value in values), dtype=np.int64, count=len(values)).tobytes()
+    if column.kind == ColumnKind.DECIMAL:
+        return np.fromiter(
+            (_NULL_INT if value is None else int(Decimal(value).scaleb(column.scale)) for value in values),
+            dtype=np.int64, count=len(values),
+        ).tobytes()
+    if column.kind == ColumnKind.JSON:
+        # JSON text (as read with a cast to text) is embedded without being parsed.
+        return orjson.dumps([orjson.Fragment(value) if isinstance(value, str) else value for value in values])
+    return orjson.dumps(list(values))
+
+
+def decode_column(column: ArchiveColumn, data: bytes) -> Any:
+    """
+    Decodes one column block. Timestamps and numbers come back as int64 arrays (with
+    _NULL_INT for nulls), so filters can run on them before any row is built.
+    """
+    if column.kind == ColumnKind.UUID:
+        return [None if data[i:i + 16] == _NULL_UUID else uuid.UUID(bytes=bytes(data[i:i + 16])) for i in range(0, len(data), 16)]
+    if column.kind == ColumnKind.TIMESTAMP:
+        return np.cumsum(np.frombuffer(data, dtype=np.int64))
+    if column.kind in (ColumnKind.INTEGER, ColumnKind.DECIMAL):
+        return np.frombuffer(data, dtype=np.int64)
+    return orjson.loads(data)
+
+
+def to_value(column: ArchiveColumn, value: Any) -> Any:
+    """Turns one decoded element back into its Python value."""
+    if column.kind == ColumnKind.TIMESTAMP:
+        return None if value == _NULL_INT else from_microseconds(value)
+    if column.kind == ColumnKind.INTEGER:
+        return None if value == _NULL_INT else int(value)
+    if column.kind == ColumnKind.DECIMAL:
+        return None if value == _NULL_INT else Decimal(int(value)).scaleb(-column.scale)
+    return value
+
+
+def _value_key(value: Any) -> str:
+    """How a value is written in a chunk's value set; Enums by their value."""
+    return str(value.value if isinstance(value, Enum) else value)
+
+
+def _as_uuid(value: Any) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+class ArchiveWriter:
+    """
+    Appends rows to an archive, `chunk_rows` per chunk. Rows should arrive in time order so
+    chunks cover narrow time ranges. Nothing is visible to readers until `commit` replaces
+    the index; `abort` removes the chunks written by this writer again.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        columns: Sequence[ArchiveColumn],
+        *,
+        chunk_rows: int,
+        time_column: str = "created_at",
+        filter_columns: Sequence[str] = (),
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.columns = list(columns)
+        self.chunk_rows = chunk_rows
+        self.index = _read_index(self.directory) or {
+            "format": FORMAT_VERSION,
+            "columns": [column.to_index() for column in self.columns],
+            "time_column": time_column,
+            "filter_columns": list(filter_columns),
+            "chunks": [],
+        }
+        if [ArchiveColumn.from_index(value) for value in self.index["columns"]] != self.columns:
+            raise ValueError(f"The archive in {self.directory} was written with different columns.")
+        self._time_position = [column.name for column in self.columns].index(self.index["time_column"])
+        self._next_number = max((chunk["number"] for chunk in self.index["chunks"]), default=0) + 1
+        self._buffer: List[Sequence[Any]] = []
+        self._new_chunks: List[Dict[str, Any]] = []
+        self._previous_chunks: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def rows_written(self) -> int:
+        return sum(chunk["rows"] for chunk in self._new_chunks) + len(self._buffer)
+
+    def append(self, row: Sequence[Any]):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self._write_chunk()
+
+    def commit(self):
+        """Writes the last partial chunk and publishes the new chunks in the index."""
+        if self._buffer:
+            self._write_chunk()
+        if not self._new_chunks:
+            return
+        self._previous_chunks = self.index["chunks"]
+        self._write_index(dict(self.index, chunks=self._previous_chunks + self._new_chunks))
+
+    def abort(self):
+        """
+        Removes the chunks written by this writer, and takes them out of the index again if
+        they were already committed (e.g. when the rows could not be deleted afterwards).
+        """
+        if self._previous_chunks is not None:
+            self._write_index(dict(self.index, chunks=self._previous_chunks))
+            self._previous_chunks = None
+        for chunk in self._new_chunks:
+            (self.directory / chunk["file"]).unlink(missing_ok=True)
+        self._new_chunks, self._buffer = [], []
+
+    def _write_index(self, index: Dict[str, Any]):
+        """Replaces the index atomically, so readers see either the old or the new one."""
+        temporary = self.directory / f"{INDEX_FILE}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(orjson.dumps(index, option=orjson.OPT_INDENT_2))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.directory / INDEX_FILE)
+        self.index = index
+
+    def _write_chunk(self):
+        rows, self._buffer = self._buffer, []
+        times = [row[self._time_position] for row in rows]
+        chunk = {
+            "number": self._next_number,
+            "file": f"chunk-{self._next_number:06d}.col",
+            "rows": len(rows),
+            "min_time": to_microseconds(min(times)),
+            "max_time": to_microseconds(max(times)),
+            "value_sets": {},
+            "blocks": {},
+        }
+        offset = 0
+        with open(self.directory / chunk["file"], "wb") as file:
+            for position, column in enumerate(self.columns):
+                values = [row[position] for row in rows]
+                if column.name in self.index["filter_columns"]:
+                    distinct = set(values)
+                    chunk["value_sets"][column.name] = sorted(map(_value_key, distinct)) if len(distinct) <= MAX_VALUE_SET_SIZE else None
+                block = zlib.compress(encode_column(column, values), _COMPRESSION_LEVEL)
+                file.write(block)
+                chunk["blocks"][column.name] = [offset, len(block)]
+                offset += len(block)
+            file.flush()
+            os.fsync(file.fileno())
+        self._new_chunks.append(chunk)
+        self._next_number += 1
+
+
+class ArchiveReader:
+    """
+    Answers queries against an archive without loading it. Chunks are chosen from the index
+    by time range and value sets, chunk files are memory-mapped, and only the blocks of the
+    time column, the filtered columns and (for matching rows) the requested columns are
+    decompressed.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        index = _read_index(self.directory)
+        if index is None:
+            raise FileNotFoundError(f"No archive index in {self.directory}.")
+        self.index = index
+        self.columns = {value[0]: ArchiveColumn.from_index(value) for value in index["columns"]}
+        self.time_column = index["time_column"]
+
+    @property
+    def chunks(self) -> List[Dict[str, Any]]:
+        return self.index["chunks"]
+
+    def scan(
+        self,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        equals: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the rows with start <= time < end whose columns equal `equals`, as dicts of
+        `columns` (default: all), in time order within each chunk and chunk order overall.
+        """
+        equals = {name: value for name, value in (equals or {}).items() if value is not None}
+        names = list(columns or self.columns)
+        low = to_microseconds(start) if start else None
+        high = to_microseconds(end) if end else None
+        for chunk in self.chunks:
+            if (low is not None and chunk["max_time"] < low) or (high is not None and chunk["min_time"] >= high):
+                continue
+            if not self._may_contain(chunk, equals):
+                continue
+            yield from self._scan_chunk(chunk, names, low, high, equals)
+
+    def last_before(self, moment: datetime, *, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """The row with the latest time at or before `moment`, reading as few chunks as possible."""
+        target = to_microseconds(moment)
+        best = None
+        for chunk in sorted((c for c in self.chunks if c["min_time"] <= target), key=lambda c: c["max_time"], reverse=True):
+            if best is not None and chunk["max_time"] <= best[0]:
+                break
+            with self._open(chunk) as view:
+                times = self._decode(chunk, view, self.time_column)
+                candidates = np.flatnonzero(times <= target)
+                if candidates.size:
+                    position = int(candidates[np.argmax(times[candidates])])
+                    if best is None or times[position] > best[0]:
+                        best = (int(times[position]), chunk, position)
+        if best is None:
+            return None
+        _, chunk, position = best
+        with self._open(chunk) as view:
+            return {name: to_value(self.columns[name], self._decode(chunk, view, name)[position]) for name in (columns or self.columns)}
+
+    def _may_contain(self, chunk: Dict[str, Any], equals: Dict[str, Any]) -> bool:
+        for name, value in equals.items():
+            value_set = chunk["value_sets"].get(name)
+            if value_set is not None and _value_key(value) not in value_set:
+                return False
+        return True
+
+    def _scan_chunk(self, chunk, names, low, high, equals) -> Iterator[Dict[str, Any]]:
+        with self._open(chunk) as view:
+            times = self._decode(chunk, view, self.time_column)
+            mask = np.ones(chunk["rows"], dtype=bool)
+            if low is not None:
+                mask &= times >= low
+            if high is not None:
+                mask &= times < high
+            for name, value in equals.items():
+                if not mask.any():
+                    break
+                decoded = self._decode(chunk, view, name)
+                kind = self.columns[name].kind
+                expected = _as_uuid(value) if kind == ColumnKind.UUID else value.value if isinstance(value, Enum) else value
+                mask &= np.fromiter((item == expected for item in decoded), dtype=bool, count=chunk["rows"])
+            positions = np.flatnonzero(mask)
+            if not positions.size:
+                return
+            decoded = {name: (times if name == self.time_column else self._decode(chunk, view, name)) for name in names}
+            rows = [
+                {name: to_value(self.columns[name], decoded[name][position]) for name in names}
+                for position in positions
+            ]
+        yield from rows
+
+    def _open(self, chunk: Dict[str, Any]) -> "_MappedChunk":
+        return _MappedChunk(self.directory / chunk["file"])
+
+    def _decode(self, chunk: Dict[str, Any], view: memoryview, name: str) -> Any:
+        offset, length = chunk["blocks"][name]
+        return decode_column(self.columns[name], zlib.decompress(view[offset:offset + length]))
+
+
+class _MappedChunk:
+    """A read-only memory map of a chunk file, exposed as a memoryview."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    def __enter__(self) -> memoryview:
+        return self._view
+
+    def __exit__(self, *exc_info):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+def _read_index(directory: Path) -> Optional[Dict[str, Any]]:
+    path = Path(directory) / INDEX_FILE
+    if not path.is_file():
+        return None
+    index = orjson.loads(path.read_bytes())
+    if index.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported archive format {index.get('format')} in {directory}.")
+    return index
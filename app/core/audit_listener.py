@@ -1,16 +1,116 @@
-import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import FrozenSet, Tuple
 
-from sqlalchemy import event, inspect
-from sqlalchemy.orm import Session, object_session
-from sqlalchemy.orm.attributes import get_history
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Mapper, Session
 
+from app.core.config import settings
 from app.models.audit_log import AuditLog
+from app.models.audit_outbox import AuditOutbox
 from app.models.enums.audit_log import OperationType
-from app.core.utils import json_serializer
+from app.services.audit_writer import audit_writer
+
+# Session.info keys: audit entries captured in the current flush (async mode), and the
+# outbox rows written by the current transaction, handed to the writer once it commits.
+_PENDING_ENTRIES_KEY = "audit_log_pending_entries"
+_OUTBOX_IDS_KEY = "audit_outbox_ids"
+
+# States are stored with the raw column values (UUID, Decimal, datetime, Enum). They are
+# encoded once, by the engine's JSON serializer (orjson), when the row is written.
+
+@lru_cache(maxsize=None)
+def _mapper_columns(mapper: Mapper) -> Tuple[Tuple[str, ...], FrozenSet[str], Tuple[str, ...]]:
+    """
+    The column attribute keys of a mapper (in order and as a set) and its primary key
+    attribute keys, computed once per mapper. Relationships are never part of a state.
+    """
+    columns = tuple(attr.key for attr in mapper.column_attrs)
+    primary_key = tuple(mapper.get_property_by_column(column).key for column in mapper.primary_key)
+    return columns, frozenset(columns), primary_key
 
 def get_obj_state(obj):
-    """Converts a SQLAlchemy model instance into a JSON-serializable dictionary."""
-    return {c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs}
+    """Gets the column values of a SQLAlchemy model instance."""
+    columns, _, _ = _mapper_columns(inspect(obj).mapper)
+    return {key: getattr(obj, key) for key in columns}
+
+def get_changes(obj):
+    """
+    Gets the before and after values of the columns changed on a dirty instance, plus its
+    primary key, or None if nothing changed. Only attributes recorded as modified are
+    looked at, and their history is read without loading anything.
+    """
+    state = inspect(obj)
+    _, column_set, primary_key = _mapper_columns(state.mapper)
+    before_state = {}
+    after_state = {}
+    for key in state.committed_state:
+        if key not in column_set:
+            continue
+        history = state.attrs[key].history
+        if history.has_changes():
+            before_state[key] = history.deleted[0] if history.deleted else None
+            after_state[key] = history.added[0] if history.added else None
+    if not after_state:
+        return None
+    # The identity key survives expiry (e.g. after an earlier commit), unlike state.dict.
+    identity = state.identity or tuple(state.dict.get(key) for key in primary_key)
+    for key, value in zip(primary_key, identity):
+        before_state[key] = after_state[key] = value
+    return before_state, after_state
+
+def get_record_id(obj):
+    """
+    The primary key of an instance, for models with a single-column primary key. Like
+    `get_changes`, it reads the identity key, so an expired instance is never refreshed.
+    """
+    state = inspect(obj)
+    _, _, primary_key = _mapper_columns(state.mapper)
+    if len(primary_key) != 1:
+        return None
+    return state.identity[0] if state.identity else state.dict.get(primary_key[0])
+
+def _load_unloaded_columns(session, objs):
+    """
+    Loads the expired columns (e.g. server-updated timestamps after an earlier flush) of many
+    instances with one query per mapper, instead of one refresh per instance when their
+    state is read.
+    """
+    ids_by_mapper = defaultdict(list)
+    for obj in objs:
+        state = inspect(obj)
+        _, column_set, _ = _mapper_columns(state.mapper)
+        if state.key and len(state.key[1]) == 1 and column_set & state.unloaded:
+            ids_by_mapper[state.mapper].append(state.key[1][0])
+    for mapper, ids in ids_by_mapper.items():
+        # Instances already in the identity map get their unloaded attributes filled in.
+        session.query(mapper).filter(mapper.primary_key[0].in_(ids)).all()
+
+def _record(session, *, user_id, operation, obj, before_state=None, after_state=None):
+    """
+    Records one audit entry. In "sync" mode it is added to the session as an AuditLog row;
+    in "async" mode it is kept for the outbox row written after the flush.
+    """
+    table_name = obj.__tablename__
+    record_id = get_record_id(obj)
+    # The capture time, rather than the transaction start, so the changes of one record made
+    # in a single transaction keep their order in the record's history.
+    created_at = datetime.now(timezone.utc)
+    if settings.AUDIT_WRITE_MODE != "async":
+        # Missing states are left out rather than set to None, which JSONB would store as 'null'.
+        states = {key: value for key, value in (("before_state", before_state), ("after_state", after_state)) if value is not None}
+        session.add(AuditLog(user_id=user_id, operation=operation, table_name=table_name, record_id=record_id, created_at=created_at, **states))
+        return
+    session.info.setdefault(_PENDING_ENTRIES_KEY, []).append({
+        "user_id": str(user_id),
+        "operation": operation.name,
+        "table_name": table_name,
+        "record_id": str(record_id) if record_id else None,
+        "before_state": before_state,
+        "after_state": after_state,
+        "created_at": created_at.isoformat(),
+    })
 
 @event.listens_for(Session, "before_flush")
 def before_flush_listener(session, flush_context, instances):
@@ -22,7 +122,7 @@ def before_flush_listener(session, flush_context, instances):
     user_id = session.info.get('current_user_id')
     if not user_id:
         return # for e.g. created in startup
-    
+
     # Store new objects in the session's info dictionary to process them after the flush,
     # once their database-generated defaults (like ID) are populated.
     session.info.setdefault('audit_log_new_objects', []).extend(
@@ -33,44 +133,28 @@ def before_flush_listener(session, flush_context, instances):
     for obj in session.dirty:
         if isinstance(obj, AuditLog):
             continue
-        
-        obj_session = object_session(obj)
-        if not obj_session:
-            continue
 
-        before_state = {}
-        after_state = {}
-        
-        pk_dict = {pk.name: getattr(obj, pk.name) for pk in inspect(obj).mapper.primary_key}
-        before_state.update(pk_dict)
-        after_state.update(pk_dict)
-        
-        changes_found = False
-        for attr in inspect(obj).attrs:
-            history = get_history(obj, attr.key)
-            if history.has_changes():
-                changes_found = True
-                before_state[attr.key] = history.deleted[0] if history.deleted else None
-                after_state[attr.key] = history.added[0] if history.added else None
-        
-        if changes_found:
-            session.add(AuditLog(
+        changes = get_changes(obj)
+        if changes:
+            _record(
+                session,
                 user_id=user_id,
                 operation=OperationType.UPDATE,
-                table_name=obj.__tablename__,
-                before_state=json.loads(json.dumps(before_state, default=json_serializer)),
-                after_state=json.loads(json.dumps(after_state, default=json_serializer)),
-            ))
+                obj=obj,
+                before_state=changes[0],
+                after_state=changes[1],
+            )
 
-    for obj in session.deleted:
-        if isinstance(obj, AuditLog):
-            continue
-        session.add(AuditLog(
+    deleted = [obj for obj in session.deleted if not isinstance(obj, AuditLog)]
+    _load_unloaded_columns(session, deleted)
+    for obj in deleted:
+        _record(
+            session,
             user_id=user_id,
             operation=OperationType.DELETE,
-            table_name=obj.__tablename__,
-            before_state=json.loads(json.dumps(get_obj_state(obj), default=json_serializer))
-        ))
+            obj=obj,
+            before_state=get_obj_state(obj),
+        )
 
 @event.listens_for(Session, "after_flush")
 def after_flush_listener(session, flush_context):
@@ -79,21 +163,43 @@ def after_flush_listener(session, flush_context):
     At this stage, database-generated values like IDs are available.
     """
     user_id = session.info.get('current_user_id')
-    
+
     if not user_id:
         return # for e.g. created in startup
-    
+
     new_objects = session.info.get('audit_log_new_objects', [])
 
     for obj in new_objects:
         # Now that the flush is complete, the object has its ID and other DB defaults.
-        session.add(AuditLog(
+        _record(
+            session,
             user_id=user_id,
             operation=OperationType.CREATE,
-            table_name=obj.__tablename__,
-            after_state=json.loads(json.dumps(get_obj_state(obj), default=json_serializer))
-        ))
-    
+            obj=obj,
+            after_state=get_obj_state(obj),
+        )
+
     # Clear the list from session.info to prevent reprocessing in nested flushes.
     session.info['audit_log_new_objects'] = []
 
+    entries = session.info.pop(_PENDING_ENTRIES_KEY, None)
+    if entries:
+        # One outbox row per flush, written on the flush's own connection so it commits or
+        # rolls back with the business change. A Core insert does not trigger another flush.
+        outbox_id = session.connection().execute(
+            insert(AuditOutbox).values(entries=entries).returning(AuditOutbox.id)
+        ).scalar_one()
+        session.info.setdefault(_OUTBOX_IDS_KEY, []).append(outbox_id)
+
+@event.listens_for(Session, "after_commit")
+def after_commit_listener(session):
+    """Hands the committed outbox rows to the background writer (async mode only)."""
+    outbox_ids = session.info.pop(_OUTBOX_IDS_KEY, None)
+    if outbox_ids:
+        audit_writer.enqueue(outbox_ids)
+
+@event.listens_for(Session, "after_rollback")
+def after_rollback_listener(session):
+    # Rolled-back outbox rows are gone; there is nothing left to hand over.
+    session.info.pop(_OUTBOX_IDS_KEY, None)
+    session.info.pop(_PENDING_ENTRIES_KEY, None)
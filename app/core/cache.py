@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Session.info key holding the caches to invalidate once the session commits.
+_PENDING_INVALIDATIONS_KEY = "caches_to_invalidate"
+
+
+class TTLCache:
+    """
+    A small thread-safe in-process cache whose entries expire after `ttl_seconds`.
+
+    Every worker process holds its own copy, so a write in one worker only invalidates
+    that worker's entries; the others pick up the change once their entry expires.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Returns the cached value for `key`, calling `loader` to (re)build it when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            # Don't store a value that was loaded while an invalidation happened.
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self):
+        """Drops every entry, so the next read reloads from the database."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def invalidate_on_commit(self, db: Session):
+        """
+        Invalidates the cache once `db` commits, for writes whose commit is owned by a caller.
+        Invalidating earlier would let a concurrent read cache the not-yet-committed state.
+        """
+        db.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(self)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pending_caches(session: Session):
+    for cache in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_caches(session: Session):
+    # The writes were rolled back, so the cached values are still valid.
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import PostgresDsn, computed_field
 from importlib import metadata
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     """
@@ -28,6 +29,51 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     ALGORITHM: str = "HS256"
 
+    # --- Inventory Writer ---
+    # How long the writer waits for concurrent approvals before folding them into one snapshot.
+    INVENTORY_BATCH_WINDOW_MS: int = 50
+
+    # --- Reporting ---
+    # Business days in reports (e.g. daily summaries) are calendar days in this timezone.
+    TIMEZONE: str = "Asia/Tehran"
+
+    # --- Caching ---
+    # How long each worker keeps item financial profile defaults before reloading them.
+    FINANCIAL_PROFILE_CACHE_TTL_SECONDS: int = 300
+    # How long each worker keeps the debt aging report. Buckets move with the clock, so keep this short.
+    AGING_REPORT_CACHE_TTL_SECONDS: int = 60
+
+    # --- Idempotency ---
+    # How long a response is kept for replay to retries carrying the same Idempotency-Key.
+    IDEMPOTENCY_TTL_SECONDS: int = 60 * 60 * 24
+    # How long an unfinished request holds its key before a retry may run it again.
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    # When set, idempotency keys are kept in Redis instead of the idempotency_key table.
+    REDIS_URL: Optional[str] = None
+
+    # --- Audit Log ---
+    # "sync" writes audit_log rows in the business transaction. "async" commits them to the
+    # audit_outbox table instead and a background writer moves them to audit_log in batches.
+    AUDIT_WRITE_MODE: Literal["sync", "async"] = "sync"
+    # Outbox rows queued per worker for the writer; beyond this they wait for the next sweep.
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    # Most outbox rows claimed in one write.
+    AUDIT_BATCH_SIZE: int = 500
+    # How long the writer waits for more rows before writing a partial batch.
+    AUDIT_FLUSH_INTERVAL_MS: int = 200
+    # How often the writer also drains rows left in the outbox (queue overflow, other workers' crashes).
+    AUDIT_OUTBOX_SWEEP_SECONDS: int = 30
+    # audit_log is partitioned by UTC month; partitions are created this many months ahead at startup.
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD: int = 3
+    # Default number of whole months kept, besides the current one, by the partition retention command.
+    AUDIT_LOG_RETENTION_MONTHS: int = 12
+
+    # --- Cold Storage Archive ---
+    # Directory of the columnar archives of old audit_log and inventory rows (see app/core/archive.py).
+    ARCHIVE_DIR: str = "archive"
+    # Rows per archive chunk; a query decompresses whole chunks, so smaller chunks mean less to read per hit.
+    ARCHIVE_CHUNK_ROWS: int = 50000
+
     # --- Pydantic Model Config ---
     # --- UPDATED: The path now correctly points to the .env file in the parent directory. ---
     # This works because all local scripts and the dev server are run from the 'backend' directory.
@@ -0,0 +1,183 @@
+import hashlib
+from typing import List, Optional
+
+from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.logging_config import logger
+from app.schema.idempotency import StoredResponse
+from app.services.idempotency import idempotency_store
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_MAX_KEY_LENGTH = 255
+# Larger responses are passed through but not kept for replay.
+_MAX_STORED_BODY_BYTES = 1024 * 1024
+# Only these response headers are replayed; the rest are rebuilt by the response itself.
+_STORED_HEADERS = {"content-type", "location"}
+# Responses that reflect a passing condition rather than the request itself; a retry must run again.
+_NOT_STORED_STATUS_CODES = {401, 408, 409, 429}
+
+
+class IdempotencyMiddleware:
+    """
+    Makes retries of mutating requests safe when the client sends an `Idempotency-Key` header.
+
+    The first request with a key reserves it and runs normally; its response is then stored
+    (see `app.services.idempotency`). A retry with the same key and the same request gets the
+    stored response back without running the endpoint again. A retry that arrives while the
+    first request is still running gets 409, and reusing a key for a different request
+    gets 422. Keys are scoped to the caller, so two users can never see each other's responses.
+    Server errors are not stored, so the client may retry them with the same key.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in _MUTATING_METHODS:
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if idempotency_key is None:
+            return await self.app(scope, receive, send)
+
+        idempotency_key = idempotency_key.strip()
+        if not idempotency_key or len(idempotency_key) > _MAX_KEY_LENGTH:
+            response = JSONResponse(
+                status_code=400,
+                content={"detail": f"{IDEMPOTENCY_HEADER} must be between 1 and {_MAX_KEY_LENGTH} characters."},
+            )
+            return await response(scope, receive, send)
+
+        body = await self._read_body(receive)
+        key = self._hash(self._get_caller(headers), idempotency_key)
+        fingerprint = self._hash(scope["method"], scope["path"], scope["query_string"].decode("latin-1"), body)
+
+        try:
+            existing = await run_in_threadpool(idempotency_store.reserve, key, fingerprint)
+        except Exception as e:
+            # Without a working store the request still runs, just without replay protection.
+            logger.error(f"Idempotency store unavailable, running request without it: {e}")
+            return await self.app(scope, self._replay_body(body, receive), send)
+
+        if existing is not None:
+            response = self._build_existing_response(existing, fingerprint)
+            return await response(scope, receive, send)
+
+        status_code: Optional[int] = None
+        response_headers: List[tuple] = []
+        chunks: List[bytes] = []
+
+        async def send_and_capture(message: Message):
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.decode("latin-1").lower() in _STORED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, self._replay_body(body, receive), send_and_capture)
+        except Exception:
+            await self._release(key)
+            raise
+
+        response_body = b"".join(chunks)
+        if (
+            status_code is None
+            or status_code >= 500
+            or status_code in _NOT_STORED_STATUS_CODES
+            or len(response_body) > _MAX_STORED_BODY_BYTES
+        ):
+            await self._release(key)
+            return
+
+        stored = StoredResponse(fingerprint=fingerprint, status_code=status_code, headers=response_headers, body=response_body)
+        try:
+            await run_in_threadpool(idempotency_store.complete, key, stored)
+        except Exception as e:
+            logger.error(f"Storing the response for an idempotency key failed: {e}")
+
+    def _build_existing_response(self, existing: StoredResponse, fingerprint: str) -> Response:
+        """Builds the answer to a retry: the stored response, or an error if it cannot be replayed."""
+        if existing.fingerprint != fingerprint:
+            return JSONResponse(
+                status_code=422,
+                content={"detail": f"This {IDEMPOTENCY_HEADER} was already used for a different request."},
+            )
+        if existing.status_code is None:
+            return JSONResponse(
+                status_code=409,
+                content={"detail": f"A request with this {IDEMPOTENCY_HEADER} is still being processed."},
+            )
+        response = Response(content=existing.body, status_code=existing.status_code, headers=dict(existing.headers))
+        response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+    async def _release(self, key: str):
+        try:
+            await run_in_threadpool(idempotency_store.release, key)
+        except Exception as e:
+            logger.error(f"Releasing an idempotency key failed: {e}")
+
+    def _get_caller(self, headers: Headers) -> str:
+        """
+        Identifies the caller for scoping keys. A valid token maps to its user even after it
+        expires (so retries survive a token refresh); anything else is scoped to the raw header.
+        """
+        authorization = headers.get("authorization")
+        if not authorization:
+            return "anonymous"
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer":
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_exp": False})
+                if payload.get("sub"):
+                    return f"user:{payload['sub']}"
+            except JWTError:
+                pass
+        return f"authorization:{authorization}"
+
+    def _hash(self, *parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    def _replay_body(self, body: bytes, receive: Receive) -> Receive:
+        """Hands the already-read body to the app, then falls back to the real channel (disconnects)."""
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
@@ -0,0 +1,16 @@
+from decimal import Decimal
+import orjson
+
+def _default(obj):
+    """Types orjson does not encode natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+def json_dumps(obj) -> str:
+    """
+    Encodes JSON and JSONB column values in a single pass with orjson. UUIDs, datetimes, dates
+    and Enums are handled natively and Decimals become strings, matching `json_serializer`,
+    so values can be stored as they come from the models without converting them first.
+    """
+    return orjson.dumps(obj, default=_default).decode()
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from app.models.base import BaseModel as SQLAlchemyBaseModel
 
@@ -13,7 +13,7 @@ def json_serializer(obj):
     # backup issue, as the backup service serializes database columns directly.
     if isinstance(obj, SQLAlchemyBaseModel):
         return str(obj.id)
-    if isinstance(obj, (datetime)):
+    if isinstance(obj, (datetime, date)):
         return obj.isoformat()
     if isinstance(obj, uuid.UUID):
         return str(obj)
@@ -23,3 +23,27 @@ def json_serializer(obj):
     if hasattr(obj, 'value'):
         return obj.value
     raise TypeError(f"Type {type(obj)} not serializable")
+
+def gregorian_to_jalali(day: date) -> str:
+    """
+    Converts a Gregorian date to the Jalali (Solar Hijri) calendar, formatted as YYYY-MM-DD
+    so that string order matches date order.
+    """
+    days_before_month = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+    gy = day.year + 1 if day.month > 2 else day.year
+    days = (
+        355666 + 365 * day.year + (gy + 3) // 4 - (gy + 99) // 100 + (gy + 399) // 400
+        + day.day + days_before_month[day.month - 1]
+    )
+    jy = -1595 + 33 * (days // 12053)
+    days %= 12053
+    jy += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        jy += (days - 1) // 365
+        days = (days - 1) % 365
+    if days < 186:
+        jm, jd = 1 + days // 31, 1 + days % 31
+    else:
+        jm, jd = 7 + (days - 186) // 30, 1 + (days - 186) % 30
+    return f"{jy:04d}-{jm:02d}-{jd:02d}"
@@ -14,10 +14,16 @@ from app.models.saved_bank_account import SavedBankAccount
 from app.models.item import Item
 from app.models.item_financial_profile import ItemFinancialProfile
 from app.models.inventory import Inventory
+from app.models.inventory_change import InventoryChange
+from app.models.daily_summary import DailySummary
+from app.models.contact_rollup import ContactRollup
+from app.models.idempotency_key import IdempotencyKey
 from app.models.audit_log import AuditLog
+from app.models.audit_outbox import AuditOutbox
 from app.models.transaction import Transaction
 from app.models.transaction_item import TransactionItem
 from app.models.account_ledger import AccountLedger
 from app.models.payment import Payment
 from app.models.investor import Investor
-from app.models.investment import Investment
\ No newline at end of file
+from app.models.investment import Investment
+from app.models.profit_distribution import ProfitDistribution, ProfitShare
@@ -2,9 +2,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.config import settings
+from app.core.serialization import json_dumps
 
 # Create a SQLAlchemy engine instance.
-engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True)
+# JSON columns are encoded with orjson, which also takes the UUIDs, datetimes and Decimals of audit states.
+engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True, json_serializer=json_dumps)
 
 # Create a sessionmaker class, a factory for creating new Session objects.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -12,7 +12,7 @@ class AccountLedger(BaseModel):
     contact_id = Column(ForeignKey("contact.id", ondelete="RESTRICT"), nullable=False, index=True)
     transaction_id = Column(ForeignKey("transaction.id", ondelete="SET NULL"), nullable=True, index=True)
     
-    debt = Column(BigInteger, nullable=False, default=0, comment="Money that the shopkeeper owes to the customer (the reverse is not currently supported)")
+    debt = Column(BigInteger, nullable=False, default=0, index=True, comment="Money that the shopkeeper owes to the customer (the reverse is not currently supported)")
     deadline = Column(DateTime, nullable=True, index=True)
     description = Column(Text, nullable=True)
     card_number = Column(String, nullable=True)
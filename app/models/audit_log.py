@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Enum, String, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+import uuid
+from sqlalchemy import Column, DateTime, Enum, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from app.models.base import BaseModel
 from .enums.audit_log import OperationType
@@ -9,12 +11,24 @@ class AuditLog(BaseModel):
     """
     Represents an entry in the audit log, tracking changes to the database.
     This table is populated automatically by SQLAlchemy event listeners.
+
+    The table is partitioned by month on created_at (see AuditLogPartitionService), so
+    created_at is part of the primary key and old months are removed by dropping partitions.
     """
     __tablename__ = "audit_log"
+    __table_args__ = (
+        # Serves the history of one record, oldest change first.
+        Index("ix_audit_log_table_name_record_id_created_at", "table_name", "record_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), index=True)
 
     user_id = Column(ForeignKey("user.id"), nullable=True, index=True, comment="The user who performed the action. Can be null for system actions.")
     operation = Column(Enum(OperationType, native_enum=False), nullable=False, index=True)
     table_name = Column(String, nullable=False, index=True)
+    record_id = Column(UUID(as_uuid=True), nullable=True, comment="The primary key of the changed record.")
     
     before_state = Column(JSONB, nullable=True, comment="The state of the record before the change (for UPDATE and DELETE).")
     after_state = Column(JSONB, nullable=True, comment="The state of the record after the change (for CREATE and UPDATE).")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.base import BaseModel
+
+class AuditOutbox(BaseModel):
+    """
+    Audit entries waiting to be moved into audit_log, used when AUDIT_WRITE_MODE is "async".
+    Each row holds all entries of one flush and is committed together with the business
+    change, so no entry is lost if the background writer is behind or the process stops.
+    """
+    __tablename__ = "audit_outbox"
+
+    entries = Column(JSONB, nullable=False, comment="The audit_log rows of one flush, as a JSON array.")
+
+    def __repr__(self):
+        return f"<AuditOutbox(id={self.id})>"
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, BigInteger, DateTime, ForeignKey, Integer
+
+from app.models.base import BaseModel
+
+class ContactRollup(BaseModel):
+    """
+    Read model holding one contact's financial standing. It is updated incrementally by the
+    approval flows (transactions and payments approved by an admin, or such approvals
+    rejected) and by every ledger debt change, and can be rebuilt from the source tables.
+    """
+    __tablename__ = "contact_rollup"
+
+    contact_id = Column(ForeignKey("contact.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    sold_total = Column(BigInteger, nullable=False, default=0, comment="Sum of SELL item prices in admin-approved transactions, in Rials")
+    bought_total = Column(BigInteger, nullable=False, default=0, comment="Sum of BUY item prices in admin-approved transactions, in Rials")
+    transaction_count = Column(Integer, nullable=False, default=0, comment="Number of admin-approved transactions")
+    incoming_total = Column(BigInteger, nullable=False, default=0, comment="Sum of admin-approved incoming payments, in Rials")
+    outgoing_total = Column(BigInteger, nullable=False, default=0, comment="Sum of admin-approved outgoing payments, in Rials")
+    payment_count = Column(Integer, nullable=False, default=0, comment="Number of admin-approved incoming and outgoing payments")
+    ledger_debt = Column(BigInteger, nullable=False, default=0, comment="Sum of the contact's account ledger debts, in Rials")
+    last_activity_at = Column(DateTime(timezone=True), nullable=True, comment="Creation time of the latest admin-approved transaction or payment")
+
+    def __repr__(self):
+        return f"<ContactRollup(contact_id={self.contact_id})>"
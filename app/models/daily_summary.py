@@ -0,0 +1,34 @@
+from sqlalchemy import Column, BigInteger, Date, Enum, ForeignKey, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel
+from .enums.item_type import ItemType
+from .enums.transaction import TransactionType
+
+class DailySummary(BaseModel):
+    """
+    Read model holding the admin-approved transaction items of one day, aggregated per
+    item type, transaction type and recorder. It is updated incrementally whenever a
+    transaction is approved by an admin or such an approval is rejected, and can be
+    rebuilt from the transactions at any time.
+    """
+    __tablename__ = "daily_summary"
+    __table_args__ = (
+        UniqueConstraint("day", "item_type", "transaction_type", "recorder_id", name="uq_daily_summary_key"),
+    )
+
+    day = Column(Date, nullable=False, index=True, comment="Day the transaction was created, in the configured TIMEZONE")
+    jalali_day = Column(String(10), nullable=False, index=True, comment="The same day in the Jalali calendar, formatted YYYY-MM-DD")
+    item_type = Column(Enum(ItemType, native_enum=False), nullable=False)
+    transaction_type = Column(Enum(TransactionType, native_enum=False), nullable=False)
+    recorder_id = Column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    item_count = Column(Integer, nullable=False, default=0, comment="Number of transaction items")
+    weight_count = Column(Numeric(14, 2), nullable=False, default=0, comment="Total weight (grams) or count of the items")
+    total_price = Column(BigInteger, nullable=False, default=0, comment="Total price of the items in Rials, before transaction discounts")
+
+    # --- Relationships ---
+    recorder = relationship("User")
+
+    def __repr__(self):
+        return f"<DailySummary(day={self.day}, item_type='{self.item_type.value}', transaction_type='{self.transaction_type.value}')>"
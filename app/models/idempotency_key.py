@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.base import BaseModel
+
+class IdempotencyKey(BaseModel):
+    """
+    A client-supplied Idempotency-Key together with the response it produced.
+    A row without a status code is a reservation: the first request is still running.
+    Rows are disposable and expire after `expires_at`.
+    """
+    __tablename__ = "idempotency_key"
+
+    key = Column(String(64), nullable=False, unique=True, comment="SHA-256 of the caller identity and the Idempotency-Key header.")
+    fingerprint = Column(String(64), nullable=False, comment="SHA-256 of the method, path, query and body of the first request.")
+    status_code = Column(Integer, nullable=True, comment="NULL while the first request is in progress.")
+    headers = Column(JSONB, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(id={self.id}, status_code={self.status_code})>"
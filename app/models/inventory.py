@@ -44,4 +44,7 @@ class Inventory(BaseModel):
 
     # Relationship
     transaction = relationship("Transaction")
-    payment = relationship("Payment")
\ No newline at end of file
+    payment = relationship("Payment")
+    # Every approval whose delta was folded into this snapshot (see InventoryChange).
+    # passive_deletes="all": deleting a snapshot never unlinks its changes; the RESTRICT key refuses it.
+    changes = relationship("InventoryChange", back_populates="inventory", passive_deletes="all")
\ No newline at end of file
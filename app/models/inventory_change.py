@@ -0,0 +1,30 @@
+from sqlalchemy import Column, BigInteger, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel
+
+class InventoryChange(BaseModel):
+    """
+    Represents a pending or applied inventory delta produced by an approval.
+    Approvals only record their delta here; the inventory writer folds all pending
+    changes into a single Inventory snapshot and links them to it via `inventory_id`.
+    """
+    __tablename__ = "inventory_change"
+
+    # RESTRICT: a folded change must never become pending again because its snapshot was deleted.
+    inventory_id = Column(ForeignKey("inventory.id", ondelete="RESTRICT"), nullable=True, index=True, comment="The snapshot this change was folded into. NULL while pending.")
+    transaction_id = Column(ForeignKey("transaction.id", ondelete="SET NULL"), nullable=True, index=True)
+    payment_id = Column(ForeignKey("payment.id", ondelete="SET NULL"), nullable=True, index=True)
+    description = Column(Text, nullable=True)
+
+    money_delta = Column(BigInteger, nullable=False, default=0, comment="Change to the cash balance in Rials")
+    item_deltas = Column(JSONB, nullable=False, default=dict, comment="Changes to item balances, keyed by ItemType value. Values are decimal strings.")
+
+    # --- Relationships ---
+    inventory = relationship("Inventory", back_populates="changes")
+    transaction = relationship("Transaction")
+    payment = relationship("Payment")
+
+    def __repr__(self):
+        return f"<InventoryChange(id={self.id}, inventory_id={self.inventory_id})>"
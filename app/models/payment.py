@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey, Enum, Text
+from sqlalchemy import Column, BigInteger, ForeignKey, Enum, Index, Text
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -10,6 +10,10 @@ class Payment(BaseModel):
     Represents a single payment record, which can be incoming or outgoing.
     """
     __tablename__ = "payment"
+    __table_args__ = (
+        # Serves statement reconciliation: exact amount, then a created_at range.
+        Index("ix_payment_amount_created_at", "amount", "created_at"),
+    )
 
     recorder_id = Column(ForeignKey("user.id"), nullable=False, index=True)
     amount = Column(BigInteger, nullable=False) 
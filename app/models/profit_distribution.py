@@ -0,0 +1,39 @@
+from sqlalchemy import Column, BigInteger, DateTime, Float, ForeignKey, String
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel
+
+class ProfitDistribution(BaseModel):
+    """
+    One profit distribution run. The profit of a period is split between the active
+    investors by time-weighted invested capital and credited to them as ProfitShares.
+    """
+    __tablename__ = "profit_distribution"
+
+    period_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    period_end = Column(DateTime(timezone=True), nullable=False, index=True)
+    total_profit = Column(BigInteger, nullable=False, comment="The distributed profit in Iranian Rials.")
+    description = Column(String(255), nullable=True)
+    creator_user_id = Column(ForeignKey("user.id"), nullable=True)
+
+    # --- Relationships ---
+    shares = relationship("ProfitShare", back_populates="distribution", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<ProfitDistribution(id={self.id}, total_profit={self.total_profit})>"
+
+
+class ProfitShare(BaseModel):
+    """The part of a profit distribution credited to a single investor."""
+    __tablename__ = "profit_share"
+
+    distribution_id = Column(ForeignKey("profit_distribution.id", ondelete="CASCADE"), nullable=False, index=True)
+    investor_id = Column(ForeignKey("investor.id", ondelete="CASCADE"), nullable=False, index=True)
+    amount = Column(BigInteger, nullable=False, comment="The credited profit in Iranian Rials.")
+    weight = Column(Float, nullable=False, comment="The investor's fraction of the time-weighted capital of the period.")
+
+    # --- Relationships ---
+    distribution = relationship("ProfitDistribution", back_populates="shares")
+
+    def __repr__(self):
+        return f"<ProfitShare(investor_id={self.investor_id}, amount={self.amount})>"
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc, asc, nulls_last, func
+from sqlalchemy import Row, or_, and_, desc, asc, func, nulls_last, tuple_
 from typing import List, Optional, Any
+from datetime import datetime, timedelta
 import uuid
 
 from app.repository.base import BaseRepository
@@ -46,13 +47,44 @@ class AccountLedgerRepository(BaseRepository[AccountLedger, AccountLedgerCreate,
             
         # --- Conditional Sorting ---
         if debt is not None:
-            # Order by the absolute difference from the provided debt amount
-            query = query.order_by(func.abs(self.model.debt - debt).asc())
-        else:
-            # Default sort by deadline ascending, with NULLs (no deadline) appearing last.
-            query = query.order_by(nulls_last(asc(self.model.deadline)))
+            # Closest debt amount first, via two probes on the debt index
+            return self.get_nearest(query, column=self.model.debt, value=debt, skip=skip, limit=limit)
 
+        # Default sort by deadline ascending, with NULLs (no deadline) appearing last.
+        query = query.order_by(nulls_last(asc(self.model.deadline)))
         return query.offset(skip).limit(limit).all()
 
+    def get_aging(self, db: Session, *, as_of: datetime) -> List[Row]:
+        """
+        Sums every non-zero debt into aging buckets, shop-wide and per contact, in one scan.
+        Each bucket is a `SUM(debt) FILTER (WHERE ...)` / `COUNT(*) FILTER (WHERE ...)` pair
+        named `<bucket>_debt` / `<bucket>_count`. GROUPING SETS ((), (contact_id)) returns the
+        shop-wide row (contact_id NULL) next to one row per contact.
+        """
+        deadline = self.model.deadline
+        week, month = timedelta(days=7), timedelta(days=30)
+        buckets = {
+            "not_due": deadline >= as_of + week,
+            "due_this_week": and_(deadline >= as_of, deadline < as_of + week),
+            "overdue_0_30": and_(deadline < as_of, deadline >= as_of - month),
+            "overdue_31_60": and_(deadline < as_of - month, deadline >= as_of - 2 * month),
+            "overdue_61_90": and_(deadline < as_of - 2 * month, deadline >= as_of - 3 * month),
+            "overdue_over_90": deadline < as_of - 3 * month,
+            "no_deadline": deadline.is_(None),
+        }
+        columns = [self.model.contact_id]
+        for name, condition in buckets.items():
+            columns.append(func.coalesce(func.sum(self.model.debt).filter(condition), 0).label(f"{name}_debt"))
+            columns.append(func.count().filter(condition).label(f"{name}_count"))
+        columns.append(func.coalesce(func.sum(self.model.debt), 0).label("total_debt"))
+        columns.append(func.count().label("total_count"))
+
+        return (
+            db.query(*columns)
+            .filter(self.model.debt != 0)
+            .group_by(func.grouping_sets(tuple_(), tuple_(self.model.contact_id)))
+            .all()
+        )
+
 account_ledger_repo = AccountLedgerRepository(AccountLedger)
 
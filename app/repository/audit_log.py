@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Any
+from datetime import datetime
+from sqlalchemy import case, text
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session
+from typing import BinaryIO, List, Optional, Any
 import uuid
 
 from app.repository.base import BaseRepository
@@ -10,28 +13,135 @@ class AuditLogRepository(BaseRepository[AuditLog, Any, Any]):
     """
     Repository for audit log related database operations.
     """
-    def search(
+    def build_search_query(
         self,
         db: Session,
         *,
         user_id: Optional[uuid.UUID] = None,
         operation: Optional[OperationType] = None,
         table_name: Optional[str] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[AuditLog]:
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Query:
         """
-        Searches for audit logs based on a combination of criteria.
+        Builds the filtered search query, shared by the paged search and the export.
+        A time range on created_at lets Postgres scan only the monthly partitions it covers.
         """
         query = db.query(self.model)
         
+        if start_time:
+            query = query.filter(self.model.created_at >= start_time)
+        if end_time:
+            query = query.filter(self.model.created_at < end_time)
         if user_id:
             query = query.filter(self.model.user_id == user_id)
         if operation:
             query = query.filter(self.model.operation == operation)
         if table_name:
             query = query.filter(self.model.table_name.ilike(f"%{table_name}%"))
-            
+        return query
+
+    def search(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        **filters: Any,
+    ) -> List[AuditLog]:
+        """
+        Searches for audit logs based on a combination of criteria.
+        """
+        query = self.build_search_query(db, **filters)
         return query.order_by(self.model.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_record_history(
+        self,
+        db: Session,
+        *,
+        table_name: str,
+        record_id: uuid.UUID,
+        until: Optional[datetime] = None,
+    ) -> List[AuditLog]:
+        """
+        The audit entries of one record, oldest first, optionally only those up to `until`.
+        Served by the (table_name, record_id, created_at) index of each partition.
+        """
+        query = db.query(self.model).filter(
+            self.model.table_name == table_name,
+            self.model.record_id == record_id,
+        )
+        if until:
+            query = query.filter(self.model.created_at <= until)
+        # Older rows may share a timestamp within a transaction; a record is created before
+        # it is updated and updated before it is deleted.
+        operation_order = case({OperationType.CREATE: 0, OperationType.UPDATE: 1}, value=self.model.operation, else_=2)
+        return query.order_by(self.model.created_at, operation_order).all()
+
+    # --- Partitions ---
+    # Partition names are generated by AuditLogPartitionService or read from the catalog,
+    # never taken from user input, and are quoted here as identifiers.
+
+    def get_partitions(self, db: Session) -> List[Row]:
+        """The attached partitions with their bound expression, estimated rows and size, in name order."""
+        return db.execute(text("""
+            SELECT c.relname AS name,
+                   pg_get_expr(c.relpartbound, c.oid) AS bound,
+                   c.reltuples::bigint AS estimated_rows,
+                   pg_total_relation_size(c.oid) AS size_bytes
+            FROM pg_inherits AS i
+            JOIN pg_class AS c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:parent AS regclass)
+            ORDER BY c.relname
+        """), {"parent": self.model.__tablename__}).all()
+
+    def create_partition(self, db: Session, *, name: str, start: datetime, end: datetime) -> None:
+        db.execute(text(
+            f"CREATE TABLE {_quote(name)} PARTITION OF {_quote(self.model.__tablename__)} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+    def create_default_partition(self, db: Session, *, name: str) -> None:
+        db.execute(text(f"CREATE TABLE {_quote(name)} PARTITION OF {_quote(self.model.__tablename__)} DEFAULT"))
+
+    def attach_default_partition(self, db: Session, *, name: str) -> None:
+        db.execute(text(f"ALTER TABLE {_quote(self.model.__tablename__)} ATTACH PARTITION {_quote(name)} DEFAULT"))
+
+    def detach_partition(self, db: Session, *, name: str) -> None:
+        db.execute(text(f"ALTER TABLE {_quote(self.model.__tablename__)} DETACH PARTITION {_quote(name)}"))
+
+    def lock_partition(self, db: Session, *, name: str) -> None:
+        """Blocks writes to a partition until the end of the transaction; reads continue."""
+        db.execute(text(f"LOCK TABLE {_quote(name)} IN SHARE MODE"))
+
+    def drop_partition(self, db: Session, *, name: str) -> None:
+        """Drops an attached or detached partition with all its rows."""
+        db.execute(text(f"DROP TABLE {_quote(name)}"))
+
+    def has_rows_between(self, db: Session, *, name: str, start: datetime, end: datetime) -> bool:
+        return db.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {_quote(name)} WHERE created_at >= :start AND created_at < :end)"
+        ), {"start": start, "end": end}).scalar_one()
+
+    def move_rows_between(self, db: Session, *, source: str, start: datetime, end: datetime) -> int:
+        """Moves rows of a detached table in [start, end) back into audit_log, where they are routed to their partition."""
+        return db.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {_quote(source)} WHERE created_at >= :start AND created_at < :end RETURNING *
+            )
+            INSERT INTO {_quote(self.model.__tablename__)} SELECT * FROM moved
+        """), {"start": start, "end": end}).rowcount
+
+    def copy_partition_to(self, db: Session, *, name: str, file: BinaryIO) -> None:
+        """Writes every row of a partition to `file` as CSV with a header, using COPY."""
+        cursor = db.connection().connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {_quote(name)} TO STDOUT WITH (FORMAT csv, HEADER)", file)
+        finally:
+            cursor.close()
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
 audit_log_repo = AuditLogRepository(AuditLog)
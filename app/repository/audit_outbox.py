@@ -0,0 +1,33 @@
+from typing import Any, Dict, List
+import uuid
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.repository.base import BaseRepository
+from app.models.audit_outbox import AuditOutbox
+
+class AuditOutboxRepository(BaseRepository[AuditOutbox, Any, Any]):
+    """
+    Repository for the audit outbox. Rows are claimed by deleting them, so an entry is moved
+    to audit_log exactly once even when several workers drain the outbox at the same time.
+    """
+    def claim(self, db: Session, *, ids: List[uuid.UUID]) -> List[List[Dict[str, Any]]]:
+        """Deletes the given rows and returns their entries; rows already claimed are skipped."""
+        stmt = delete(self.model).where(self.model.id.in_(ids)).returning(self.model.entries)
+        return db.execute(stmt).scalars().all()
+
+    def claim_oldest(self, db: Session, *, limit: int) -> List[List[Dict[str, Any]]]:
+        """Deletes up to `limit` of the oldest rows not locked by another writer and returns their entries."""
+        oldest = (
+            select(self.model.id)
+            .order_by(self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(self.model).where(self.model.id.in_(oldest.scalar_subquery())).returning(self.model.entries)
+        return db.execute(stmt).scalars().all()
+
+    def count(self, db: Session) -> int:
+        return db.execute(select(func.count()).select_from(self.model)).scalar_one()
+
+audit_outbox_repo = AuditOutboxRepository(AuditOutbox)
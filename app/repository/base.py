@@ -1,6 +1,9 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterable, List, Optional, Type, TypeVar, Union
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Query, Session
+import heapq
+import itertools
 import uuid
 
 from app.db.base import Base
@@ -30,13 +33,15 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db.query(self.model).offset(skip).limit(limit).all()
 
     def create(
-        self, db: Session, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]
+        self, db: Session, *, obj_in: Union[CreateSchemaType, Dict[str, Any]], commit: bool = True
     ) -> ModelType:
         """
         Creates a new record in the database.
         Accepts either a Pydantic schema or a dictionary.
         This allows the service layer to handle logic (like password hashing)
         and pass a clean dictionary to the repository.
+        With `commit=False` the record is only flushed, so the caller can commit
+        it together with other changes.
         """
         if isinstance(obj_in, dict):
             obj_in_data = obj_in
@@ -45,8 +50,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._save(db, db_obj, commit=commit)
         return db_obj
 
     def update(
@@ -54,7 +58,8 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db: Session,
         *,
         db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True
     ) -> ModelType:
         obj_data = db_obj.__dict__
         if isinstance(obj_in, dict):
@@ -65,13 +70,72 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._save(db, db_obj, commit=commit)
         return db_obj
 
-    def remove(self, db: Session, *, id: uuid.UUID) -> ModelType:
+    def remove(self, db: Session, *, id: uuid.UUID, commit: bool = True) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
         return obj
 
+    def get_dependents(
+        self,
+        db: Session,
+        *,
+        id: uuid.UUID,
+        relationships: Iterable[str],
+        criteria: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Returns the names of the given relationships under which the record has at least one
+        related row. All of them are checked in a single `SELECT EXISTS(...), EXISTS(...)`
+        query, so no related row is ever loaded. `criteria` optionally narrows a relationship
+        to the related rows that matter, e.g. `{"payments": Payment.status != ApprovalStatus.DRAFT}`.
+        """
+        criteria = criteria or {}
+        names = list(relationships)
+        checks = [getattr(self.model, name).any(criteria.get(name)).label(name) for name in names]
+        row = db.execute(select(*checks).where(self.model.id == id)).one_or_none()
+        if row is None:
+            return []
+        return [name for name in names if row._mapping[name]]
+
+    def has_dependents(
+        self,
+        db: Session,
+        *,
+        id: uuid.UUID,
+        relationships: Iterable[str],
+        criteria: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Whether the record has a related row under any of the given relationships, see `get_dependents`."""
+        return bool(self.get_dependents(db, id=id, relationships=relationships, criteria=criteria))
+
+    def get_nearest(
+        self, query: Query, *, column: Any, value: int, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """
+        Pages through `query` ordered by the distance of `column` from `value`, closest first,
+        like `ORDER BY abs(column - value)` but without sorting the whole table.
+        Two range probes (`>= value` ascending and `< value` descending), each limited to
+        skip + limit rows, can both be served by a B-tree index on `column`; they are already
+        ordered by distance, so merging them yields the page. `query` must not be ordered.
+        """
+        count = skip + limit
+        above = query.filter(column >= value).order_by(column.asc()).limit(count).all()
+        below = query.filter(column < value).order_by(column.desc()).limit(count).all()
+        nearest = heapq.merge(above, below, key=lambda obj: abs(getattr(obj, column.key) - value))
+        return list(itertools.islice(nearest, skip, count))
+
+    def _save(self, db: Session, db_obj: ModelType, *, commit: bool):
+        """Commits and refreshes the object, or only flushes it when the caller owns the commit."""
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
+        else:
+            db.flush()
+
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import uuid
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.repository.base import BaseRepository
+from app.models.contact_rollup import ContactRollup
+
+# Columns that hold running totals and are changed by deltas.
+COUNTER_COLUMNS = (
+    "sold_total", "bought_total", "transaction_count",
+    "incoming_total", "outgoing_total", "payment_count",
+    "ledger_debt",
+)
+
+class ContactRollupRepository(BaseRepository[ContactRollup, Any, Any]):
+    """
+    Repository for the contact rollup read model.
+    """
+    def get_by_contact_id(self, db: Session, *, contact_id: uuid.UUID) -> Optional[ContactRollup]:
+        return db.query(self.model).filter(self.model.contact_id == contact_id).first()
+
+    def apply_deltas(
+        self,
+        db: Session,
+        *,
+        contact_id: uuid.UUID,
+        deltas: Dict[str, int],
+        activity_at: Optional[datetime] = None,
+    ):
+        """
+        Adds the given deltas (keyed by counter column) to a contact's rollup in a single
+        upsert, creating the row if missing. `activity_at` only ever moves last_activity_at
+        forward. The caller commits, so the rollup changes together with its source.
+        """
+        values = {column: deltas.get(column, 0) for column in COUNTER_COLUMNS}
+        stmt = insert(self.model).values(contact_id=contact_id, last_activity_at=activity_at, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.contact_id],
+            set_={
+                **{column: getattr(self.model, column) + getattr(stmt.excluded, column) for column in deltas},
+                # GREATEST ignores NULLs, so a missing activity leaves the column as it is.
+                "last_activity_at": func.greatest(self.model.last_activity_at, stmt.excluded.last_activity_at),
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    def insert_many(self, db: Session, *, rows: List[Dict[str, Any]]):
+        """Inserts complete rollup rows; used by a rebuild after `delete_all`. The caller commits."""
+        if rows:
+            db.execute(insert(self.model), rows)
+
+    def delete_all(self, db: Session):
+        """Removes every rollup row; used before a rebuild. The caller commits."""
+        db.query(self.model).delete(synchronize_session=False)
+
+contact_rollup_repo = ContactRollupRepository(ContactRollup)
@@ -0,0 +1,71 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+import uuid
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.repository.base import BaseRepository
+from app.models.daily_summary import DailySummary
+from app.models.enums.item_type import ItemType
+from app.models.enums.transaction import TransactionType
+
+class DailySummaryRepository(BaseRepository[DailySummary, Any, Any]):
+    """
+    Repository for the daily summary read model.
+    """
+    def apply_deltas(self, db: Session, *, rows: List[Dict[str, Any]]):
+        """
+        Adds the given counts to their summary rows in a single upsert, creating missing rows.
+        Each row holds the key columns plus item_count, weight_count and total_price deltas.
+        The caller commits, so the summary changes together with the transaction status.
+        """
+        if not rows:
+            return
+        stmt = insert(self.model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_daily_summary_key",
+            set_={
+                "item_count": self.model.item_count + stmt.excluded.item_count,
+                "weight_count": self.model.weight_count + stmt.excluded.weight_count,
+                "total_price": self.model.total_price + stmt.excluded.total_price,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    def delete_all(self, db: Session):
+        """Removes every summary row; used before a rebuild. The caller commits."""
+        db.query(self.model).delete(synchronize_session=False)
+
+    def search(
+        self,
+        db: Session,
+        *,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        jalali_start_day: Optional[str] = None,
+        jalali_end_day: Optional[str] = None,
+        recorder_id: Optional[uuid.UUID] = None,
+        item_type: Optional[ItemType] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> List[DailySummary]:
+        """Gets the summary rows of a day range (inclusive), newest day first."""
+        query = db.query(self.model)
+        if start_day:
+            query = query.filter(self.model.day >= start_day)
+        if end_day:
+            query = query.filter(self.model.day <= end_day)
+        if jalali_start_day:
+            query = query.filter(self.model.jalali_day >= jalali_start_day)
+        if jalali_end_day:
+            query = query.filter(self.model.jalali_day <= jalali_end_day)
+        if recorder_id:
+            query = query.filter(self.model.recorder_id == recorder_id)
+        if item_type:
+            query = query.filter(self.model.item_type == item_type)
+        if transaction_type:
+            query = query.filter(self.model.transaction_type == transaction_type)
+        return query.order_by(self.model.day.desc(), self.model.item_type, self.model.transaction_type).all()
+
+daily_summary_repo = DailySummaryRepository(DailySummary)
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.repository.base import BaseRepository
+from app.models.idempotency_key import IdempotencyKey
+
+class IdempotencyKeyRepository(BaseRepository[IdempotencyKey, Any, Any]):
+    """
+    Repository for stored idempotency keys. Every method commits, since a key must be
+    visible to concurrent retries right away.
+    """
+    def reserve(self, db: Session, *, key: str, fingerprint: str, expires_at: datetime) -> bool:
+        """
+        Atomically claims `key` for a new request. An expired row is taken over.
+        Returns False if the key is held by a live row (in progress or completed).
+        """
+        stmt = insert(self.model).values(key=key, fingerprint=fingerprint, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.key],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "status_code": None,
+                "headers": None,
+                "body": None,
+                "expires_at": stmt.excluded.expires_at,
+                "created_at": func.now(),
+                "updated_at": func.now(),
+            },
+            where=self.model.expires_at < func.now(),
+        ).returning(self.model.id)
+        reserved = db.execute(stmt).first() is not None
+        db.commit()
+        return reserved
+
+    def get_by_key(self, db: Session, *, key: str) -> Optional[IdempotencyKey]:
+        """Gets the row stored for a key, expired or not."""
+        return db.query(self.model).filter(self.model.key == key).first()
+
+    def complete(
+        self,
+        db: Session,
+        *,
+        key: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        expires_at: datetime,
+    ):
+        """Stores the response of a reserved key and extends it to the full retention time."""
+        db.query(self.model).filter(self.model.key == key).update(
+            {"status_code": status_code, "headers": headers, "body": body, "expires_at": expires_at, "updated_at": func.now()},
+            synchronize_session=False,
+        )
+        db.commit()
+
+    def release(self, db: Session, *, key: str):
+        """Drops a reservation so the next retry runs the request again."""
+        db.query(self.model).filter(self.model.key == key).delete(synchronize_session=False)
+        db.commit()
+
+    def delete_expired(self, db: Session) -> int:
+        """Removes every expired row and returns how many were deleted."""
+        count = db.query(self.model).filter(self.model.expires_at < func.now()).delete(synchronize_session=False)
+        db.commit()
+        return count
+
+idempotency_key_repo = IdempotencyKeyRepository(IdempotencyKey)
@@ -0,0 +1,32 @@
+import uuid
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+from typing import Any, List
+
+from app.repository.base import BaseRepository
+from app.models.inventory_change import InventoryChange
+
+class InventoryChangeRepository(BaseRepository[InventoryChange, Any, Any]):
+    """
+    Repository for inventory change (pending delta) operations.
+    """
+    def get_pending(self, db: Session) -> List[InventoryChange]:
+        """
+        Gets all changes that have not been folded into a snapshot yet, oldest first.
+        """
+        return (
+            db.query(self.model)
+            .filter(self.model.inventory_id.is_(None))
+            .order_by(self.model.created_at.asc())
+            .all()
+        )
+
+    def has_pending(self, db: Session, *, ids: List[uuid.UUID]) -> bool:
+        """
+        Checks whether any of the given changes is still waiting to be folded into a snapshot.
+        """
+        return db.scalar(
+            select(exists().where(self.model.id.in_(ids), self.model.inventory_id.is_(None)))
+        )
+
+inventory_change_repo = InventoryChangeRepository(InventoryChange)
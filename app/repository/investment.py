@@ -1,7 +1,10 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 from app.repository.base import BaseRepository
 from app.models.investment import Investment
+from app.models.investor import Investor, InvestorStatus
 from typing import Any, Optional, List
+from datetime import datetime
 import uuid
 
 class InvestmentRepository(BaseRepository[Investment, Any, Any]):
@@ -35,4 +38,17 @@ class InvestmentRepository(BaseRepository[Investment, Any, Any]):
 
         return query.order_by(self.model.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_active_timelines(self, db: Session, *, before: datetime) -> List[Row]:
+        """
+        Gets (investor_id, amount, created_at) of every investment made before `before`
+        by an active investor, grouped by investor, in a single query.
+        """
+        return (
+            db.query(self.model.investor_id, self.model.amount, self.model.created_at)
+            .join(Investor, Investor.id == self.model.investor_id)
+            .filter(Investor.status == InvestorStatus.ACTIVE, self.model.created_at < before)
+            .order_by(self.model.investor_id, self.model.created_at)
+            .all()
+        )
+
 investment_repo = InvestmentRepository(Investment)
@@ -1,9 +1,16 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import BigInteger, Row, and_, case, desc, exists, func, literal, select, union_all
+from typing import List, Optional, Tuple
+import uuid
 
 from app.repository.base import BaseRepository
+from app.models.investment import Investment
 from app.models.investor import Investor, InvestorStatus
+from app.models.payment import Payment
+from app.models.profit_distribution import ProfitShare
 from app.models.user import User
+from app.models.enums.payment import PaymentDirection
+from app.models.enums.shared import ApprovalStatus
 from app.schema.investor import InvestorCreate, InvestorUpdate
 
 class InvestorRepository(BaseRepository[Investor, InvestorCreate, InvestorUpdate]):
@@ -54,4 +61,108 @@ class InvestorRepository(BaseRepository[Investor, InvestorCreate, InvestorUpdate
             
         return query.offset(skip).limit(limit).all()
 
+    def get_many_for_update(self, db: Session, *, ids: List[uuid.UUID]) -> List[Investor]:
+        """Loads and row-locks several investors, so their credit can be changed safely."""
+        return db.query(self.model).filter(self.model.id.in_(ids)).with_for_update().all()
+
+    def get_statement(
+        self,
+        db: Session,
+        *,
+        investor_id: uuid.UUID,
+        credit: int,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[Row], int]:
+        """
+        Gets one page of an investor's statement, newest first, and the total number of entries.
+
+        Entries are the investor's investments (DEPOSIT when created from a payment, INVESTMENT
+        otherwise), their withdrawals, incoming payments that have not produced an investment
+        yet, and their profit shares. Running balances are window functions over the whole
+        statement, so they are correct on every page: `invested_balance` sums the investments
+        up to the entry, and `credit_balance` is the current credit minus every later credit
+        change, which makes the newest entry always agree with the investor's credit.
+        """
+        investments = (
+            select(
+                case((Investment.payment_id.is_(None), literal("INVESTMENT")), else_=literal("DEPOSIT")).label("entry_type"),
+                Investment.id.label("id"),
+                Investment.created_at.label("occurred_at"),
+                Investment.amount.label("amount"),
+                Payment.status.label("status"),
+                Investment.payment_id.label("payment_id"),
+                Investment.id.label("investment_id"),
+                Investment.amount.label("capital_delta"),
+                literal(0, BigInteger).label("credit_delta"),
+            )
+            .select_from(Investment)
+            .outerjoin(Payment, Payment.id == Investment.payment_id)
+            .where(Investment.investor_id == investor_id)
+        )
+        is_withdrawal = Payment.direction == PaymentDirection.OUTGOING
+        payments = (
+            select(
+                case((is_withdrawal, literal("WITHDRAWAL")), else_=literal("DEPOSIT")).label("entry_type"),
+                Payment.id.label("id"),
+                Payment.created_at.label("occurred_at"),
+                Payment.amount.label("amount"),
+                Payment.status.label("status"),
+                Payment.id.label("payment_id"),
+                literal(None, Investment.id.type).label("investment_id"),
+                literal(0, BigInteger).label("capital_delta"),
+                # Withdrawals take credit on their first approval and give it back when rejected to draft.
+                case((and_(is_withdrawal, Payment.status != ApprovalStatus.DRAFT), -Payment.amount), else_=0).label("credit_delta"),
+            )
+            .where(
+                Payment.investor_id == investor_id,
+                # Approved incoming payments are already listed through their investment.
+                is_withdrawal | and_(
+                    Payment.direction == PaymentDirection.INCOMING,
+                    ~exists().where(Investment.payment_id == Payment.id),
+                ),
+            )
+        )
+        profits = select(
+            literal("PROFIT").label("entry_type"),
+            ProfitShare.id.label("id"),
+            ProfitShare.created_at.label("occurred_at"),
+            ProfitShare.amount.label("amount"),
+            literal(None, Payment.status.type).label("status"),
+            literal(None, Payment.id.type).label("payment_id"),
+            literal(None, Investment.id.type).label("investment_id"),
+            literal(0, BigInteger).label("capital_delta"),
+            ProfitShare.amount.label("credit_delta"),
+        ).where(ProfitShare.investor_id == investor_id)
+        entries = union_all(investments, payments, profits).subquery("entry")
+
+        statement = (
+            select(
+                entries.c.entry_type,
+                entries.c.occurred_at,
+                entries.c.amount,
+                entries.c.status,
+                entries.c.payment_id,
+                entries.c.investment_id,
+                func.sum(entries.c.capital_delta).over(
+                    order_by=(entries.c.occurred_at, entries.c.id),
+                ).label("invested_balance"),
+                (literal(credit, BigInteger) - func.coalesce(func.sum(entries.c.credit_delta).over(
+                    order_by=(desc(entries.c.occurred_at), desc(entries.c.id)),
+                    rows=(None, -1),
+                ), 0)).label("credit_balance"),
+                func.count().over().label("total"),
+            )
+            .order_by(desc(entries.c.occurred_at), desc(entries.c.id))
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = db.execute(statement).all()
+        if rows:
+            return rows, rows[0].total
+        if skip == 0:
+            return rows, 0
+        # Past the last page the window has no row to report on, so count separately.
+        return rows, db.execute(select(func.count()).select_from(entries)).scalar_one()
+
 investor_repo = InvestorRepository(Investor)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
+import uuid
 
 from app.repository.base import BaseRepository
 from app.models.item import Item, MeasurementType
@@ -13,6 +14,13 @@ class ItemRepository(BaseRepository[Item, ItemCreate, ItemUpdate]):
         """Get an item by its unique name."""
         return db.query(self.model).filter(self.model.name == name).first()
 
+    def get_existing_ids(self, db: Session, *, ids: Iterable[uuid.UUID]) -> Set[uuid.UUID]:
+        """Returns which of the given item IDs exist, in a single query."""
+        ids = set(ids)
+        if not ids:
+            return set()
+        return {row.id for row in db.query(self.model.id).filter(self.model.id.in_(ids))}
+
     def search(
         self,
         db: Session,
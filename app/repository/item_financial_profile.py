@@ -1,3 +1,5 @@
+from typing import List
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 from app.repository.base import BaseRepository
 from app.models.item_financial_profile import ItemFinancialProfile
@@ -7,6 +9,15 @@ class ItemFinancialProfileRepository(BaseRepository[ItemFinancialProfile, ItemFi
     """
     Repository for item financial profile related database operations.
     """
-    pass
+    def get_all_defaults(self, db: Session) -> List[Row]:
+        """Returns the default columns of every profile in a single query."""
+        return db.query(
+            self.model.item_id,
+            self.model.transaction_type,
+            self.model.karat_default,
+            self.model.ojrat_default,
+            self.model.profit_default,
+            self.model.tax_default,
+        ).all()
 
 item_financial_profile_repo = ItemFinancialProfileRepository(ItemFinancialProfile)
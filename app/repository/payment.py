@@ -1,6 +1,6 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from typing import List, Optional, Any
+from sqlalchemy.orm import Query, Session, aliased, selectinload
+from sqlalchemy import Row, desc, func, select, text, true, tuple_
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 from datetime import datetime
 
@@ -18,6 +18,42 @@ class PaymentRepository(BaseRepository[Payment, PaymentCreate, PaymentUpdate]):
         """Gets the first payment found with a matching description."""
         return db.query(self.model).filter(self.model.description == description).first()
 
+    def get_many_for_approval(self, db: Session, *, ids: List[uuid.UUID]) -> List[Payment]:
+        """Loads several payments together with the investor they may change, in two queries."""
+        return (
+            db.query(self.model)
+            .options(selectinload(self.model.investor))
+            .filter(self.model.id.in_(ids))
+            .all()
+        )
+
+    def get_reconciliation_candidates(
+        self,
+        db: Session,
+        *,
+        amounts: List[int],
+        start_time: datetime,
+        end_time: datetime,
+        saved_bank_account_id: Optional[uuid.UUID] = None,
+    ) -> List[Row]:
+        """
+        Gets (id, amount, direction, created_at) of every non-transfer payment with one of the
+        given amounts inside [start_time, end_time). The equality on amount followed by the
+        range on created_at is served by the (amount, created_at) index.
+        """
+        query = (
+            db.query(self.model.id, self.model.amount, self.model.direction, self.model.created_at)
+            .filter(
+                self.model.amount.in_(amounts),
+                self.model.created_at >= start_time,
+                self.model.created_at < end_time,
+                self.model.direction != PaymentDirection.INTERNAL_TRANSFER,
+            )
+        )
+        if saved_bank_account_id:
+            query = query.filter(self.model.saved_bank_account_id == saved_bank_account_id)
+        return query.order_by(self.model.created_at).all()
+
     def search(
         self,
         db: Session,
@@ -43,6 +79,43 @@ class PaymentRepository(BaseRepository[Payment, PaymentCreate, PaymentUpdate]):
         """
         Searches for payments based on a combination of criteria with advanced sorting.
         """
+        query = self.build_search_query(
+            db,
+            payment_method=payment_method,
+            direction=direction,
+            status=status,
+            photo_holder_id=photo_holder_id,
+            investor_id=investor_id,
+            transaction_id=transaction_id,
+            account_ledger_id=account_ledger_id,
+            saved_bank_account_id=saved_bank_account_id,
+            recorder_id=recorder_id,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        if amount is not None:
+            # Closest amount first, via two probes on the (amount, created_at) index
+            return self.get_nearest(query.order_by(None), column=self.model.amount, value=amount, skip=skip, limit=limit)
+        return query.offset(skip).limit(limit).all()
+
+    def build_search_query(
+        self,
+        db: Session,
+        *,
+        payment_method: Optional[PaymentMethod] = None,
+        direction: Optional[PaymentDirection] = None,
+        status: Optional[ApprovalStatus] = None,
+        photo_holder_id: Optional[uuid.UUID] = None,
+        investor_id: Optional[uuid.UUID] = None,
+        transaction_id: Optional[uuid.UUID] = None,
+        account_ledger_id: Optional[uuid.UUID] = None,
+        saved_bank_account_id: Optional[uuid.UUID] = None,
+        recorder_id: Optional[uuid.UUID] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        amount: Optional[int] = None,
+    ) -> Query:
+        """Builds the filtered and sorted search query, shared by the paged search and the exports."""
         query = db.query(self.model)
 
         # Apply filters
@@ -69,15 +142,76 @@ class PaymentRepository(BaseRepository[Payment, PaymentCreate, PaymentUpdate]):
         if end_time:
             query = query.filter(self.model.created_at <= end_time)
 
-        # Conditional Sorting
+        return query.order_by(*self._search_order(self.model, amount))
+
+    def search_with_aggregates(
+        self,
+        db: Session,
+        *,
+        amount: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        **filters: Any,
+    ) -> Tuple[List[Payment], List[Dict[str, Any]]]:
+        """
+        Gets one page of search results together with counts and sums over ALL matching
+        payments, in a single statement. The aggregates come from GROUPING SETS over
+        direction, payment method and status (see `_aggregate_columns`) and are folded
+        into one JSON value by an uncorrelated subquery, which Postgres evaluates once. The
+        page is LEFT JOINed to it, so the aggregates arrive even when the page is empty.
+        Each aggregate dict holds direction, payment_method and status (None when the
+        group spans all values; enum names otherwise), count and total_amount.
+        """
+        matching = self.build_search_query(db, **filters).order_by(None)
+        groups = (
+            matching.with_entities(
+                self.model.direction,
+                self.model.payment_method,
+                self.model.status,
+                func.count().label("count"),
+                func.coalesce(func.sum(self.model.amount), 0).label("total_amount"),
+            )
+            .group_by(func.grouping_sets(*(tuple_(*columns) for columns in self._aggregate_columns())))
+            .subquery()
+        )
+        aggregates = select(
+            func.coalesce(
+                func.json_agg(func.json_build_object(
+                    "direction", groups.c.direction,
+                    "payment_method", groups.c.payment_method,
+                    "status", groups.c.status,
+                    "count", groups.c.count,
+                    "total_amount", groups.c.total_amount,
+                )),
+                text("'[]'::json"),
+            ).label("aggregates")
+        ).subquery()
+
+        page = self.build_search_query(db, amount=amount, **filters).offset(skip).limit(limit).subquery()
+        page_payment = aliased(self.model, page)
+        rows = (
+            db.query(aggregates.c.aggregates, page_payment)
+            .select_from(aggregates)
+            .outerjoin(page, true())
+            # The join does not keep the subquery's order, so the page order is applied again.
+            .order_by(*self._search_order(page_payment, amount))
+            .all()
+        )
+        payments = [payment for _, payment in rows if payment is not None]
+        return payments, rows[0].aggregates
+
+    def _aggregate_columns(self) -> List[Tuple[Any, ...]]:
+        """The grouping sets of `search_with_aggregates`: overall, per direction, and per direction by method and/or status."""
+        direction, method, approval_status = self.model.direction, self.model.payment_method, self.model.status
+        return [(), (direction,), (direction, method), (direction, approval_status), (direction, method, approval_status)]
+
+    def _search_order(self, entity: Any, amount: Optional[int]) -> List[Any]:
+        """Sort order of the search: closest amount first when an amount is given, newest first otherwise."""
         if amount is not None:
             # Order by the absolute difference from the provided amount
-            query = query.order_by(func.abs(self.model.amount - amount).asc())
-        else:
-            # Default sort by the most recent payment
-            query = query.order_by(desc(self.model.created_at))
-            
-        return query.offset(skip).limit(limit).all()
+            return [func.abs(entity.amount - amount).asc()]
+        # Default sort by the most recent payment
+        return [desc(entity.created_at)]
 
 payment_repo = PaymentRepository(Payment)
 
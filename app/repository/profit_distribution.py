@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, List, Optional
+import uuid
+from sqlalchemy.orm import Session, selectinload
+
+from app.repository.base import BaseRepository
+from app.models.profit_distribution import ProfitDistribution
+
+class ProfitDistributionRepository(BaseRepository[ProfitDistribution, Any, Any]):
+    """Repository for profit distribution runs and their shares."""
+
+    def get_with_shares(self, db: Session, *, id: uuid.UUID) -> Optional[ProfitDistribution]:
+        """Gets a distribution with all of its shares, in two queries."""
+        return (
+            db.query(self.model)
+            .options(selectinload(self.model.shares))
+            .filter(self.model.id == id)
+            .first()
+        )
+
+    def get_recent(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ProfitDistribution]:
+        """Gets a page of distributions, latest period first, with their shares."""
+        return (
+            db.query(self.model)
+            .options(selectinload(self.model.shares))
+            .order_by(self.model.period_end.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def get_overlapping(self, db: Session, *, period_start: datetime, period_end: datetime) -> Optional[ProfitDistribution]:
+        """Gets a distribution whose period overlaps [period_start, period_end), if any."""
+        return (
+            db.query(self.model)
+            .filter(self.model.period_start < period_end, self.model.period_end > period_start)
+            .first()
+        )
+
+profit_distribution_repo = ProfitDistributionRepository(ProfitDistribution)
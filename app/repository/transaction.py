@@ -1,5 +1,6 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, update
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
 from datetime import datetime
 import uuid
 
@@ -31,20 +32,45 @@ class TransactionRepository(BaseRepository[Transaction, CreateSchemaType, Update
         item_title: Optional[str] = None,
         item_id: Optional[uuid.UUID] = None,
         item_transaction_type: Optional[TransactionType] = None,
+        with_items: bool = False,
         skip: int = 0, 
         limit: int = 100
     ) -> List[Transaction]:
-        
+        """
+        Searches transactions. Item filters are applied as one EXISTS semi-join, so every
+        transaction appears once and skip/limit count transactions, not items.
+        With `with_items`, the items of the whole page are loaded in one extra query.
+        """
+        query = self.build_search_query(
+            db, current_user=current_user, recorder_id=recorder_id, contact_id=contact_id, status=status,
+            start_time=start_time, end_time=end_time, item_title=item_title, item_id=item_id,
+            item_transaction_type=item_transaction_type,
+        )
+        if with_items:
+            query = query.options(selectinload(self.model.items))
+
+        return query.offset(skip).limit(limit).all()
+
+    def build_search_query(
+        self,
+        db: Session, *,
+        current_user: User,
+        recorder_id: Optional[uuid.UUID] = None,
+        contact_id: Optional[uuid.UUID] = None,
+        status: Optional[ApprovalStatus] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        item_title: Optional[str] = None,
+        item_id: Optional[uuid.UUID] = None,
+        item_transaction_type: Optional[TransactionType] = None,
+    ) -> Query:
+        """Builds the filtered and ordered search query, shared by the paged search and the exports."""
         query = db.query(self.model)
 
         # Admin can see all, user can only see their own
         if not current_user.role == UserRole.ADMIN:
             query = query.filter(self.model.recorder_id == current_user.id)
         
-        # Filtering on TransactionItem requires a join
-        if item_title or item_id or item_transaction_type:
-            query = query.join(TransactionItem)
-
         if recorder_id:
             query = query.filter(self.model.recorder_id == recorder_id)
         if contact_id:
@@ -56,15 +82,51 @@ class TransactionRepository(BaseRepository[Transaction, CreateSchemaType, Update
         if end_time:
             query = query.filter(self.model.created_at <= end_time)
         
-        # Filters on the joined TransactionItem table
+        # Filters on TransactionItem; a single item has to match all of them
+        item_filters = []
         if item_title:
-            query = query.filter(TransactionItem.title.ilike(f"%{item_title}%"))
+            item_filters.append(TransactionItem.title.ilike(f"%{item_title}%"))
         if item_id:
-            query = query.filter(TransactionItem.item_id == item_id)
+            item_filters.append(TransactionItem.item_id == item_id)
         if item_transaction_type:
-            query = query.filter(TransactionItem.transaction_type == item_transaction_type)
+            item_filters.append(TransactionItem.transaction_type == item_transaction_type)
+        if item_filters:
+            query = query.filter(self.model.items.any(and_(*item_filters)))
+
+        return query.order_by(self.model.created_at.desc())
+
+    def create_with_items(self, db: Session, *, obj_in: Dict[str, Any], items_in: List[Dict[str, Any]]) -> Transaction:
+        """
+        Creates a transaction and all of its items in a single commit.
+        """
+        db_obj = self.model(**obj_in)
+        db_obj.items = [TransactionItem(**item_data) for item_data in items_in]
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def apply_total_delta(self, db: Session, *, transaction_id: uuid.UUID, delta: int) -> int:
+        """
+        Atomically adds a signed delta to a transaction's total_price and returns the new total.
+        Runs as a single UPDATE ... RETURNING without loading the items; the caller commits.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == transaction_id)
+            .values(total_price=self.model.total_price + delta)
+            .returning(self.model.total_price)
+        )
+        return db.execute(stmt).scalar_one()
 
-        return query.order_by(self.model.created_at.desc()).offset(skip).limit(limit).all()
+    def get_many_with_items(self, db: Session, *, ids: List[uuid.UUID]) -> List[Transaction]:
+        """Loads several transactions with their items (and the items' templates) in three queries in total."""
+        return (
+            db.query(self.model)
+            .options(selectinload(self.model.items).selectinload(TransactionItem.item))
+            .filter(self.model.id.in_(ids))
+            .all()
+        )
 
     def get_with_items(self, db: Session, id: uuid.UUID) -> Optional[Transaction]:
         return db.query(self.model).options(joinedload(self.model.items)).filter(self.model.id == id).first()
@@ -1,5 +1,7 @@
+import uuid
 from typing import Optional, Union
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from app.models.investor import Investor
 from app.models.user import User
 from app.schema.user import UserCreate, UserUpdateAdmin, UserUpdateMe, AdminCreate
 from .base import BaseRepository
@@ -10,6 +12,25 @@ class UserRepository(BaseRepository[User, Union[UserCreate, AdminCreate, dict],
     Inherits from BaseRepository and adds user-specific query methods.
     """
 
+    def get_with_profile(self, db: Session, *, id: uuid.UUID) -> Optional[User]:
+        """
+        Retrieves a user together with their permissions, investor profile and its contact in
+        one query. Non-investors simply get an empty profile from the outer join.
+
+        :param db: The database session.
+        :param id: The user's ID.
+        :return: The User instance if found, otherwise None.
+        """
+        return (
+            db.query(User)
+            .options(
+                joinedload(User.permissions),
+                joinedload(User.investor_profile).joinedload(Investor.contact),
+            )
+            .filter(User.id == id)
+            .first()
+        )
+
     def get_by_username(self, db: Session, *, username: str) -> Optional[User]:
         """
         Retrieves a user by their username.
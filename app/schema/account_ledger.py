@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 
 from .base import BaseSchema
 
@@ -30,3 +30,29 @@ class AccountLedgerUpdate(BaseModel):
 class AccountLedgerPublic(BaseSchema, AccountLedgerBase):
     """Schema for representing an account ledger entry in public API responses."""
     model_config = ConfigDict(from_attributes=True)
+
+class AgingBucket(BaseModel):
+    """Total debt and number of ledger entries in one aging bucket."""
+    debt: int = 0
+    count: int = 0
+
+class DebtAging(BaseModel):
+    """Outstanding debt split by how far each entry's deadline is from the report time."""
+    not_due: AgingBucket = Field(..., description="Deadline is more than 7 days away.")
+    due_this_week: AgingBucket = Field(..., description="Deadline is within the next 7 days.")
+    overdue_0_30: AgingBucket = Field(..., description="Deadline passed up to 30 days ago.")
+    overdue_31_60: AgingBucket
+    overdue_61_90: AgingBucket
+    overdue_over_90: AgingBucket
+    no_deadline: AgingBucket
+    total: AgingBucket
+
+class ContactDebtAging(DebtAging):
+    """Debt aging of a single contact."""
+    contact_id: uuid.UUID
+
+class DebtAgingReport(BaseModel):
+    """Shop-wide debt aging plus a page of contacts, largest total debt first."""
+    as_of: datetime
+    shop: DebtAging
+    contacts: List[ContactDebtAging]
@@ -1,5 +1,6 @@
 import uuid
-from pydantic import ConfigDict
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any
 
 from .base import BaseSchema
@@ -12,8 +13,52 @@ class AuditLogPublic(BaseSchema):
     user_id: Optional[uuid.UUID]
     operation: OperationType
     table_name: str
+    record_id: Optional[uuid.UUID]
     before_state: Optional[Dict[str, Any]]
     after_state: Optional[Dict[str, Any]]
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class AuditRecordState(BaseModel):
+    """
+    The state of one record at a point in time, rebuilt from its audit entries: the state
+    recorded at creation with every later change applied in order.
+    """
+    table_name: str
+    record_id: uuid.UUID
+    at: datetime
+    exists: bool = Field(..., description="False if the record had been deleted by then.")
+    complete: bool = Field(..., description="Whether the creation of the record is in the audit log. If not, only the columns changed since are known.")
+    state: Optional[Dict[str, Any]] = Field(None, description="The column values at that time; None if the record had been deleted.")
+    last_operation: OperationType
+    last_changed_at: datetime
+    changes_applied: int
+
+
+class AuditWriterStats(BaseModel):
+    """
+    State of the background audit writer of the worker that served the request.
+    Counters start at zero when the worker starts.
+    """
+    mode: str = Field(..., description="The configured AUDIT_WRITE_MODE, 'sync' or 'async'.")
+    running: bool
+    queue_size: int = Field(..., description="Outbox rows waiting in this worker's queue.")
+    queue_capacity: int
+    outbox_backlog: int = Field(..., description="Rows in the audit_outbox table not yet moved to audit_log, across all workers.")
+    enqueued: int
+    deferred: int = Field(..., description="Outbox rows not queued because the queue was full; they are written by the next sweep.")
+    written_entries: int
+    written_batches: int
+    failed_batches: int
+    last_batch_entries: int
+    last_batch_ms: float
+
+
+class AuditLogPartition(BaseModel):
+    """One monthly partition of audit_log, or the default partition that catches rows outside every month."""
+    name: str
+    range_start: Optional[datetime] = Field(None, description="Inclusive lower bound; None for the default partition.")
+    range_end: Optional[datetime] = Field(None, description="Exclusive upper bound; None for the default partition.")
+    estimated_rows: int = Field(..., description="Planner estimate, -1 until the partition is first analyzed.")
+    size_bytes: int
@@ -0,0 +1,30 @@
+import uuid
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+from app.models.enums.shared import ApprovalStatus
+
+class BulkActionRequest(BaseModel):
+    """The records to approve or reject in one request."""
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=200)
+
+    @field_validator('ids')
+    @classmethod
+    def check_unique(cls, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        """Each record can only be processed once per request."""
+        if len(set(ids)) != len(ids):
+            raise ValueError("The list of IDs contains duplicates.")
+        return ids
+
+class BulkActionResult(BaseModel):
+    """The outcome for a single record of a bulk action."""
+    id: uuid.UUID
+    success: bool
+    status: Optional[ApprovalStatus] = None
+    detail: Optional[str] = None
+
+class BulkActionResponse(BaseModel):
+    """Per-record outcomes, in the order of the request."""
+    succeeded: int
+    failed: int
+    results: List[BulkActionResult]
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class ExportFormat(str, Enum):
+    """File formats supported by the export endpoints."""
+    CSV = "csv"
+    XLSX = "xlsx"
@@ -0,0 +1,10 @@
+from typing import List, Optional, Tuple
+from pydantic import BaseModel
+
+
+class StoredResponse(BaseModel):
+    """A response kept for an Idempotency-Key, or a reservation while `status_code` is None."""
+    fingerprint: str
+    status_code: Optional[int] = None
+    headers: List[Tuple[str, str]] = []
+    body: bytes = b""
@@ -1,10 +1,13 @@
 import uuid
+from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel, Field, computed_field, ConfigDict
-from typing import Optional, Any
+from typing import List, Optional, Any
 
 from .base import BaseSchema
 from .contact import ContactPublic
 from app.models.enums.investor import InvestorStatus
+from app.models.enums.shared import ApprovalStatus
 
 # --- Schemas for Creating and Updating ---
 
@@ -68,3 +71,29 @@ class InvestorProfilePublic(InvestorSchema):
     """
     pass
 
+
+# --- Schemas for the Investor Statement ---
+
+class StatementEntryType(str, Enum):
+    """The kind of a single line on an investor's statement."""
+    INVESTMENT = "investment"
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    PROFIT = "profit"
+
+class InvestorStatementEntry(BaseModel):
+    """One line of an investor's statement with the running balances after it."""
+    entry_type: StatementEntryType
+    occurred_at: datetime
+    amount: int
+    status: Optional[ApprovalStatus] = Field(None, description="Status of the linked payment, if any.")
+    payment_id: Optional[uuid.UUID] = None
+    investment_id: Optional[uuid.UUID] = None
+    invested_balance: int = Field(..., description="Total invested up to and including this entry.")
+    credit_balance: int = Field(..., description="The investor's credit right after this entry.")
+
+class InvestorStatement(BaseModel):
+    """One page of an investor's statement, newest entries first."""
+    profile: InvestorProfilePublic
+    entries: List[InvestorStatementEntry]
+    total: int = Field(..., description="Number of entries over all pages.")
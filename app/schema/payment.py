@@ -1,6 +1,6 @@
 import uuid
 from pydantic import BaseModel, Field, model_validator, ConfigDict
-from typing import Optional, Any
+from typing import List, Optional, Any
 
 from .base import BaseSchema
 from ..models.enums.payment import PaymentMethod, PaymentDirection
@@ -67,3 +67,16 @@ class PaymentPublic(PaymentBase, BaseSchema):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class PaymentAggregate(BaseModel):
+    """Count and sum of the matching payments in one group. A null field means the group spans all of its values."""
+    direction: Optional[PaymentDirection] = None
+    payment_method: Optional[PaymentMethod] = None
+    status: Optional[ApprovalStatus] = None
+    count: int
+    total_amount: int
+
+class PaymentSearchWithAggregates(BaseModel):
+    """One page of payment search results plus aggregates over every matching payment."""
+    items: List[PaymentPublic]
+    aggregates: List[PaymentAggregate]
@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+
+from .base import BaseSchema
+
+class ProfitDistributionCreate(BaseModel):
+    """Schema for previewing or running a profit distribution over a period."""
+    period_start: datetime
+    period_end: datetime
+    total_profit: int = Field(..., gt=0, description="The profit to distribute, in Rials.")
+    description: Optional[str] = Field(None, max_length=255)
+
+    @model_validator(mode='after')
+    def check_period(self) -> 'ProfitDistributionCreate':
+        """Ensure the period is not empty."""
+        if self.period_end <= self.period_start:
+            raise ValueError("period_end must be after period_start.")
+        return self
+
+class ProfitSharePublic(BaseModel):
+    """One investor's part of a profit distribution."""
+    investor_id: uuid.UUID
+    amount: int
+    weight: float = Field(..., description="The investor's fraction of the time-weighted capital of the period.")
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ProfitDistributionPreview(BaseModel):
+    """The shares a distribution would credit, without writing anything."""
+    period_start: datetime
+    period_end: datetime
+    total_profit: int
+    shares: List[ProfitSharePublic]
+
+class ProfitDistributionPublic(BaseSchema):
+    """A profit distribution that has been applied."""
+    period_start: datetime
+    period_end: datetime
+    total_profit: int
+    description: Optional[str]
+    creator_user_id: Optional[uuid.UUID]
+    shares: List[ProfitSharePublic]
+
+    model_config = ConfigDict(from_attributes=True)
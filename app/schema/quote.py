@@ -0,0 +1,46 @@
+import uuid
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from decimal import Decimal
+
+from app.models.enums.transaction import TransactionType
+
+class QuoteLine(BaseModel):
+    """
+    A candidate line to price. Any of ojrat, profit, tax or karat left empty is filled
+    from the item's financial profile for the given transaction type.
+    """
+    item_id: uuid.UUID
+    transaction_type: TransactionType
+    weight_count: Decimal = Field(..., gt=0, decimal_places=2)
+    unit_price: int = Field(..., ge=0)
+    karat: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
+    ojrat: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
+    profit: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
+    tax: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
+
+class QuoteRequest(BaseModel):
+    """A batch of candidate lines, priced together without being stored."""
+    lines: List[QuoteLine] = Field(..., min_length=1, max_length=1000)
+    discount: int = Field(0, ge=0)
+
+class QuoteLinePublic(BaseModel):
+    """A priced line, showing the values that were actually used."""
+    item_id: uuid.UUID
+    transaction_type: TransactionType
+    weight_count: Decimal
+    unit_price: int
+    karat: Optional[Decimal]
+    ojrat: Optional[Decimal]
+    profit: Optional[Decimal]
+    tax: Optional[Decimal]
+    total_price: int
+
+class QuotePublic(BaseModel):
+    """
+    The priced lines and the resulting total: SELL lines are added, BUY lines
+    subtracted and the discount applied, exactly like a transaction's total_price.
+    """
+    lines: List[QuoteLinePublic]
+    discount: int
+    total_price: int
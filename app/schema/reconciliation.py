@@ -0,0 +1,31 @@
+import uuid
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.models.enums.payment import PaymentDirection
+
+class StatementLine(BaseModel):
+    """One line of an uploaded bank statement."""
+    line_number: int = Field(..., description="Line number in the uploaded file, counting the header as line 1.")
+    date: date
+    amount: int = Field(..., gt=0, description="Absolute amount of the line in Rials.")
+    direction: PaymentDirection = Field(..., description="Incoming for deposits (positive amounts), outgoing for withdrawals (negative amounts).")
+    description: Optional[str] = None
+
+class ReconciliationMatch(BaseModel):
+    """A statement line paired with the single payment that fits it."""
+    line: StatementLine
+    payment_id: uuid.UUID
+
+class ReconciliationAmbiguity(BaseModel):
+    """A statement line that fits several payments; a person has to pick one."""
+    line: StatementLine
+    candidate_payment_ids: List[uuid.UUID]
+
+class ReconciliationResult(BaseModel):
+    """Outcome of reconciling a bank statement against the payment table."""
+    total_lines: int
+    matched: List[ReconciliationMatch]
+    ambiguous: List[ReconciliationAmbiguity]
+    unmatched: List[StatementLine]
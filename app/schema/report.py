@@ -0,0 +1,39 @@
+import uuid
+from datetime import date, datetime
+from typing import Optional
+from decimal import Decimal
+from pydantic import BaseModel, ConfigDict
+
+from app.models.enums.item_type import ItemType
+from app.models.enums.transaction import TransactionType
+
+class DailySummaryPublic(BaseModel):
+    """One day's admin-approved items of one item type and transaction type, for one recorder."""
+    day: date
+    jalali_day: str
+    item_type: ItemType
+    transaction_type: TransactionType
+    recorder_id: uuid.UUID
+    item_count: int
+    weight_count: Decimal
+    total_price: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ContactRollupPublic(BaseModel):
+    """A contact's lifetime financial standing. Transactions and payments count once approved by an admin."""
+    contact_id: uuid.UUID
+    sold_total: int
+    bought_total: int
+    transaction_count: int
+    incoming_total: int
+    outgoing_total: int
+    payment_count: int
+    ledger_debt: int
+    last_activity_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReadModelRebuildResult(BaseModel):
+    """Outcome of rebuilding a read model."""
+    rows: int
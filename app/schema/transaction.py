@@ -4,7 +4,7 @@ from typing import Optional, List
 
 from app.models.enums.shared import ApprovalStatus
 from .base import BaseSchema
-from .transaction_item import TransactionItemPublic
+from .transaction_item import TransactionItemLine, TransactionItemPublic
 
 # --- Base Schemas ---
 
@@ -16,6 +16,10 @@ class TransactionBase(BaseModel):
 class TransactionCreate(TransactionBase):
     pass
 
+class TransactionWithItemsCreate(TransactionBase):
+    """Creates a transaction together with all of its line items."""
+    items: List[TransactionItemLine] = Field(..., min_length=1)
+
 class TransactionUpdate(BaseModel):
     contact_id: Optional[uuid.UUID] = None
     note: Optional[str] = None
@@ -1,13 +1,13 @@
 import uuid
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Optional
 from decimal import Decimal
 
 from .base import BaseSchema
 from app.models.enums.transaction import TransactionType
 
-class TransactionItemBase(BaseModel):
-    transaction_id: uuid.UUID
+class TransactionItemLine(BaseModel):
+    """A line item without its parent transaction, used when items are sent together with a transaction."""
     item_id: uuid.UUID
     transaction_type: TransactionType
     title: str = Field(..., min_length=1)
@@ -18,6 +18,9 @@ class TransactionItemBase(BaseModel):
     profit: Optional[Decimal] = Field(None, ge=0)
     tax: Optional[Decimal] = Field(None, ge=0)
 
+class TransactionItemBase(TransactionItemLine):
+    transaction_id: uuid.UUID
+
 class TransactionItemCreate(TransactionItemBase):
     pass
 
@@ -32,6 +35,24 @@ class TransactionItemUpdate(BaseModel):
     profit: Optional[Decimal] = Field(None, ge=0)
     tax: Optional[Decimal] = Field(None, ge=0)
 
+class TransactionItemBulkUpdate(TransactionItemUpdate):
+    id: uuid.UUID
+
+class TransactionItemsBulkModify(BaseModel):
+    """Creates, updates and deletes items of one draft transaction in a single request."""
+    create: List[TransactionItemLine] = []
+    update: List[TransactionItemBulkUpdate] = []
+    delete: List[uuid.UUID] = []
+
+    @model_validator(mode='after')
+    def check_operations(self) -> 'TransactionItemsBulkModify':
+        """Ensure there is something to do and that no item is both updated and deleted."""
+        if not (self.create or self.update or self.delete):
+            raise ValueError("At least one item must be created, updated or deleted.")
+        if {item.id for item in self.update} & set(self.delete):
+            raise ValueError("An item cannot be updated and deleted in the same request.")
+        return self
+
 class TransactionItemPublic(BaseSchema):
     transaction_id: uuid.UUID
     item_id: uuid.UUID
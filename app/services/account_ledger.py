@@ -1,19 +1,40 @@
 from sqlalchemy.orm import Session
 import uuid
-from typing import List, Any
+from datetime import datetime, timezone
+from typing import List, Any, Optional, Tuple
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.exceptions import AppException
 from fastapi import status
 from app.models.account_ledger import AccountLedger
 from app.models.payment import Payment, PaymentDirection
 from app.repository.account_ledger import account_ledger_repo
-from app.schema.account_ledger import AccountLedgerCreate, AccountLedgerUpdate
+from app.schema.account_ledger import (
+    AccountLedgerCreate,
+    AccountLedgerUpdate,
+    AgingBucket,
+    ContactDebtAging,
+    DebtAging,
+    DebtAgingReport,
+)
 from app.repository.contact import contact_repo
+from app.services.contact_rollup import contact_rollup_service
+
+
+# Buckets of the aging report, in the order of DebtAging's fields.
+AGING_BUCKETS = (
+    "not_due", "due_this_week", "overdue_0_30", "overdue_31_60", "overdue_61_90", "overdue_over_90", "no_deadline", "total",
+)
 
 
 class AccountLedgerService:
     """Service layer for account ledger business logic."""
 
+    def __init__(self):
+        # Holds (as_of, shop-wide aging, per-contact aging sorted by total debt).
+        self._aging_cache = TTLCache(ttl_seconds=settings.AGING_REPORT_CACHE_TTL_SECONDS)
+
     def get_by_id(self, db: Session, *, account_ledger_id: uuid.UUID) -> AccountLedger:
         """Helper method to get a ledger entry by ID or raise 404."""
         ledger = account_ledger_repo.get(db, id=account_ledger_id)
@@ -33,38 +54,90 @@ class AccountLedgerService:
         if not contact_repo.get(db, id=ledger_in.contact_id):
              raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Contact with ID {ledger_in.contact_id} not found.")
         
+        self._aging_cache.invalidate_on_commit(db)
+        contact_rollup_service.apply_ledger_debt(db, contact_id=ledger_in.contact_id, delta=ledger_in.debt)
         return account_ledger_repo.create(db, obj_in=ledger_in)
 
     def update(self, db: Session, *, ledger_id: uuid.UUID, ledger_in: AccountLedgerUpdate) -> AccountLedger:
         """Handles business logic for updating a ledger entry."""
         ledger = self.get_by_id(db, account_ledger_id=ledger_id)
+        self._aging_cache.invalidate_on_commit(db)
+        if ledger_in.debt is not None:
+            contact_rollup_service.apply_ledger_debt(db, contact_id=ledger.contact_id, delta=ledger_in.debt - ledger.debt)
         return account_ledger_repo.update(db, db_obj=ledger, obj_in=ledger_in)
 
     def delete(self, db: Session, *, ledger_id: uuid.UUID) -> AccountLedger:
         """Handles business logic for deleting a ledger entry."""
+        ledger = self.get_by_id(db, account_ledger_id=ledger_id)
+        self._aging_cache.invalidate_on_commit(db)
+        contact_rollup_service.apply_ledger_debt(db, contact_id=ledger.contact_id, delta=-ledger.debt)
         return account_ledger_repo.remove(db, id=ledger_id)
 
     def update_debt_from_payment(self, db: Session, *, payment: Payment):
-        """Updates the debt of the associated ledger based on an approved payment."""
+        """
+        Updates the debt of the associated ledger based on an approved payment.
+        Nothing is committed; the change is part of the caller's approval transaction.
+        """
         if not payment.account_ledger_id:
             return
         
         ledger = self.get_by_id(db, account_ledger_id=payment.account_ledger_id)
         if payment.direction == PaymentDirection.OUTGOING or payment.direction == PaymentDirection.INTERNAL_TRANSFER:
             ledger.debt -= payment.amount # Customer pays down their debt
-        
-        db.commit()
+            self._aging_cache.invalidate_on_commit(db)
+            contact_rollup_service.apply_ledger_debt(db, contact_id=ledger.contact_id, delta=-payment.amount)
     
     def revert_debt_from_payment(self, db: Session, *, payment: Payment):
-        """Reverts a debt change on the associated ledger when a payment is rejected."""
+        """
+        Reverts a debt change on the associated ledger when a payment is rejected.
+        Nothing is committed; the change is part of the caller's rejection transaction.
+        """
         if not payment.account_ledger_id:
             return
         
         ledger = self.get_by_id(db, account_ledger_id=payment.account_ledger_id)
         if payment.direction == PaymentDirection.OUTGOING or payment.direction == PaymentDirection.INTERNAL_TRANSFER:
             ledger.debt += payment.amount # Add back the debt
-            
-        db.commit()
+            self._aging_cache.invalidate_on_commit(db)
+            contact_rollup_service.apply_ledger_debt(db, contact_id=ledger.contact_id, delta=payment.amount)
+
+    def get_aging_report(
+        self,
+        db: Session,
+        *,
+        contact_id: Optional[uuid.UUID] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> DebtAgingReport:
+        """
+        Returns the debt aging report. The whole report is computed by one query and cached per
+        worker; it is dropped whenever a debt changes, so the shop-wide view is served from memory.
+        """
+        as_of, shop, contacts = self._aging_cache.get_or_load("report", lambda: self._build_aging_report(db))
+        if contact_id:
+            contacts = [contact for contact in contacts if contact.contact_id == contact_id]
+        return DebtAgingReport(as_of=as_of, shop=shop, contacts=contacts[skip:skip + limit])
+
+    def invalidate_aging(self):
+        """Drops the cached aging report after debts were changed outside this service."""
+        self._aging_cache.invalidate()
+
+    def _build_aging_report(self, db: Session) -> Tuple[datetime, DebtAging, List[ContactDebtAging]]:
+        # Deadlines are stored without a timezone, in UTC.
+        as_of = datetime.now(timezone.utc).replace(tzinfo=None)
+        shop = DebtAging(**{name: AgingBucket() for name in AGING_BUCKETS})
+        contacts = []
+        for row in account_ledger_repo.get_aging(db, as_of=as_of):
+            buckets = {
+                name: AgingBucket(debt=getattr(row, f"{name}_debt"), count=getattr(row, f"{name}_count"))
+                for name in AGING_BUCKETS
+            }
+            if row.contact_id is None:
+                shop = DebtAging(**buckets)
+            else:
+                contacts.append(ContactDebtAging(contact_id=row.contact_id, **buckets))
+        contacts.sort(key=lambda contact: contact.total.debt, reverse=True)
+        return as_of, shop, contacts
 
 account_ledger_service = AccountLedgerService()
 
@@ -0,0 +1,208 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import uuid
+
+from fastapi import status
+from sqlalchemy import BigInteger, DateTime, Integer, Numeric, Table, Text, and_, cast, delete, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Session
+
+from app.core.archive import ArchiveColumn, ArchiveReader, ArchiveWriter, ColumnKind, from_microseconds
+from app.core.config import settings
+from app.core.exceptions import AppException
+from app.logging_config import logger
+from app.models.audit_log import AuditLog
+from app.models.enums.audit_log import OperationType
+from app.models.inventory import Inventory
+from app.models.inventory_change import InventoryChange
+from app.repository.inventory import inventory_repo
+from app.services.audit_log_partition import audit_log_partition_service
+
+# One directory per archived table, below the archive directory.
+AUDIT_LOG_ARCHIVE = "audit_log"
+INVENTORY_ARCHIVE = "inventory"
+INVENTORY_CHANGE_ARCHIVE = "inventory_change"
+# Rows fetched per round trip from the server-side cursor while archiving.
+_FETCH_SIZE = 5000
+
+
+def archive_columns(table: Table) -> List[ArchiveColumn]:
+    """The archive layout of a table: its columns, in table order, by storage kind."""
+    columns = []
+    for column in table.columns:
+        if isinstance(column.type, UUID):
+            columns.append(ArchiveColumn(column.name, ColumnKind.UUID))
+        elif isinstance(column.type, DateTime):
+            columns.append(ArchiveColumn(column.name, ColumnKind.TIMESTAMP))
+        elif isinstance(column.type, (BigInteger, Integer)):
+            columns.append(ArchiveColumn(column.name, ColumnKind.INTEGER))
+        elif isinstance(column.type, Numeric):
+            columns.append(ArchiveColumn(column.name, ColumnKind.DECIMAL, column.type.scale or 0))
+        elif isinstance(column.type, JSONB):
+            columns.append(ArchiveColumn(column.name, ColumnKind.JSON))
+        else:
+            columns.append(ArchiveColumn(column.name, ColumnKind.TEXT))
+    return columns
+
+
+class ArchiveService:
+    """
+    Moves old audit_log and inventory rows out of the database into the columnar archives
+    of app/core/archive.py, and answers historical queries from those archives.
+
+    Archiving runs in one transaction: rows are streamed into new chunk files, deleted,
+    the archive index is published and only then the transaction commits. If anything
+    fails, the new chunks are removed and the rows stay in the database.
+    """
+
+    def archive_audit_log(self, db: Session, *, before: datetime, directory: Optional[Path] = None) -> int:
+        """
+        Archives the audit entries created before `before` and removes them from audit_log;
+        months that end by then lose their whole partition. Returns the number of rows archived.
+        """
+        table = AuditLog.__table__
+        writer = ArchiveWriter(
+            self._directory(directory) / AUDIT_LOG_ARCHIVE,
+            archive_columns(table),
+            chunk_rows=settings.ARCHIVE_CHUNK_ROWS,
+            filter_columns=("table_name", "operation"),
+        )
+        where = table.c.created_at < before
+        try:
+            self._repeatable_read(db)
+            self._copy(db, table, where, writer)
+            if writer.rows_written:
+                dropped = audit_log_partition_service.drop_partitions_before(db, before=before)
+                db.execute(delete(table).where(where))
+                if dropped:
+                    logger.info(f"Dropped archived audit_log partitions: {', '.join(dropped)}")
+            writer.commit()
+            db.commit()
+        except Exception:
+            db.rollback()
+            writer.abort()
+            raise
+        logger.info(f"Archived {writer.rows_written} audit_log rows created before {before.isoformat()}.")
+        return writer.rows_written
+
+    def archive_inventory(self, db: Session, *, before: datetime, directory: Optional[Path] = None) -> Dict[str, int]:
+        """
+        Archives the inventory snapshots created before `before`, except the latest one, which
+        every new snapshot is built on. The approved changes folded into those snapshots go
+        with them, since a snapshot cannot be deleted while changes refer to it.
+        Returns the number of rows archived per table.
+        """
+        root = self._directory(directory)
+        snapshots, changes = Inventory.__table__, InventoryChange.__table__
+        snapshot_writer = ArchiveWriter(root / INVENTORY_ARCHIVE, archive_columns(snapshots), chunk_rows=settings.ARCHIVE_CHUNK_ROWS)
+        change_writer = ArchiveWriter(
+            root / INVENTORY_CHANGE_ARCHIVE,
+            archive_columns(changes),
+            chunk_rows=settings.ARCHIVE_CHUNK_ROWS,
+            filter_columns=("inventory_id",),
+        )
+        try:
+            self._repeatable_read(db)
+            latest = inventory_repo.get_latest(db)
+            snapshot_where = and_(snapshots.c.created_at < before, snapshots.c.id != latest.id) if latest else snapshots.c.id.is_(None)
+            change_where = changes.c.inventory_id.in_(select(snapshots.c.id).where(snapshot_where))
+            self._copy(db, changes, change_where, change_writer)
+            self._copy(db, snapshots, snapshot_where, snapshot_writer)
+            if snapshot_writer.rows_written:
+                db.execute(delete(changes).where(change_where))
+                db.execute(delete(snapshots).where(snapshot_where))
+            change_writer.commit()
+            snapshot_writer.commit()
+            db.commit()
+        except Exception:
+            db.rollback()
+            snapshot_writer.abort()
+            change_writer.abort()
+            raise
+        archived = {INVENTORY_ARCHIVE: snapshot_writer.rows_written, INVENTORY_CHANGE_ARCHIVE: change_writer.rows_written}
+        logger.info(f"Archived inventory rows created before {before.isoformat()}: {archived}")
+        return archived
+
+    def search_audit_log(
+        self,
+        *,
+        directory: Optional[Path] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        table_name: Optional[str] = None,
+        record_id: Optional[uuid.UUID] = None,
+        operation: Optional[OperationType] = None,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the archived audit entries matching every given filter, oldest first.
+        Unlike the database search, `table_name` must match exactly.
+        """
+        reader = self._reader(directory, AUDIT_LOG_ARCHIVE)
+        return reader.scan(
+            start=start_time,
+            end=end_time,
+            equals={"table_name": table_name, "record_id": record_id, "operation": operation, "user_id": user_id},
+        )
+
+    def get_inventory_at(self, db: Session, *, at: datetime, directory: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        The inventory snapshot in effect at `at`: the latest one created at or before it,
+        from the database when it is still there, otherwise from the archive.
+        """
+        snapshot = (
+            db.query(Inventory).filter(Inventory.created_at <= at)
+            .order_by(Inventory.created_at.desc()).first()
+        )
+        if snapshot is not None:
+            return {column.name: getattr(snapshot, column.key) for column in Inventory.__table__.columns}
+        archive = self._directory(directory) / INVENTORY_ARCHIVE
+        state = ArchiveReader(archive).last_before(at) if archive.is_dir() else None
+        if state is None:
+            raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No inventory snapshot exists at {at.isoformat()}.")
+        return state
+
+    def describe(self, directory: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+        """A summary of every archive in the directory: chunks, rows, time range and size."""
+        root = self._directory(directory)
+        summary = {}
+        for name in (AUDIT_LOG_ARCHIVE, INVENTORY_ARCHIVE, INVENTORY_CHANGE_ARCHIVE):
+            if not (root / name).is_dir():
+                continue
+            chunks = ArchiveReader(root / name).chunks
+            summary[name] = {
+                "chunks": len(chunks),
+                "rows": sum(chunk["rows"] for chunk in chunks),
+                "oldest": from_microseconds(min(chunk["min_time"] for chunk in chunks)) if chunks else None,
+                "newest": from_microseconds(max(chunk["max_time"] for chunk in chunks)) if chunks else None,
+                "size_bytes": sum((root / name / chunk["file"]).stat().st_size for chunk in chunks),
+            }
+        return summary
+
+    def _copy(self, db: Session, table: Table, where, writer: ArchiveWriter):
+        """Streams the matching rows, in time order, from a server-side cursor into the writer."""
+        columns = [cast(column, Text) if isinstance(column.type, JSONB) else column for column in table.columns]
+        query = select(*columns).where(where).order_by(table.c.created_at, table.c.id)
+        for row in db.execute(query, execution_options={"yield_per": _FETCH_SIZE}):
+            writer.append(row)
+
+    def _repeatable_read(self, db: Session):
+        """
+        Runs the transaction on one snapshot, so the rows deleted are exactly the rows
+        that were written to the archive. The isolation level can only be chosen before a
+        transaction starts, so any work pending in the session is committed first.
+        """
+        db.commit()
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    def _directory(self, directory: Optional[Path]) -> Path:
+        return Path(directory or settings.ARCHIVE_DIR)
+
+    def _reader(self, directory: Optional[Path], name: str) -> ArchiveReader:
+        path = self._directory(directory) / name
+        if not path.is_dir():
+            raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No '{name}' archive exists in {path.parent}.")
+        return ArchiveReader(path)
+
+archive_service = ArchiveService()
@@ -1,10 +1,33 @@
+from datetime import datetime, timezone
+from fastapi import status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import uuid
 
+from app.core.exceptions import AppException
 from app.models.audit_log import AuditLog
 from app.models.enums.audit_log import OperationType
 from app.repository.audit_log import audit_log_repo
+from app.repository.audit_outbox import audit_outbox_repo
+from app.schema.audit_log import AuditRecordState, AuditWriterStats
+from app.services.audit_writer import audit_writer
+
+def fold_states(entries: Sequence[AuditLog]) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Replays the audit entries of one record, oldest first. A creation sets the whole state,
+    an update overwrites the columns it changed and a deletion clears it. Returns the final
+    state (None if deleted) and whether it started from a creation, i.e. is complete.
+    """
+    state: Optional[Dict[str, Any]] = None
+    complete = False
+    for entry in entries:
+        if entry.operation == OperationType.CREATE:
+            state, complete = dict(entry.after_state or {}), True
+        elif entry.operation == OperationType.UPDATE:
+            state = {**(state or {}), **(entry.after_state or {})}
+        else:
+            state, complete = None, True
+    return state, complete
 
 class AuditLogService:
     """
@@ -18,6 +41,8 @@ class AuditLogService:
         user_id: Optional[uuid.UUID] = None,
         operation: Optional[OperationType] = None,
         table_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100
     ) -> List[AuditLog]:
@@ -27,8 +52,42 @@ class AuditLogService:
             user_id=user_id,
             operation=operation,
             table_name=table_name,
+            start_time=start_time,
+            end_time=end_time,
             skip=skip,
             limit=limit
         )
 
+    def get_record_history(self, db: Session, *, table_name: str, record_id: uuid.UUID) -> List[AuditLog]:
+        """Gets every audit entry of one record, oldest first."""
+        entries = audit_log_repo.get_record_history(db, table_name=table_name, record_id=record_id)
+        if not entries:
+            raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail="No audit history found for this record.")
+        return entries
+
+    def get_record_state(
+        self, db: Session, *, table_name: str, record_id: uuid.UUID, at: Optional[datetime] = None
+    ) -> AuditRecordState:
+        """Rebuilds the state of one record at `at` (default: now) from its audit entries, read in one query."""
+        at = at or datetime.now(timezone.utc)
+        entries = audit_log_repo.get_record_history(db, table_name=table_name, record_id=record_id, until=at)
+        if not entries:
+            raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail="No audit history found for this record at that time.")
+        state, complete = fold_states(entries)
+        return AuditRecordState(
+            table_name=table_name,
+            record_id=record_id,
+            at=at,
+            exists=state is not None,
+            complete=complete,
+            state=state,
+            last_operation=entries[-1].operation,
+            last_changed_at=entries[-1].created_at,
+            changes_applied=len(entries),
+        )
+
+    def get_writer_stats(self, db: Session) -> AuditWriterStats:
+        """Reports this worker's audit writer counters together with the shared outbox backlog."""
+        return AuditWriterStats(**audit_writer.stats(), outbox_backlog=audit_outbox_repo.count(db))
+
 audit_log_service = AuditLogService()
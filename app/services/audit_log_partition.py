@@ -0,0 +1,188 @@
+import enum
+import gzip
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+from fastapi import status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import AppException
+from app.logging_config import logger
+from app.repository.audit_log import audit_log_repo
+from app.schema.audit_log import AuditLogPartition
+
+# Key of the Postgres advisory lock that serializes partition changes across workers and scripts.
+AUDIT_LOG_PARTITION_LOCK_ID = 726_003
+DEFAULT_PARTITION = "audit_log_default"
+# Monthly partitions are named audit_log_pYYYY_MM; detached ones keep their name.
+PARTITION_NAME_PATTERN = re.compile(r"^audit_log_(p\d{4}_\d{2}|default)$")
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(moment: datetime) -> datetime:
+    """The start of the UTC month containing `moment`."""
+    return moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Moves the start of a month by a whole number of months, forwards or backwards."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"audit_log_p{month:%Y_%m}"
+
+
+class RetentionAction(str, enum.Enum):
+    """What happens to a partition older than the retention period."""
+    DETACH = "detach"    # Kept as a standalone table, no longer part of audit_log.
+    ARCHIVE = "archive"  # Written to a gzipped CSV file, then dropped.
+    DROP = "drop"        # Dropped with its rows.
+
+
+class AuditLogPartitionService:
+    """
+    Maintains the monthly range partitions of audit_log. Future months are created ahead
+    of time, and a default partition catches anything outside them so writes never fail.
+    Old months are removed by detaching or dropping their partition, which is instant and
+    leaves no dead rows behind, instead of deleting rows.
+    """
+
+    def list_partitions(self, db: Session) -> List[AuditLogPartition]:
+        partitions = []
+        for row in audit_log_repo.get_partitions(db):
+            bound = _BOUND_PATTERN.search(row.bound)
+            partitions.append(AuditLogPartition(
+                name=row.name,
+                range_start=datetime.fromisoformat(bound.group(1)) if bound else None,
+                range_end=datetime.fromisoformat(bound.group(2)) if bound else None,
+                estimated_rows=row.estimated_rows,
+                size_bytes=row.size_bytes,
+            ))
+        return partitions
+
+    def ensure_partitions(self, db: Session, *, months_ahead: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+        """
+        Creates the partitions of the current month and the next `months_ahead` months, and
+        the default partition, where missing. Returns the names of the partitions created.
+        """
+        months_ahead = settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+        self._lock(db)
+        existing = {row.name for row in audit_log_repo.get_partitions(db)}
+        if DEFAULT_PARTITION not in existing:
+            audit_log_repo.create_default_partition(db, name=DEFAULT_PARTITION)
+            existing.add(DEFAULT_PARTITION)
+
+        created = []
+        month = month_start(now or datetime.now(timezone.utc))
+        for _ in range(months_ahead + 1):
+            name = partition_name(month)
+            if name not in existing:
+                self._create_partition(db, name=name, start=month, end=add_months(month, 1))
+                created.append(name)
+            month = add_months(month, 1)
+        db.commit()
+        if created:
+            logger.info(f"Created audit_log partitions: {', '.join(created)}")
+        return created
+
+    def apply_retention(
+        self,
+        db: Session,
+        *,
+        action: RetentionAction,
+        keep_months: Optional[int] = None,
+        archive_dir: Optional[Path] = None,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Detaches, archives or drops every monthly partition that ended before the last
+        `keep_months` whole months. Each partition is handled in its own short transaction.
+        Returns the names of the partitions handled.
+        """
+        keep_months = settings.AUDIT_LOG_RETENTION_MONTHS if keep_months is None else keep_months
+        if action == RetentionAction.ARCHIVE and archive_dir is None:
+            raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="An archive directory is required to archive partitions.")
+
+        cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -keep_months)
+        expired = [
+            partition.name for partition in self.list_partitions(db)
+            if partition.range_end is not None and partition.range_end <= cutoff
+        ]
+        for name in expired:
+            if action == RetentionAction.ARCHIVE:
+                self._archive(db, name=name, archive_dir=archive_dir)
+                continue
+            self._lock(db)
+            if action == RetentionAction.DETACH:
+                audit_log_repo.detach_partition(db, name=name)
+            else:
+                audit_log_repo.drop_partition(db, name=name)
+            db.commit()
+            logger.info(f"audit_log partition {name}: {action.value}")
+        return expired
+
+    def drop_partitions_before(self, db: Session, *, before: datetime) -> List[str]:
+        """
+        Drops the monthly partitions that end at or before `before`, in the caller's
+        transaction (used once their rows have been archived). Returns their names.
+        """
+        self._lock(db)
+        dropped = [
+            partition.name for partition in self.list_partitions(db)
+            if partition.range_end is not None and partition.range_end <= before
+        ]
+        for name in dropped:
+            audit_log_repo.drop_partition(db, name=name)
+        return dropped
+
+    def _create_partition(self, db: Session, *, name: str, start: datetime, end: datetime):
+        """
+        Creates one monthly partition. Rows of that month already in the default partition
+        (written while no partition covered it) would block the creation, so the default
+        partition is detached while they are moved into the new one.
+        """
+        if not audit_log_repo.has_rows_between(db, name=DEFAULT_PARTITION, start=start, end=end):
+            audit_log_repo.create_partition(db, name=name, start=start, end=end)
+            return
+        audit_log_repo.detach_partition(db, name=DEFAULT_PARTITION)
+        audit_log_repo.create_partition(db, name=name, start=start, end=end)
+        moved = audit_log_repo.move_rows_between(db, source=DEFAULT_PARTITION, start=start, end=end)
+        audit_log_repo.attach_default_partition(db, name=DEFAULT_PARTITION)
+        logger.info(f"Moved {moved} audit_log rows from {DEFAULT_PARTITION} to {name}.")
+
+    def _archive(self, db: Session, *, name: str, archive_dir: Path):
+        """
+        Copies the partition to `<archive_dir>/<name>.csv.gz` and drops it in one transaction.
+        The partition is locked against writes before the copy, so no row can land in it
+        afterwards. If the copy fails, the transaction rolls back and the partition stays
+        attached, so the next retention run picks it up again.
+        """
+        path = Path(archive_dir) / f"{name}.csv.gz"
+        if path.exists():
+            raise AppException(status_code=status.HTTP_409_CONFLICT, detail=f"Archive file '{path}' already exists.")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        partial_path = path.with_name(path.name + ".partial")
+        try:
+            self._lock(db)
+            audit_log_repo.lock_partition(db, name=name)
+            with gzip.open(partial_path, "wb") as file:
+                audit_log_repo.copy_partition_to(db, name=name, file=file)
+            audit_log_repo.drop_partition(db, name=name)
+            db.commit()
+        except Exception:
+            db.rollback()
+            partial_path.unlink(missing_ok=True)
+            raise
+        partial_path.rename(path)
+        logger.info(f"audit_log partition {name}: archived to {path}")
+
+    def _lock(self, db: Session):
+        db.execute(select(func.pg_advisory_xact_lock(AUDIT_LOG_PARTITION_LOCK_ID)))
+
+audit_log_partition_service = AuditLogPartitionService()
@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.logging_config import logger
+from app.models.audit_log import AuditLog
+from app.models.enums.audit_log import OperationType
+from app.repository.audit_outbox import audit_outbox_repo
+
+
+class AuditWriter:
+    """
+    Background writer that moves audit entries from the audit_outbox table into audit_log.
+
+    In "async" mode the audit listener commits each flush's entries as one outbox row with the
+    business change, and hands the row ids to `enqueue` after the commit. A single daemon
+    thread per worker process takes ids from a bounded queue, claims the rows and inserts
+    their entries with one multi-row INSERT per batch, on its own connection. When the queue
+    is full the ids are not kept; the rows stay in the outbox and the next sweep picks them
+    up, which also covers rows left behind by a stopped or crashed worker.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[uuid.UUID]" = queue.Queue(maxsize=settings.AUDIT_QUEUE_MAX_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._sweep_requested = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "deferred": 0,
+            "written_entries": 0,
+            "written_batches": 0,
+            "failed_batches": 0,
+            "last_batch_entries": 0,
+            "last_batch_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Starts the writer thread; the outbox is swept first to pick up rows left from a previous run."""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._sweep_requested.set()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit writer started.")
+
+    def stop(self, timeout: float = 10.0):
+        """Stops the writer after writing what is queued and sweeping the outbox once more."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Audit writer stopped.")
+
+    def enqueue(self, outbox_ids: List[uuid.UUID]):
+        """
+        Queues committed outbox rows for writing. Never blocks the request: if the queue is
+        full, the rows are left for the next sweep and counted as deferred.
+        """
+        for outbox_id in outbox_ids:
+            try:
+                self._queue.put_nowait(outbox_id)
+                self._count("enqueued")
+            except queue.Full:
+                self._count("deferred")
+                self._sweep_requested.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and queue state of this worker's writer."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(
+            mode=settings.AUDIT_WRITE_MODE,
+            running=self.running,
+            queue_size=self._queue.qsize(),
+            queue_capacity=self._queue.maxsize,
+        )
+        return stats
+
+    def _run(self):
+        last_sweep = 0.0
+        interval = settings.AUDIT_FLUSH_INTERVAL_MS / 1000
+        while True:
+            stopping = self._stopping.is_set()
+            batch = self._take_batch(timeout=0 if stopping else interval)
+            if batch:
+                self._write(lambda db: audit_outbox_repo.claim(db, ids=batch))
+
+            if stopping and self._queue.empty():
+                self._sweep()
+                return
+            if self._sweep_requested.is_set() or time.monotonic() - last_sweep >= settings.AUDIT_OUTBOX_SWEEP_SECONDS:
+                self._sweep_requested.clear()
+                self._sweep()
+                last_sweep = time.monotonic()
+
+    def _take_batch(self, timeout: float) -> List[uuid.UUID]:
+        """Waits up to `timeout` for the first id, then takes whatever else is queued, up to a batch."""
+        try:
+            batch = [self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()]
+        except queue.Empty:
+            return []
+        while len(batch) < settings.AUDIT_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _sweep(self):
+        """Writes every row left in the outbox, oldest first, one batch at a time."""
+        while self._write(lambda db: audit_outbox_repo.claim_oldest(db, limit=settings.AUDIT_BATCH_SIZE)):
+            pass
+
+    def _write(self, claim) -> int:
+        """
+        Claims outbox rows and inserts their entries into audit_log in one transaction, so a
+        failure leaves the rows in the outbox for a later sweep. Returns the number of rows claimed.
+        """
+        started = time.perf_counter()
+        try:
+            with SessionLocal() as db:
+                claimed = claim(db)
+                rows = [self._to_row(entry) for entries in claimed for entry in entries]
+                if rows:
+                    db.execute(insert(AuditLog), rows)
+                db.commit()
+        except Exception as e:
+            self._count("failed_batches")
+            logger.error(f"Audit writer batch failed, entries remain in the outbox: {e}")
+            self._sweep_requested.set()
+            return 0
+
+        if rows:
+            with self._lock:
+                self._stats["written_entries"] += len(rows)
+                self._stats["written_batches"] += 1
+                self._stats["last_batch_entries"] = len(rows)
+                self._stats["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return len(claimed)
+
+    def _to_row(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Turns an outbox entry back into audit_log column values, keeping the capture time."""
+        created_at = datetime.fromisoformat(entry["created_at"])
+        row = {
+            "id": uuid.uuid4(),
+            "user_id": uuid.UUID(entry["user_id"]) if entry["user_id"] else None,
+            "operation": OperationType[entry["operation"]],
+            "table_name": entry["table_name"],
+            # Entries written before record_id was captured do not have it.
+            "record_id": uuid.UUID(entry["record_id"]) if entry.get("record_id") else None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        # Missing states are left out rather than set to None, which JSONB would store as 'null'.
+        for key in ("before_state", "after_state"):
+            if entry[key] is not None:
+                row[key] = entry[key]
+        return row
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+audit_writer = AuditWriter()
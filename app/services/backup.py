@@ -1,13 +1,19 @@
 import json
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import inspect, text, select
+from sqlalchemy import Table, inspect, text, select
 
 from app.db.base import Base
+from app.db.session import SessionLocal
 from app.models.audit_log import AuditLog
+from app.models.audit_outbox import AuditOutbox
+from app.models.idempotency_key import IdempotencyKey
 from app.models.user import user_permission_association
 from app.core.exceptions import AppException
 from fastapi import status
 from app.core.utils import json_serializer
+from app.services.account_ledger import account_ledger_service
+from app.services.item_financial_profile import item_financial_profile_service
 
 # Define the order for data insertion to respect foreign key constraints.
 # Parent tables must come before child tables.
@@ -25,40 +31,91 @@ TABLE_ORDER = [
     "account_ledger",
     "payment",
     "investment",
+    "profit_distribution",
+    "profit_share",
     "inventory",
+    "inventory_change",
+    "daily_summary",
+    "contact_rollup",
 ]
 
+# Rows fetched per round trip from the server-side cursor while exporting.
+EXPORT_BATCH_SIZE = 1000
+# Tables left out of backups: the audit log (and its outbox) and the disposable idempotency keys.
+EXCLUDED_TABLES = {AuditLog.__tablename__, AuditOutbox.__tablename__, IdempotencyKey.__tablename__}
+
+_encode_scalar = json.JSONEncoder(default=json_serializer).encode
+_encode_nested = json.JSONEncoder(indent=4, default=json_serializer).encode
+# Indentation of a column inside a row inside a table list of the backup document.
+_COLUMN_INDENT = " " * 12
+
+
+def _encode_value(value: Any) -> str:
+    """A column value as it appears at its depth in the indented document."""
+    if isinstance(value, (dict, list)):
+        # JSON strings escape newlines, so every newline here starts a nested line
+        return _encode_nested(value).replace("\n", "\n" + _COLUMN_INDENT)
+    return _encode_scalar(value)
+
+
+def encode_backup(tables: Iterable[Tuple[str, Sequence[str], Iterable[Sequence[Sequence[Any]]]]]) -> Iterator[str]:
+    """
+    Encodes a backup document piece by piece: `tables` yields (table name, column names,
+    batches of rows). The text is exactly that of `json.dumps(data, indent=4,
+    default=json_serializer)` over {table name: [{column: value}, ...]}, so backups keep
+    their format while only one batch of rows is held at a time.
+    """
+    separator = "{"
+    for name, columns, batches in tables:
+        yield f"{separator}\n    {_encode_scalar(name)}: "
+        separator = ","
+        prefixes = [f"\n{_COLUMN_INDENT}{_encode_scalar(column)}: " for column in columns]
+        row_separator = "[\n"
+        for rows in batches:
+            parts = []
+            for row in rows:
+                parts.append(f"{row_separator}        {{")
+                parts.append(",".join(prefix + _encode_value(value) for prefix, value in zip(prefixes, row)))
+                parts.append("\n        }")
+                row_separator = ",\n"
+            yield "".join(parts)
+        yield "[]" if row_separator == "[\n" else "\n    ]"
+    yield "{}" if separator == "{" else "\n}"
+
+
 class BackupService:
     """Service layer for handling database backup and restore operations."""
 
-    def export_data_as_json_str(self, db: Session) -> str:
+    def stream_export(self) -> Iterator[bytes]:
         """
-        Exports all data from the database (except audit_log) to a JSON string.
+        Streams a JSON backup of all data (except the tables in EXCLUDED_TABLES), table by
+        table from server-side cursors, as plain rows without building ORM objects. The
+        generator opens its own session, because the request's session is closed before a
+        streaming response starts sending, and reads every table from one snapshot.
         """
-        backup_data = {}
-        inspector = inspect(db.bind)
-        
-        # Create a mapping from table names to model classes for efficient lookup
-        model_map = {mapper.local_table.name: mapper.class_ for mapper in Base.registry.mappers}
-        
-        for table_name in inspector.get_table_names():
-            if table_name == AuditLog.__tablename__:
-                continue
-
-            model = model_map.get(table_name)
-            if model:
-                records = db.query(model).all()
-                backup_data[table_name] = [
-                    {c.key: getattr(row, c.key) for c in inspect(row).mapper.column_attrs}
-                    for row in records
-                ]
-                
-        # --- Manually Backup the Association Table ---
-        stmt = select(user_permission_association)
-        result = db.execute(stmt).mappings().all()
-        backup_data["user_permission"] = [dict(row) for row in result]
-        
-        return json.dumps(backup_data, indent=4, default=json_serializer)
+        with SessionLocal() as db:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            for text_part in encode_backup(self._iter_tables(db)):
+                yield text_part.encode("utf-8")
+
+    def _export_tables(self, db: Session) -> List[Table]:
+        """The tables of the backup, in the order of the database's table names."""
+        model_tables = {mapper.local_table.name: mapper.local_table for mapper in Base.registry.mappers}
+        tables = [
+            model_tables[table_name] for table_name in inspect(db.connection()).get_table_names()
+            if table_name in model_tables and table_name not in EXCLUDED_TABLES
+        ]
+        # --- The association table has no model of its own ---
+        return tables + [user_permission_association]
+
+    def _iter_tables(self, db: Session) -> Iterator[Tuple[str, List[str], Iterator[Sequence[Sequence[Any]]]]]:
+        """Yields each table with a lazy iterator over its row batches; each query runs when its rows are needed."""
+        for table in self._export_tables(db):
+            yield table.name, [column.name for column in table.columns], self._iter_batches(db, table)
+
+    def _iter_batches(self, db: Session, table: Table) -> Iterator[Sequence[Sequence[Any]]]:
+        result = db.execute(select(table), execution_options={"yield_per": EXPORT_BATCH_SIZE})
+        yield from result.partitions()
 
     def import_data_from_json_str(self, db: Session, json_str: str):
         """
@@ -88,6 +145,9 @@ class BackupService:
                         db.execute(table.insert(), records)
             
             db.commit()
+            # Cached lookups must not outlive the data they were built from
+            item_financial_profile_service.invalidate_defaults()
+            account_ledger_service.invalidate_aging()
 
         except Exception as e:
             db.rollback()
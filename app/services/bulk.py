@@ -0,0 +1,51 @@
+import uuid
+from typing import Callable, Dict, List, TypeVar
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import AppException
+from app.schema.bulk import BulkActionResponse, BulkActionResult
+from app.services.inventory_writer import inventory_writer
+
+EntityType = TypeVar("EntityType")
+
+
+class BulkActionService:
+    """
+    Runs one status action (approve/reject) over many preloaded records.
+
+    Every record is processed in its own savepoint, so a record that fails its checks
+    is rolled back on its own while the others go through. All successful records are
+    committed together, and their queued inventory changes are folded into a single
+    snapshot afterwards.
+    """
+
+    def run(
+        self,
+        db: Session,
+        *,
+        ids: List[uuid.UUID],
+        entities: Dict[uuid.UUID, EntityType],
+        action: Callable[[EntityType], None],
+        entity_name: str,
+    ) -> BulkActionResponse:
+        results: List[BulkActionResult] = []
+        for entity_id in ids:
+            entity = entities.get(entity_id)
+            if entity is None:
+                results.append(BulkActionResult(id=entity_id, success=False, detail=f"{entity_name} with ID {entity_id} not found."))
+                continue
+            try:
+                with db.begin_nested():
+                    action(entity)
+            except AppException as e:
+                results.append(BulkActionResult(id=entity_id, success=False, status=entity.status, detail=e.detail))
+                continue
+            results.append(BulkActionResult(id=entity_id, success=True, status=entity.status))
+
+        db.commit()
+        inventory_writer.flush(db)
+
+        succeeded = sum(result.success for result in results)
+        return BulkActionResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+bulk_action_service = BulkActionService()
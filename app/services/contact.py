@@ -92,21 +92,24 @@ class ContactService:
     
     def delete_contact(self, db: Session, *, contact_id: uuid.UUID) -> Contact:
         """Handles the business logic for deleting a contact."""
-        contact_to_delete = self.get_contact_by_id(db, contact_id=contact_id)
-        
-        if contact_to_delete.transactions:
+        self.get_contact_by_id(db, contact_id=contact_id)
+
+        dependents = contact_repo.get_dependents(
+            db, id=contact_id, relationships=("transactions", "account_ledgers", "payments")
+        )
+        if "transactions" in dependents:
             raise AppException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete a contact that has associated transactions."
             )
         
-        if contact_to_delete.account_ledgers:
+        if "account_ledgers" in dependents:
             raise AppException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete a contact that has account ledger entries."
             )
             
-        if contact_to_delete.payments:
+        if "payments" in dependents:
             raise AppException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete a contact that has associated payments."
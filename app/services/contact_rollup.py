@@ -0,0 +1,135 @@
+import uuid
+from typing import Any, Dict
+from fastapi import status
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import AppException
+from app.models.account_ledger import AccountLedger
+from app.models.contact_rollup import ContactRollup
+from app.models.payment import Payment
+from app.models.transaction import Transaction
+from app.models.transaction_item import TransactionItem
+from app.models.enums.payment import PaymentDirection
+from app.models.enums.shared import ApprovalStatus
+from app.models.enums.transaction import TransactionType
+from app.repository.contact import contact_repo
+from app.repository.contact_rollup import COUNTER_COLUMNS, contact_rollup_repo
+
+# Rows written per statement while rebuilding.
+REBUILD_BATCH_SIZE = 1000
+
+
+class ContactRollupService:
+    """
+    Service layer for the per-contact rollup read model.
+    Transactions and payments count once an admin approved them; ledger debt counts always.
+    """
+
+    def get_by_contact_id(self, db: Session, *, contact_id: uuid.UUID) -> ContactRollup:
+        """Returns a contact's rollup in one indexed lookup; a contact without activity gets zeros."""
+        rollup = contact_rollup_repo.get_by_contact_id(db, contact_id=contact_id)
+        if rollup:
+            return rollup
+        if not contact_repo.get(db, id=contact_id):
+            raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Contact with ID {contact_id} not found.")
+        return ContactRollup(contact_id=contact_id, last_activity_at=None, **{column: 0 for column in COUNTER_COLUMNS})
+
+    def apply_transaction(self, db: Session, *, transaction: Transaction, is_reversal: bool = False):
+        """Adds an admin-approved transaction to its contact's rollup, or removes it when the approval is reverted."""
+        sign = -1 if is_reversal else 1
+        deltas = {"sold_total": 0, "bought_total": 0, "transaction_count": sign}
+        for trans_item in transaction.items:
+            column = "sold_total" if trans_item.transaction_type == TransactionType.SELL else "bought_total"
+            deltas[column] += sign * trans_item.total_price
+        contact_rollup_repo.apply_deltas(
+            db,
+            contact_id=transaction.contact_id,
+            deltas=deltas,
+            activity_at=None if is_reversal else transaction.created_at,
+        )
+
+    def apply_payment(self, db: Session, *, payment: Payment, is_reversal: bool = False):
+        """Adds an admin-approved payment to its contact's rollup, or removes it when the approval is reverted."""
+        if not payment.contact_id or payment.direction == PaymentDirection.INTERNAL_TRANSFER:
+            return
+        sign = -1 if is_reversal else 1
+        column = "incoming_total" if payment.direction == PaymentDirection.INCOMING else "outgoing_total"
+        contact_rollup_repo.apply_deltas(
+            db,
+            contact_id=payment.contact_id,
+            deltas={column: sign * payment.amount, "payment_count": sign},
+            activity_at=None if is_reversal else payment.created_at,
+        )
+
+    def apply_ledger_debt(self, db: Session, *, contact_id: uuid.UUID, delta: int):
+        """Moves a contact's outstanding ledger debt by `delta`."""
+        if delta:
+            contact_rollup_repo.apply_deltas(db, contact_id=contact_id, deltas={"ledger_debt": delta})
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Recomputes every rollup from transactions, payments and ledgers with three grouped
+        queries, in one DB transaction. Returns the number of rollup rows written.
+        """
+        rollups: Dict[uuid.UUID, Dict[str, Any]] = {}
+
+        def rollup_for(contact_id: uuid.UUID) -> Dict[str, Any]:
+            return rollups.setdefault(contact_id, {
+                "contact_id": contact_id, "last_activity_at": None, **{column: 0 for column in COUNTER_COLUMNS},
+            })
+
+        def touch(rollup: Dict[str, Any], moment):
+            if moment and (rollup["last_activity_at"] is None or moment > rollup["last_activity_at"]):
+                rollup["last_activity_at"] = moment
+
+        item_price = func.coalesce(TransactionItem.total_price, 0)
+        transactions = (
+            db.query(
+                Transaction.contact_id,
+                func.coalesce(func.sum(case((TransactionItem.transaction_type == TransactionType.SELL, item_price), else_=0)), 0),
+                func.coalesce(func.sum(case((TransactionItem.transaction_type == TransactionType.BUY, item_price), else_=0)), 0),
+                func.count(func.distinct(Transaction.id)),
+                func.max(Transaction.created_at),
+            )
+            .outerjoin(TransactionItem, Transaction.items)
+            .filter(Transaction.status == ApprovalStatus.APPROVED_BY_ADMIN)
+            .group_by(Transaction.contact_id)
+        )
+        for contact_id, sold, bought, count, last_at in transactions:
+            rollup = rollup_for(contact_id)
+            rollup.update(sold_total=sold, bought_total=bought, transaction_count=count)
+            touch(rollup, last_at)
+
+        payments = (
+            db.query(
+                Payment.contact_id,
+                func.coalesce(func.sum(case((Payment.direction == PaymentDirection.INCOMING, Payment.amount), else_=0)), 0),
+                func.coalesce(func.sum(case((Payment.direction == PaymentDirection.OUTGOING, Payment.amount), else_=0)), 0),
+                func.count(),
+                func.max(Payment.created_at),
+            )
+            .filter(
+                Payment.status == ApprovalStatus.APPROVED_BY_ADMIN,
+                Payment.contact_id.is_not(None),
+                Payment.direction != PaymentDirection.INTERNAL_TRANSFER,
+            )
+            .group_by(Payment.contact_id)
+        )
+        for contact_id, incoming, outgoing, count, last_at in payments:
+            rollup = rollup_for(contact_id)
+            rollup.update(incoming_total=incoming, outgoing_total=outgoing, payment_count=count)
+            touch(rollup, last_at)
+
+        ledgers = db.query(AccountLedger.contact_id, func.sum(AccountLedger.debt)).group_by(AccountLedger.contact_id)
+        for contact_id, debt in ledgers:
+            rollup_for(contact_id)["ledger_debt"] = debt
+
+        contact_rollup_repo.delete_all(db)
+        rows = list(rollups.values())
+        for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+            contact_rollup_repo.insert_many(db, rows=rows[start:start + REBUILD_BATCH_SIZE])
+        db.commit()
+        return len(rows)
+
+contact_rollup_service = ContactRollupService()
@@ -0,0 +1,150 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import uuid
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.utils import gregorian_to_jalali
+from app.models.daily_summary import DailySummary
+from app.models.item import Item
+from app.models.transaction import Transaction
+from app.models.transaction_item import TransactionItem
+from app.models.enums.item_type import ItemType
+from app.models.enums.shared import ApprovalStatus
+from app.models.enums.transaction import TransactionType
+from app.repository.daily_summary import daily_summary_repo
+
+# Rows read per round trip while rebuilding.
+REBUILD_BATCH_SIZE = 1000
+
+SummaryKey = Tuple[date, ItemType, TransactionType, uuid.UUID]
+
+
+class DailySummaryService:
+    """
+    Service layer for the daily summary read model.
+    Only admin-approved transactions are counted, on the day they were created.
+    """
+
+    def apply_transaction(self, db: Session, *, transaction: Transaction, is_reversal: bool = False):
+        """
+        Adds an admin-approved transaction's items to the summary, or removes them again
+        when the approval is reverted. Runs in the caller's DB transaction.
+        """
+        totals: Dict[SummaryKey, Dict[str, Any]] = {}
+        for trans_item in transaction.items:
+            self._accumulate(
+                totals,
+                created_at=transaction.created_at,
+                recorder_id=transaction.recorder_id,
+                item_name=trans_item.item.name,
+                transaction_type=trans_item.transaction_type,
+                weight_count=trans_item.weight_count,
+                total_price=trans_item.total_price,
+                sign=-1 if is_reversal else 1,
+            )
+        daily_summary_repo.apply_deltas(db, rows=self._to_rows(totals))
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Recomputes the whole summary from the admin-approved transactions in one
+        DB transaction and returns the number of summary rows written.
+        """
+        rows = (
+            db.query(
+                Transaction.created_at,
+                Transaction.recorder_id,
+                Item.name,
+                TransactionItem.transaction_type,
+                TransactionItem.weight_count,
+                TransactionItem.total_price,
+            )
+            .join(TransactionItem, Transaction.items)
+            .join(Item, TransactionItem.item)
+            .filter(Transaction.status == ApprovalStatus.APPROVED_BY_ADMIN)
+            .yield_per(REBUILD_BATCH_SIZE)
+        )
+
+        totals: Dict[SummaryKey, Dict[str, Any]] = {}
+        for row in rows:
+            self._accumulate(
+                totals,
+                created_at=row.created_at,
+                recorder_id=row.recorder_id,
+                item_name=row.name,
+                transaction_type=row.transaction_type,
+                weight_count=row.weight_count,
+                total_price=row.total_price,
+                sign=1,
+            )
+
+        daily_summary_repo.delete_all(db)
+        summary_rows = self._to_rows(totals)
+        for start in range(0, len(summary_rows), REBUILD_BATCH_SIZE):
+            daily_summary_repo.apply_deltas(db, rows=summary_rows[start:start + REBUILD_BATCH_SIZE])
+        db.commit()
+        return len(summary_rows)
+
+    def search(
+        self,
+        db: Session,
+        *,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        jalali_start_day: Optional[str] = None,
+        jalali_end_day: Optional[str] = None,
+        recorder_id: Optional[uuid.UUID] = None,
+        item_type: Optional[ItemType] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> List[DailySummary]:
+        return daily_summary_repo.search(
+            db,
+            start_day=start_day,
+            end_day=end_day,
+            jalali_start_day=jalali_start_day,
+            jalali_end_day=jalali_end_day,
+            recorder_id=recorder_id,
+            item_type=item_type,
+            transaction_type=transaction_type,
+        )
+
+    def local_day(self, moment: datetime) -> date:
+        """The business day of a timestamp, in the configured timezone."""
+        return moment.astimezone(ZoneInfo(settings.TIMEZONE)).date()
+
+    def _accumulate(
+        self,
+        totals: Dict[SummaryKey, Dict[str, Any]],
+        *,
+        created_at: datetime,
+        recorder_id: uuid.UUID,
+        item_name: str,
+        transaction_type: TransactionType,
+        weight_count: Decimal,
+        total_price: int,
+        sign: int,
+    ):
+        """Adds one transaction item to its (day, item type, transaction type, recorder) bucket."""
+        key = (self.local_day(created_at), ItemType(item_name), transaction_type, recorder_id)
+        bucket = totals.setdefault(key, {"item_count": 0, "weight_count": Decimal(0), "total_price": 0})
+        bucket["item_count"] += sign
+        bucket["weight_count"] += sign * weight_count
+        bucket["total_price"] += sign * total_price
+
+    def _to_rows(self, totals: Dict[SummaryKey, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turns the buckets into rows for the upsert."""
+        return [
+            {
+                "day": day,
+                "jalali_day": gregorian_to_jalali(day),
+                "item_type": item_type,
+                "transaction_type": transaction_type,
+                "recorder_id": recorder_id,
+                **bucket,
+            }
+            for (day, item_type, transaction_type, recorder_id), bucket in totals.items()
+        ]
+
+daily_summary_service = DailySummaryService()
@@ -0,0 +1,218 @@
+import csv
+import io
+import tempfile
+import uuid
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterator, List, Sequence, Set
+
+import orjson
+from openpyxl import Workbook
+from sqlalchemy import Text, cast
+from sqlalchemy.orm import Query, Session
+
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+from app.models.payment import Payment
+from app.models.transaction import Transaction
+from app.models.transaction_item import TransactionItem
+from app.models.user import User
+from app.repository.audit_log import audit_log_repo
+from app.repository.payment import payment_repo
+from app.repository.transaction import transaction_repo
+from app.schema.export import ExportFormat
+from app.services.payment import payment_service
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_BATCH_SIZE = 1000
+# Size of the chunks an XLSX file is streamed in.
+_FILE_CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+TRANSACTION_EXPORT_COLUMNS = [
+    ("transaction_id", Transaction.id),
+    ("created_at", Transaction.created_at),
+    ("status", Transaction.status),
+    ("recorder_id", Transaction.recorder_id),
+    ("contact_id", Transaction.contact_id),
+    ("note", Transaction.note),
+    ("discount", Transaction.discount),
+    ("transaction_total_price", Transaction.total_price),
+    ("transaction_item_id", TransactionItem.id),
+    ("item_id", TransactionItem.item_id),
+    ("item_title", TransactionItem.title),
+    ("item_transaction_type", TransactionItem.transaction_type),
+    ("weight_count", TransactionItem.weight_count),
+    ("unit_price", TransactionItem.unit_price),
+    ("karat", TransactionItem.karat),
+    ("ojrat", TransactionItem.ojrat),
+    ("profit", TransactionItem.profit),
+    ("tax", TransactionItem.tax),
+    ("item_total_price", TransactionItem.total_price),
+]
+
+PAYMENT_EXPORT_COLUMNS = [
+    (column.name, column)
+    for column in (
+        Payment.id, Payment.created_at, Payment.status, Payment.direction, Payment.payment_method,
+        Payment.amount, Payment.description, Payment.recorder_id, Payment.photo_holder_id,
+        Payment.contact_id, Payment.transaction_id, Payment.account_ledger_id,
+        Payment.investor_id, Payment.saved_bank_account_id,
+    )
+]
+
+# Values are read as text where that is already their JSON form (ids, operation names), so
+# they are not parsed into Python objects only to be encoded again. The states are read as
+# JSON text and embedded as they are, never decoded in Python.
+AUDIT_LOG_EXPORT_COLUMNS = [
+    ("id", cast(AuditLog.id, Text)),
+    ("created_at", AuditLog.created_at),
+    ("user_id", cast(AuditLog.user_id, Text)),
+    ("username", User.username),
+    ("operation", cast(AuditLog.operation, Text)),
+    ("table_name", AuditLog.table_name),
+    ("record_id", cast(AuditLog.record_id, Text)),
+    ("before_state", cast(AuditLog.before_state, Text)),
+    ("after_state", cast(AuditLog.after_state, Text)),
+]
+_AUDIT_LOG_JSON_COLUMNS = {"before_state", "after_state"}
+
+
+class ExportService:
+    """
+    Streams search results as CSV or XLSX files, and the audit log as NDJSON.
+
+    The rows are read through a server-side cursor in batches of EXPORT_BATCH_SIZE and
+    written out batch by batch, so memory stays flat regardless of the export size.
+    The generators open their own session, because the request's session is closed
+    before a streaming response starts sending.
+    """
+
+    def stream_transactions(self, *, current_user: User, export_format: ExportFormat, **filters: Any) -> Iterator[bytes]:
+        """One row per transaction item; transactions without items get a single row with empty item columns."""
+        def build_query(db: Session) -> Query:
+            query = transaction_repo.build_search_query(db, current_user=current_user, **filters)
+            return (
+                query.outerjoin(Transaction.items)
+                .order_by(Transaction.id, TransactionItem.created_at)
+                .with_entities(*[column for _, column in TRANSACTION_EXPORT_COLUMNS])
+            )
+        return self._stream(build_query, [name for name, _ in TRANSACTION_EXPORT_COLUMNS], export_format, "Transactions")
+
+    def stream_payments(self, *, current_user: User, export_format: ExportFormat, **filters: Any) -> Iterator[bytes]:
+        """One row per payment. Access scoping is resolved up front with the request's session."""
+        filters = payment_service.scope_search_filters(current_user=current_user, **filters)
+
+        def build_query(db: Session) -> Query:
+            return payment_repo.build_search_query(db, **filters).with_entities(*[column for _, column in PAYMENT_EXPORT_COLUMNS])
+        return self._stream(build_query, [name for name, _ in PAYMENT_EXPORT_COLUMNS], export_format, "Payments")
+
+    def stream_audit_logs(self, *, compress: bool = False, **filters: Any) -> Iterator[bytes]:
+        """
+        One JSON object per line and audit entry, oldest first, optionally gzip-compressed.
+        The username is joined in the same query instead of loading each entry's user.
+        """
+        def build_query(db: Session) -> Query:
+            return (
+                audit_log_repo.build_search_query(db, **filters)
+                .outerjoin(User, User.id == AuditLog.user_id)
+                .order_by(AuditLog.created_at, AuditLog.id)
+                .with_entities(*[column for _, column in AUDIT_LOG_EXPORT_COLUMNS])
+            )
+        lines = self._stream_ndjson(build_query, [name for name, _ in AUDIT_LOG_EXPORT_COLUMNS], _AUDIT_LOG_JSON_COLUMNS)
+        return self._gzip(lines) if compress else lines
+
+    def _stream(self, build_query: Callable[[Session], Query], header: List[str], export_format: ExportFormat, title: str) -> Iterator[bytes]:
+        if export_format == ExportFormat.XLSX:
+            return self._stream_xlsx(build_query, header, title)
+        return self._stream_csv(build_query, header)
+
+    def _iter_batches(self, build_query: Callable[[Session], Query]) -> Iterator[Sequence[Any]]:
+        """Yields lists of rows, read from a server-side cursor."""
+        with SessionLocal() as db:
+            result = build_query(db).yield_per(EXPORT_BATCH_SIZE)
+            batch = []
+            for row in result:
+                batch.append(row)
+                if len(batch) == EXPORT_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def _stream_csv(self, build_query: Callable[[Session], Query], header: List[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # The BOM makes Excel open the UTF-8 (Persian) text correctly.
+        buffer.write("\ufeff")
+        writer.writerow(header)
+        for batch in self._iter_batches(build_query):
+            writer.writerows([self._format_value(value) for value in row] for row in batch)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        # Nothing matched: only the header is left to send
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def _stream_ndjson(self, build_query: Callable[[Session], Query], names: List[str], json_columns: Set[str]) -> Iterator[bytes]:
+        """Encodes each batch with orjson; values of `json_columns` are JSON text and are embedded unparsed."""
+        for batch in self._iter_batches(build_query):
+            lines = []
+            for row in batch:
+                record = dict(zip(names, row))
+                for name in json_columns:
+                    if record[name] is not None:
+                        record[name] = orjson.Fragment(record[name])
+                lines.append(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+            yield b"".join(lines)
+
+    def _gzip(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Compresses a byte stream into a single gzip member as it is produced."""
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            if compressed := compressor.compress(chunk):
+                yield compressed
+        yield compressor.flush()
+
+    def _stream_xlsx(self, build_query: Callable[[Session], Query], header: List[str], title: str) -> Iterator[bytes]:
+        """
+        XLSX is a zip archive that can only be finished once every row is known, so the
+        workbook is written in write-only mode to a temporary file and then streamed.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=title)
+        sheet.append(header)
+        for batch in self._iter_batches(build_query):
+            for row in batch:
+                sheet.append([self._format_value(value, for_xlsx=True) for value in row])
+
+        with tempfile.TemporaryFile() as file:
+            workbook.save(file)
+            file.seek(0)
+            while chunk := file.read(_FILE_CHUNK_SIZE):
+                yield chunk
+
+    def _format_value(self, value: Any, for_xlsx: bool = False) -> Any:
+        """Converts database values to plain cell values."""
+        if value is None:
+            return None if for_xlsx else ""
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if isinstance(value, Decimal) and not for_xlsx:
+            return str(value)
+        return value
+
+export_service = ExportService()
@@ -0,0 +1,114 @@
+import base64
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.logging_config import logger
+from app.repository.idempotency_key import idempotency_key_repo
+from app.schema.idempotency import StoredResponse
+
+# Expired rows are purged at most this often by each worker.
+_PURGE_INTERVAL_SECONDS = 600
+
+
+class DatabaseIdempotencyStore:
+    """
+    Keeps idempotency keys in the idempotency_key table.
+    Each call uses its own short session, so keys are visible to concurrent retries at once.
+    """
+
+    def __init__(self):
+        self._next_purge = 0.0
+
+    def reserve(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Claims `key` for a new request. Returns None when claimed, otherwise the live
+        record: a stored response, or a reservation (no status code) if still running.
+        """
+        self._purge_expired()
+        with SessionLocal() as db:
+            lock_until = datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+            if idempotency_key_repo.reserve(db, key=key, fingerprint=fingerprint, expires_at=lock_until):
+                return None
+            row = idempotency_key_repo.get_by_key(db, key=key)
+            if row is None:
+                # The holder released the key between our two statements; treat it as busy.
+                return StoredResponse(fingerprint=fingerprint)
+            return StoredResponse(
+                fingerprint=row.fingerprint,
+                status_code=row.status_code,
+                headers=row.headers or [],
+                body=row.body or b"",
+            )
+
+    def complete(self, key: str, response: StoredResponse):
+        with SessionLocal() as db:
+            idempotency_key_repo.complete(
+                db,
+                key=key,
+                status_code=response.status_code,
+                headers=response.headers,
+                body=response.body,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            )
+
+    def release(self, key: str):
+        with SessionLocal() as db:
+            idempotency_key_repo.release(db, key=key)
+
+    def _purge_expired(self):
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + _PURGE_INTERVAL_SECONDS
+        try:
+            with SessionLocal() as db:
+                idempotency_key_repo.delete_expired(db)
+        except Exception as e:
+            logger.error(f"Purging expired idempotency keys failed: {e}")
+
+
+class RedisIdempotencyStore:
+    """
+    Keeps idempotency keys in Redis. Expiry is handled by Redis itself: a reservation
+    lives for IDEMPOTENCY_LOCK_SECONDS and a stored response for IDEMPOTENCY_TTL_SECONDS.
+    """
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def reserve(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Same contract as `DatabaseIdempotencyStore.reserve`, using SET NX."""
+        name = self._name(key)
+        reservation = self._dump(StoredResponse(fingerprint=fingerprint))
+        if self._redis.set(name, reservation, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS):
+            return None
+        value = self._redis.get(name)
+        if value is None:
+            return StoredResponse(fingerprint=fingerprint)
+        return self._load(value)
+
+    def complete(self, key: str, response: StoredResponse):
+        self._redis.set(self._name(key), self._dump(response), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+
+    def release(self, key: str):
+        self._redis.delete(self._name(key))
+
+    def _name(self, key: str) -> str:
+        return f"idempotency:{key}"
+
+    def _dump(self, response: StoredResponse) -> str:
+        data = response.model_dump(exclude={"body"})
+        data["body"] = base64.b64encode(response.body).decode("ascii")
+        return json.dumps(data)
+
+    def _load(self, value: bytes) -> StoredResponse:
+        data = json.loads(value)
+        data["body"] = base64.b64decode(data["body"])
+        return StoredResponse(**data)
+
+
+idempotency_store = RedisIdempotencyStore(settings.REDIS_URL) if settings.REDIS_URL else DatabaseIdempotencyStore()
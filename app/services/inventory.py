@@ -1,3 +1,4 @@
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
 from sqlalchemy.inspection import inspect
@@ -11,6 +12,7 @@ from app.models.enums.payment import PaymentDirection
 from app.models.enums.item_type import ItemType
 from app.repository.inventory import inventory_repo
 from app.schema.inventory import InventoryAdjust
+from app.services.inventory_writer import inventory_writer
 
 # --- Helpers ---
 def _extract_model_attrs(model: Any, exclude: List[str] = None) -> Dict[str, Any]:
@@ -68,107 +70,80 @@ class InventoryService:
 
     def adjust_inventory(self, db: Session, *, adjustment_in: InventoryAdjust) -> Dict[str, Any]:
         """Create a new inventory snapshot based on manual adjustments."""
-        latest_inventory = inventory_repo.get_latest(db)
-
-        new_snapshot_data = self._get_new_snapshot_base(latest_inventory)
-
-        # Apply adjustments
+        overrides: Dict[str, Any] = {}
         if adjustment_in.money_balance is not None:
-            new_snapshot_data["money_balance"] = adjustment_in.money_balance
+            overrides["money_balance"] = adjustment_in.money_balance
 
         if adjustment_in.inventory:
-            new_snapshot_data.update(adjustment_in.inventory.model_dump(exclude_unset=True))
+            overrides.update(adjustment_in.inventory.model_dump(exclude_unset=True))
 
-        new_snapshot_data["description"] = adjustment_in.description
-
-        # Persist new snapshot
-        new_record = inventory_repo.create(db, obj_in=new_snapshot_data)
+        # Goes through the writer so the adjustment is serialized with approval batches.
+        new_record = inventory_writer.write_adjustment(db, overrides=overrides, description=adjustment_in.description)
 
         return _format_inventory(new_record)
 
     def update_from_transaction(self, db: Session, *, transaction: Transaction):
-        """Creates a new inventory snapshot based on an approved transaction's item changes."""
-        new_snapshot_data = self._calculate_new_snapshot_from_transaction(db, transaction, is_reversal=False)
-        new_snapshot_data["description"] = f"INVENTORY UPDATE FROM TRANSACTION {transaction.id}"
-        new_snapshot_data["transaction_id"] = transaction.id
-        inventory_repo.create(db, obj_in=new_snapshot_data)
+        """Queues the inventory change of an approved transaction's items."""
+        inventory_writer.enqueue(
+            db,
+            item_deltas=self._calculate_item_deltas_from_transaction(transaction, is_reversal=False),
+            description=f"INVENTORY UPDATE FROM TRANSACTION {transaction.id}",
+            transaction_id=transaction.id,
+        )
 
     def revert_from_transaction(self, db: Session, *, transaction: Transaction):
-        """Creates a new inventory snapshot that reverses a previously approved transaction's item changes."""
-        new_snapshot_data = self._calculate_new_snapshot_from_transaction(db, transaction, is_reversal=True)
-        new_snapshot_data["description"] = f"REVERSAL OF INVENTORY UPDATE FROM TRANSACTION {transaction.id}"
-        new_snapshot_data["transaction_id"] = transaction.id
-        inventory_repo.create(db, obj_in=new_snapshot_data)
+        """Queues the inventory change that reverses a previously approved transaction's items."""
+        inventory_writer.enqueue(
+            db,
+            item_deltas=self._calculate_item_deltas_from_transaction(transaction, is_reversal=True),
+            description=f"REVERSAL OF INVENTORY UPDATE FROM TRANSACTION {transaction.id}",
+            transaction_id=transaction.id,
+        )
 
     def update_money_balance_from_payment(self, db: Session, *, payment: Payment):
-        """Creates a new inventory snapshot based on a payment's money movement."""
-        new_snapshot_data = self._calculate_new_snapshot_from_payment(db, payment, is_reversal=False)
-        new_snapshot_data["description"] = f"MONEY BALANCE UPDATE FROM PAYMENT {payment.id}"
-        new_snapshot_data["payment_id"] = payment.id
-        inventory_repo.create(db, obj_in=new_snapshot_data)
+        """Queues the money balance change of an approved payment."""
+        inventory_writer.enqueue(
+            db,
+            money_delta=self._calculate_money_delta_from_payment(payment, is_reversal=False),
+            description=f"MONEY BALANCE UPDATE FROM PAYMENT {payment.id}",
+            payment_id=payment.id,
+        )
 
     def revert_money_balance_from_payment(self, db: Session, *, payment: Payment):
-        """Creates a new snapshot that reverses a payment's money movement."""
-        new_snapshot_data = self._calculate_new_snapshot_from_payment(db, payment, is_reversal=True)
-        new_snapshot_data["description"] = f"REVERSAL OF MONEY BALANCE UPDATE FROM PAYMENT {payment.id}"
-        new_snapshot_data["payment_id"] = payment.id
-        inventory_repo.create(db, obj_in=new_snapshot_data)
-        
-    def _get_new_snapshot_base(self, latest_inventory: Inventory | None) -> Dict[str, Any]:
-        """Gets the state of the last inventory, or a zeroed-out state if none exists."""
-        if latest_inventory:
-            return _extract_model_attrs(
-                latest_inventory, exclude=["id", "created_at", "updated_at", "transaction_id", "payment_id"]
-            )
-        
-        # If no inventory exists, create a zeroed-out base
-        base = {item.value: 0 for item in ItemType}
-        base['money_balance'] = 0
-        return base
-
-    def _calculate_new_snapshot_from_transaction(self, db: Session, transaction: Transaction, is_reversal: bool) -> Dict[str, Any]:
-        """Calculates the next inventory state from a transaction's items."""
-        latest_inventory = inventory_repo.get_latest(db)
-        new_snapshot_data = self._get_new_snapshot_base(latest_inventory)
+        """Queues the money balance change that reverses a payment's money movement."""
+        inventory_writer.enqueue(
+            db,
+            money_delta=self._calculate_money_delta_from_payment(payment, is_reversal=True),
+            description=f"REVERSAL OF MONEY BALANCE UPDATE FROM PAYMENT {payment.id}",
+            payment_id=payment.id,
+        )
+
+    def _calculate_item_deltas_from_transaction(self, transaction: Transaction, is_reversal: bool) -> Dict[str, Decimal]:
+        """Calculates the item balance changes caused by a transaction's items."""
+        deltas: Dict[str, Decimal] = {}
 
         for trans_item in transaction.items:
             item_key = trans_item.item.name
-            if item_key in new_snapshot_data:
-                # If it's a reversal, flip the logic
-                if is_reversal:
-                    if trans_item.transaction_type == TransactionType.SELL:
-                        new_snapshot_data[item_key] += trans_item.weight_count  # Add back
-                    else:  # BUY
-                        new_snapshot_data[item_key] -= trans_item.weight_count  # Remove
-                else: # The transaction was successful
-                    if trans_item.transaction_type == TransactionType.SELL:
-                        new_snapshot_data[item_key] -= trans_item.weight_count
-                    else:  # BUY
-                        new_snapshot_data[item_key] += trans_item.weight_count
-        
-        return new_snapshot_data
-
-    def _calculate_new_snapshot_from_payment(self, db: Session, payment: Payment, is_reversal: bool) -> Dict[str, Any]:
-        """Calculates the next inventory state from a payment's money movement."""
-        latest_inventory = inventory_repo.get_latest(db)
-        new_snapshot_data = self._get_new_snapshot_base(latest_inventory)
-
-        amount = payment.amount
-        
-        # If it's a reversal, flip the logic
-        if is_reversal:
-            if payment.direction == PaymentDirection.INCOMING:
-                new_snapshot_data["money_balance"] -= amount # Take money back out
-            elif payment.direction == PaymentDirection.OUTGOING:
-                new_snapshot_data["money_balance"] += amount # Put money back in
-        else: # The payment was successful
-            if payment.direction == PaymentDirection.INCOMING:
-                new_snapshot_data["money_balance"] += amount
-            elif payment.direction == PaymentDirection.OUTGOING:
-                new_snapshot_data["money_balance"] -= amount
-        
+            # SELL removes items from the shop, BUY adds them. A reversal flips the sign.
+            sign = -1 if trans_item.transaction_type == TransactionType.SELL else 1
+            if is_reversal:
+                sign = -sign
+            deltas[item_key] = deltas.get(item_key, Decimal(0)) + sign * trans_item.weight_count
+
+        return deltas
+
+    def _calculate_money_delta_from_payment(self, payment: Payment, is_reversal: bool) -> int:
+        """Calculates the money balance change caused by a payment."""
         # INTERNAL_TRANSFER has no effect on money_balance
-        return new_snapshot_data
+        if payment.direction == PaymentDirection.INCOMING:
+            delta = payment.amount
+        elif payment.direction == PaymentDirection.OUTGOING:
+            delta = -payment.amount
+        else:
+            delta = 0
+
+        # If it's a reversal, flip the logic
+        return -delta if is_reversal else delta
 
 inventory_service = InventoryService()
 
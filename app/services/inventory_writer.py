@@ -0,0 +1,154 @@
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.logging_config import logger
+from app.models.inventory import Inventory
+from app.models.inventory_change import InventoryChange
+from app.models.enums.item_type import ItemType
+from app.repository.inventory import inventory_repo
+from app.repository.inventory_change import inventory_change_repo
+
+# Key of the Postgres advisory lock that serializes snapshot creation across all workers.
+INVENTORY_WRITER_LOCK_ID = 726_001
+# Session.info key of the ids of the changes the session queued, to flush after committing.
+_PENDING_IDS_KEY = "inventory_writer_pending_ids"
+
+
+class InventoryWriter:
+    """
+    Group-commit writer for inventory snapshots.
+
+    Approvals only record their delta as a pending InventoryChange inside their own
+    transaction. After committing, the caller runs `flush`, which takes a single advisory
+    lock. Callers that then find their change already folded by another flush return
+    immediately; otherwise the flush waits a short window for concurrent approvals and folds
+    every pending change into ONE new snapshot. Only that one flush waits, so snapshot count
+    and approval latency stay flat as the approval rate rises.
+    """
+
+    def enqueue(
+        self,
+        db: Session,
+        *,
+        money_delta: int = 0,
+        item_deltas: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+        transaction_id: Optional[uuid.UUID] = None,
+        payment_id: Optional[uuid.UUID] = None,
+    ) -> InventoryChange:
+        """
+        Records a pending change in the caller's transaction. Nothing is committed here;
+        the change becomes visible to the writer once the caller commits.
+        """
+        # Generated up front so `flush` can tell whether this change is still pending.
+        change = InventoryChange(
+            id=uuid.uuid4(),
+            money_delta=money_delta,
+            item_deltas={key: str(value) for key, value in (item_deltas or {}).items() if value},
+            description=description,
+            transaction_id=transaction_id,
+            payment_id=payment_id,
+        )
+        db.add(change)
+        db.info.setdefault(_PENDING_IDS_KEY, []).append(change.id)
+        return change
+
+    def flush(self, db: Session) -> Optional[Inventory]:
+        """
+        Folds all committed pending changes into a single snapshot.
+        Must be called after the caller's own transaction has been committed; it is a
+        no-op if the session did not queue anything. A failure here never undoes the
+        approval: the changes stay pending and are picked up by the next flush.
+        """
+        change_ids = db.info.pop(_PENDING_IDS_KEY, None)
+        if not change_ids:
+            return None
+
+        try:
+            self._lock(db)
+            if not inventory_change_repo.has_pending(db, ids=change_ids):
+                # Another flush folded our changes while we waited for the lock.
+                db.commit()
+                return None
+
+            if settings.INVENTORY_BATCH_WINDOW_MS > 0:
+                # Hold the lock while concurrent approvals commit, so they join this batch.
+                time.sleep(settings.INVENTORY_BATCH_WINDOW_MS / 1000)
+
+            pending = inventory_change_repo.get_pending(db)
+            snapshot = self._write_snapshot(db, pending)
+            db.commit()
+            return snapshot
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Inventory writer flush failed, changes remain pending: {e}")
+            return None
+
+    def write_adjustment(self, db: Session, *, overrides: Dict[str, Any], description: Optional[str]) -> Inventory:
+        """
+        Writes a manual adjustment under the writer lock. Pending changes are folded first,
+        then the given absolute balances are applied on top, all in one snapshot.
+        """
+        self._lock(db)
+        pending = inventory_change_repo.get_pending(db)
+        snapshot = self._write_snapshot(db, pending, overrides=overrides, description=description)
+        db.commit()
+        db.refresh(snapshot)
+        return snapshot
+
+    def _lock(self, db: Session):
+        """Takes the transaction-scoped advisory lock; it is released on commit/rollback."""
+        db.execute(select(func.pg_advisory_xact_lock(INVENTORY_WRITER_LOCK_ID)))
+
+    def _write_snapshot(
+        self,
+        db: Session,
+        pending: List[InventoryChange],
+        overrides: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+    ) -> Inventory:
+        """Applies the pending deltas (and optional overrides) to the latest snapshot and links them."""
+        snapshot_data = self._get_base(inventory_repo.get_latest(db))
+
+        for change in pending:
+            snapshot_data["money_balance"] += change.money_delta
+            for item_key, delta in change.item_deltas.items():
+                if item_key in snapshot_data:
+                    snapshot_data[item_key] += Decimal(delta)
+
+        if overrides:
+            snapshot_data.update(overrides)
+
+        if overrides is None:
+            if len(pending) == 1:
+                # A batch of one keeps the direct links, exactly like a standalone update.
+                snapshot_data["transaction_id"] = pending[0].transaction_id
+                snapshot_data["payment_id"] = pending[0].payment_id
+                description = pending[0].description
+            else:
+                description = f"INVENTORY UPDATE FROM {len(pending)} APPROVALS"
+        snapshot_data["description"] = description
+
+        # Generated up front so the changes can be linked before the single commit. created_at
+        # is the time the snapshot is written under the lock, not the start of the caller's
+        # transaction (now()), so snapshot order follows lock order and get_latest finds it.
+        snapshot = Inventory(id=uuid.uuid4(), created_at=func.clock_timestamp(), **snapshot_data)
+        db.add(snapshot)
+        for change in pending:
+            change.inventory_id = snapshot.id
+        db.flush()
+        return snapshot
+
+    def _get_base(self, latest_inventory: Optional[Inventory]) -> Dict[str, Any]:
+        """Gets the balances of the last snapshot, or a zeroed-out state if none exists."""
+        keys = [item.value for item in ItemType] + ["money_balance"]
+        if latest_inventory:
+            return {key: getattr(latest_inventory, key) for key in keys}
+        return {key: 0 for key in keys}
+
+inventory_writer = InventoryWriter()
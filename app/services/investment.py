@@ -18,7 +18,7 @@ class InvestmentService:
         return investment
     
     def create_from_payment(self, db: Session, *, payment: Payment) -> Investment:
-        """Creates an Investment record from an approved incoming payment."""
+        """Creates an Investment record from an approved incoming payment. The caller commits."""
         if not payment.investor_id:
             return None
 
@@ -26,14 +26,14 @@ class InvestmentService:
             "amount": payment.amount,
             "investor_id": payment.investor_id,
             "payment_id": payment.id
-        })
+        }, commit=False)
         return new_investment
         
     def delete_by_payment_id(self, db: Session, *, payment_id: uuid.UUID):
-        """Deletes an investment record when its associated payment is rejected."""
+        """Deletes an investment record when its associated payment is rejected. The caller commits."""
         investment_to_delete = investment_repo.get_by_payment_id(db, payment_id=payment_id)
         if investment_to_delete:
-            investment_repo.remove(db, id=investment_to_delete.id)
+            investment_repo.remove(db, id=investment_to_delete.id, commit=False)
 
     def search(
         self,
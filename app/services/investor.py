@@ -6,9 +6,13 @@ from fastapi import status
 from app.core.exceptions import AppException
 from app.models.user import User, UserRole
 from app.models.investor import Investor, InvestorStatus
+from app.models.payment import Payment
+from app.models.enums.shared import ApprovalStatus
 from app.models.enums.contact import ContactType
 from app.repository.investor import investor_repo
-from app.schema.investor import InvestorCreate, InvestorUpdate
+from app.schema.investor import (
+    InvestorCreate, InvestorUpdate, InvestorProfilePublic, InvestorStatement, InvestorStatementEntry, StatementEntryType
+)
 from app.services.user import user_service
 from app.services.contact import contact_service
 
@@ -72,7 +76,12 @@ class InvestorService:
         investor_to_delete = self.get_by_id(db, investor_id=investor_id)
 
         # Check for financial ties before deleting
-        if investor_to_delete.investments or any(p.status != 'draft' for p in investor_to_delete.payments):
+        if investor_repo.has_dependents(
+            db,
+            id=investor_id,
+            relationships=("investments", "payments"),
+            criteria={"payments": Payment.status != ApprovalStatus.DRAFT},
+        ):
              raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot delete investor with existing investments or approved payments.")
 
         # Manually delete related user and contact
@@ -91,5 +100,26 @@ class InvestorService:
     def search(self, db: Session, **kwargs) -> List[Investor]:
         return investor_repo.search(db, **kwargs)
 
+    def get_statement(self, db: Session, *, investor: Investor, skip: int = 0, limit: int = 100) -> InvestorStatement:
+        """
+        Builds one page of an investor's statement. The profile is expected to be loaded
+        already (with its contact), so this adds exactly one query.
+        """
+        rows, total = investor_repo.get_statement(db, investor_id=investor.id, credit=investor.credit, skip=skip, limit=limit)
+        entries = [
+            InvestorStatementEntry(
+                entry_type=StatementEntryType[row.entry_type],
+                occurred_at=row.occurred_at,
+                amount=row.amount,
+                status=row.status,
+                payment_id=row.payment_id,
+                investment_id=row.investment_id,
+                invested_balance=row.invested_balance,
+                credit_balance=row.credit_balance,
+            )
+            for row in rows
+        ]
+        return InvestorStatement(profile=InvestorProfilePublic.model_validate(investor), entries=entries, total=total)
+
 
 investor_service = InvestorService()
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 import uuid
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from app.core.exceptions import AppException
 from fastapi import status
@@ -23,6 +23,16 @@ class ItemService:
             )
         return item
 
+    def validate_ids(self, db: Session, *, item_ids: Iterable[uuid.UUID]) -> None:
+        """Helper method to check that all given item IDs exist (in one query) or raise 404."""
+        item_ids = set(item_ids)
+        missing = item_ids - item_repo.get_existing_ids(db, ids=item_ids)
+        if missing:
+            raise AppException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Items with IDs {', '.join(sorted(str(i) for i in missing))} not found.",
+            )
+
     def get_all(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[Item]:
         """Get all items."""
         return item_repo.get_multi(db, skip=skip, limit=limit)
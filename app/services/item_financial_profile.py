@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
 import uuid
+from typing import Any, Dict, Tuple
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.exceptions import AppException
 from fastapi import status
 from app.models.user import User
 from app.models.item_financial_profile import ItemFinancialProfile
+from app.models.enums.transaction import TransactionType
 from app.repository.item_financial_profile import item_financial_profile_repo
 from app.schema.item_financial_profile import ItemFinancialProfileUpdate
 
@@ -12,6 +16,9 @@ class ItemFinancialProfileService:
     """
     Service layer for item financial profile business logic.
     """
+    def __init__(self):
+        self._defaults_cache = TTLCache(ttl_seconds=settings.FINANCIAL_PROFILE_CACHE_TTL_SECONDS)
+
     def get_by_id(self, db: Session, *, profile_id: uuid.UUID) -> ItemFinancialProfile:
         """Helper method to get a profile by ID or raise 404."""
         profile = item_financial_profile_repo.get(db, id=profile_id)
@@ -23,7 +30,27 @@ class ItemFinancialProfileService:
         """Update a financial profile."""
         profile_to_update = self.get_by_id(db, profile_id=profile_id)
         updated_profile = item_financial_profile_repo.update(db, db_obj=profile_to_update, obj_in=profile_in)
+        self.invalidate_defaults()
         return updated_profile
 
+    def get_defaults(self, db: Session) -> Dict[Tuple[uuid.UUID, TransactionType], Dict[str, Any]]:
+        """
+        Returns the defaults of every profile keyed by (item_id, transaction_type).
+        The map is small and read on every quote, so it is cached per worker.
+        """
+        return self._defaults_cache.get_or_load("defaults", lambda: {
+            (row.item_id, row.transaction_type): {
+                "karat": row.karat_default,
+                "ojrat": row.ojrat_default,
+                "profit": row.profit_default,
+                "tax": row.tax_default,
+            }
+            for row in item_financial_profile_repo.get_all_defaults(db)
+        })
+
+    def invalidate_defaults(self):
+        """Drops the cached defaults after profiles were changed."""
+        self._defaults_cache.invalidate()
+
 item_financial_profile_service = ItemFinancialProfileService()
 
@@ -1,18 +1,22 @@
 from sqlalchemy.orm import Session
 import uuid
-from typing import List, Any
+from typing import Any, Dict, List
 
 from app.core.exceptions import AppException
 from fastapi import status
 from app.models.user import User, UserRole
 from app.models.payment import Payment, PaymentDirection
+from app.models.enums.payment import PaymentMethod
 from app.models.enums.shared import ApprovalStatus
 from app.repository.payment import payment_repo
-from app.schema.payment import PaymentCreate, PaymentUpdate
+from app.schema.payment import PaymentAggregate, PaymentCreate, PaymentSearchWithAggregates, PaymentUpdate
+from app.schema.bulk import BulkActionResponse
 
 # --- Services for FK validation and business logic ---
 from app.services.account_ledger import account_ledger_service
+from app.services.contact_rollup import contact_rollup_service
 from app.services.inventory import inventory_service
+from app.services.inventory_writer import inventory_writer
 from app.services.user import user_service
 from app.services.contact import contact_service
 from app.services.transaction import transaction_service
@@ -20,6 +24,7 @@ from app.services.saved_bank_account import saved_bank_account_service
 from app.models.enums.investor import InvestorStatus
 from app.services.investment import investment_service
 from app.services.investor import investor_service
+from app.services.bulk import bulk_action_service
 
 
 class PaymentService:
@@ -48,13 +53,40 @@ class PaymentService:
         **kwargs: Any
     ) -> List[Payment]:
         """Orchestrates the search for payments by calling the repository."""
+        return payment_repo.search(db, **self.scope_search_filters(current_user=current_user, **kwargs))
+
+    def search_with_aggregates(
+        self,
+        db: Session,
+        *,
+        current_user: User,
+        **kwargs: Any
+    ) -> PaymentSearchWithAggregates:
+        """Searches for payments and aggregates every match by direction, method and status."""
+        payments, aggregates = payment_repo.search_with_aggregates(db, **self.scope_search_filters(current_user=current_user, **kwargs))
+        return PaymentSearchWithAggregates(
+            items=payments,
+            aggregates=[
+                PaymentAggregate(
+                    # The columns store enum names.
+                    direction=PaymentDirection[row["direction"]] if row["direction"] else None,
+                    payment_method=PaymentMethod[row["payment_method"]] if row["payment_method"] else None,
+                    status=ApprovalStatus[row["status"]] if row["status"] else None,
+                    count=row["count"],
+                    total_amount=row["total_amount"],
+                )
+                for row in aggregates
+            ],
+        )
+
+    def scope_search_filters(self, *, current_user: User, **kwargs: Any) -> Dict[str, Any]:
+        """Restricts search filters to what the user may see."""
         # If the user is not an admin, force the search to only include their own payments
         if current_user.role == UserRole.USER:
             kwargs["recorder_id"] = current_user.id
         elif current_user.role == UserRole.INVESTOR:
             kwargs["investor_id"] = current_user.investor_profile.id
-        
-        return payment_repo.search(db, **kwargs)
+        return kwargs
 
     def _validate_foreign_keys(self, db: Session, payment_in: PaymentCreate, current_user: User):
         """
@@ -121,19 +153,61 @@ class PaymentService:
     def approve(self, db: Session, *, payment_id: uuid.UUID, current_user: User) -> Payment:
         """Handles the logic for approving a payment and advancing its status."""
         payment = self.get_payment_by_id_and_check_permission(db, payment_id=payment_id, current_user=current_user)
-        
-        new_status = self._get_next_approval_status(payment.status, current_user.role)
-        self._handle_side_effects(db, payment, old_status=payment.status, new_status=new_status)
+        self._apply_approve(db, payment=payment, current_user=current_user)
 
-        payment.status = new_status
         db.commit()
+        # Fold any queued money balance change (together with concurrent approvals).
+        inventory_writer.flush(db)
         db.refresh(payment)
         return payment
 
     def reject(self, db: Session, *, payment_id: uuid.UUID, current_user: User) -> Payment:
         """Handles the logic for rejecting a payment and returning it to draft."""
         payment = self.get_payment_by_id_and_check_permission(db, payment_id=payment_id, current_user=current_user)
-        
+        self._apply_reject(db, payment=payment, current_user=current_user)
+
+        db.commit()
+        inventory_writer.flush(db)
+        db.refresh(payment)
+        return payment
+
+    def bulk_approve(self, db: Session, *, payment_ids: List[uuid.UUID], current_user: User) -> BulkActionResponse:
+        """Approves many payments in one DB transaction, with one combined inventory snapshot."""
+        return bulk_action_service.run(
+            db,
+            ids=payment_ids,
+            entities=self._get_many_for_bulk(db, payment_ids=payment_ids, current_user=current_user),
+            action=lambda payment: self._apply_approve(db, payment=payment, current_user=current_user),
+            entity_name="Payment",
+        )
+
+    def bulk_reject(self, db: Session, *, payment_ids: List[uuid.UUID], current_user: User) -> BulkActionResponse:
+        """Rejects many payments in one DB transaction, with one combined inventory snapshot."""
+        return bulk_action_service.run(
+            db,
+            ids=payment_ids,
+            entities=self._get_many_for_bulk(db, payment_ids=payment_ids, current_user=current_user),
+            action=lambda payment: self._apply_reject(db, payment=payment, current_user=current_user),
+            entity_name="Payment",
+        )
+
+    def _get_many_for_bulk(self, db: Session, *, payment_ids: List[uuid.UUID], current_user: User) -> Dict[uuid.UUID, Payment]:
+        """Loads all targets in one query; payments the user may not access count as missing."""
+        payments = payment_repo.get_many_for_approval(db, ids=payment_ids)
+        return {
+            payment.id: payment
+            for payment in payments
+            if current_user.role == UserRole.ADMIN or payment.recorder_id == current_user.id
+        }
+
+    def _apply_approve(self, db: Session, *, payment: Payment, current_user: User):
+        """Advances the status and applies the side effects of an approval."""
+        new_status = self._get_next_approval_status(payment.status, current_user.role)
+        self._handle_side_effects(db, payment, old_status=payment.status, new_status=new_status)
+        payment.status = new_status
+
+    def _apply_reject(self, db: Session, *, payment: Payment, current_user: User):
+        """Returns the payment to draft and reverts the side effects of its approval."""
         old_status = payment.status
         if old_status == ApprovalStatus.DRAFT:
              raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="Draft payments cannot be rejected.")
@@ -143,11 +217,7 @@ class PaymentService:
             raise AppException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to reject this payment.")
         
         self._handle_side_effects(db, payment, old_status=old_status, new_status=ApprovalStatus.DRAFT)
-        
         payment.status = ApprovalStatus.DRAFT
-        db.commit()
-        db.refresh(payment)
-        return payment
         
     def _get_next_approval_status(self, current_status: ApprovalStatus, user_role: UserRole) -> ApprovalStatus:
         """Determines the next valid status for a payment upon approval."""
@@ -162,7 +232,10 @@ class PaymentService:
         raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="Payment cannot be approved further.")
 
     def _handle_side_effects(self, db: Session, payment: Payment, old_status: ApprovalStatus, new_status: ApprovalStatus):
-        """Orchestrates ledger and inventory updates based on status changes."""
+        """
+        Orchestrates ledger and inventory updates based on status changes.
+        Nothing is committed here: every effect joins the caller's single transaction.
+        """
         is_approving = new_status != ApprovalStatus.DRAFT
         was_admin_approved = old_status == ApprovalStatus.APPROVED_BY_ADMIN
         is_becoming_admin_approved = new_status == ApprovalStatus.APPROVED_BY_ADMIN
@@ -196,5 +269,11 @@ class PaymentService:
             elif not is_approving and was_admin_approved:
                 inventory_service.revert_money_balance_from_payment(db, payment=payment)
 
+        # --- Contact Rollup Updates ---
+        if is_becoming_admin_approved:
+            contact_rollup_service.apply_payment(db, payment=payment)
+        elif not is_approving and was_admin_approved:
+            contact_rollup_service.apply_payment(db, payment=payment, is_reversal=True)
+
 payment_service = PaymentService()
 
@@ -0,0 +1,147 @@
+import uuid
+from datetime import datetime
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+import numpy as np
+from fastapi import status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import AppException
+from app.models.profit_distribution import ProfitDistribution, ProfitShare
+from app.models.user import User
+from app.repository.investment import investment_repo
+from app.repository.investor import investor_repo
+from app.repository.profit_distribution import profit_distribution_repo
+from app.schema.profit_distribution import ProfitDistributionCreate, ProfitDistributionPreview, ProfitSharePublic
+
+# Key of the Postgres advisory lock that serializes distribution runs across all workers.
+PROFIT_DISTRIBUTION_LOCK_ID = 726_002
+
+
+def compute_time_weights(
+    investor_index: np.ndarray,
+    amounts: np.ndarray,
+    invested_at: np.ndarray,
+    period_start: float,
+    period_end: float,
+    investor_count: int,
+) -> np.ndarray:
+    """
+    Each investor's fraction of the capital-time held during [period_start, period_end].
+    An investment counts from the later of its creation and the period start, so capital
+    invested before the period counts for the whole of it. Times are POSIX seconds.
+    """
+    held = np.clip(period_end - np.maximum(invested_at, period_start), 0, None)
+    capital_time = np.bincount(investor_index, weights=amounts * held, minlength=investor_count)
+    total = capital_time.sum()
+    return capital_time / total if total > 0 else capital_time
+
+
+def allocate(total: int, weights: np.ndarray) -> np.ndarray:
+    """
+    Splits `total` whole Rials by `weights` (which sum to 1) with the largest remainder
+    method: everyone gets the floor of their exact share and the Rials left over go to the
+    largest fractional parts, so the shares always add up to exactly `total`.
+    """
+    exact = weights * total
+    shares = np.floor(exact).astype(np.int64)
+    # Stable sort so equal remainders are broken by position, keeping runs reproducible.
+    order = np.argsort(-(exact - shares), kind="stable")
+    leftover = total - int(shares.sum())
+    if leftover > 0:
+        shares[order[:leftover]] += 1
+    elif leftover < 0:
+        # Only possible through float rounding; take back from the smallest remainders.
+        shares[order[::-1][:-leftover]] -= 1
+    return shares
+
+
+class ProfitDistributionService:
+    """
+    Distributes a period's profit to all active investors at once. Investment timelines
+    are loaded in one query, shares are computed with NumPy, and applying a distribution
+    credits every investor in a single database transaction.
+    """
+
+    def get_by_id(self, db: Session, *, distribution_id: uuid.UUID) -> ProfitDistribution:
+        distribution = profit_distribution_repo.get_with_shares(db, id=distribution_id)
+        if not distribution:
+            raise AppException(status_code=status.HTTP_404_NOT_FOUND, detail="Profit distribution not found.")
+        return distribution
+
+    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ProfitDistribution]:
+        return profit_distribution_repo.get_recent(db, skip=skip, limit=limit)
+
+    def preview(self, db: Session, *, distribution_in: ProfitDistributionCreate) -> ProfitDistributionPreview:
+        """Computes the shares a distribution would credit, without writing anything."""
+        shares = self._compute_shares(db, distribution_in=distribution_in)
+        return ProfitDistributionPreview(
+            period_start=distribution_in.period_start,
+            period_end=distribution_in.period_end,
+            total_profit=distribution_in.total_profit,
+            shares=[ProfitSharePublic(investor_id=investor_id, amount=amount, weight=weight) for investor_id, amount, weight in shares],
+        )
+
+    def apply(self, db: Session, *, distribution_in: ProfitDistributionCreate, current_user: User) -> ProfitDistribution:
+        """
+        Records the distribution and adds each share to its investor's credit, all in one commit.
+        Periods may not overlap an earlier distribution, so the same profit is never paid twice.
+        """
+        db.execute(select(func.pg_advisory_xact_lock(PROFIT_DISTRIBUTION_LOCK_ID)))
+        period_start, period_end = self._period(distribution_in)
+        if profit_distribution_repo.get_overlapping(db, period_start=period_start, period_end=period_end):
+            raise AppException(status_code=status.HTTP_409_CONFLICT, detail="A profit distribution already covers part of this period.")
+
+        shares = self._compute_shares(db, distribution_in=distribution_in)
+        investors = {investor.id: investor for investor in investor_repo.get_many_for_update(db, ids=[share[0] for share in shares])}
+
+        distribution = ProfitDistribution(
+            period_start=period_start,
+            period_end=period_end,
+            total_profit=distribution_in.total_profit,
+            description=distribution_in.description,
+            creator_user_id=current_user.id,
+        )
+        for investor_id, amount, weight in shares:
+            distribution.shares.append(ProfitShare(investor_id=investor_id, amount=amount, weight=weight))
+            investors[investor_id].credit += amount
+        db.add(distribution)
+        db.commit()
+        return self.get_by_id(db, distribution_id=distribution.id)
+
+    def _compute_shares(self, db: Session, *, distribution_in: ProfitDistributionCreate) -> List[Tuple[uuid.UUID, int, float]]:
+        """Gets (investor_id, amount, weight) for every investor that held capital during the period."""
+        period_start, period_end = self._period(distribution_in)
+        timelines = investment_repo.get_active_timelines(db, before=period_end)
+
+        investor_ids = list(dict.fromkeys(row.investor_id for row in timelines))
+        position = {investor_id: index for index, investor_id in enumerate(investor_ids)}
+        count = len(timelines)
+        weights = compute_time_weights(
+            np.fromiter((position[row.investor_id] for row in timelines), dtype=np.int64, count=count),
+            np.fromiter((row.amount for row in timelines), dtype=np.float64, count=count),
+            np.fromiter((row.created_at.timestamp() for row in timelines), dtype=np.float64, count=count),
+            period_start.timestamp(),
+            period_end.timestamp(),
+            len(investor_ids),
+        )
+        if not weights.any():
+            raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="No active investor held capital during this period.")
+
+        amounts = allocate(distribution_in.total_profit, weights)
+        return [
+            (investor_ids[index], int(amounts[index]), float(weights[index]))
+            for index in np.flatnonzero(weights)
+        ]
+
+    def _period(self, distribution_in: ProfitDistributionCreate) -> Tuple[datetime, datetime]:
+        """The requested period, reading naive datetimes in the configured TIMEZONE."""
+        local = ZoneInfo(settings.TIMEZONE)
+        return tuple(
+            moment if moment.tzinfo else moment.replace(tzinfo=local)
+            for moment in (distribution_in.period_start, distribution_in.period_end)
+        )
+
+profit_distribution_service = ProfitDistributionService()
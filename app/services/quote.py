@@ -0,0 +1,103 @@
+from typing import List, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.schema.quote import QuoteLinePublic, QuotePublic, QuoteRequest
+from app.services.item import item_service
+from app.services.item_financial_profile import item_financial_profile_service
+from app.services.transaction import transaction_service
+from app.services.transaction_item import transaction_item_service
+
+# Inputs are scaled to integers with two decimals (the scale of the Numeric columns).
+_SCALE = 100
+# Largest integer float64 holds exactly.
+_MAX_EXACT = 2 ** 53
+# Bound on the float64 rounding error relative to a line's total. The formula has about ten
+# operations, each off by at most 2**-53, so 1e-13 leaves a wide safety margin.
+_RELATIVE_ERROR = 1e-13
+
+
+class QuoteService:
+    """
+    Stateless price quotes for many candidate lines at once.
+    Nothing is written and the transaction tables are never read.
+    """
+
+    def quote(self, db: Session, *, quote_in: QuoteRequest) -> QuotePublic:
+        defaults = item_financial_profile_service.get_defaults(db)
+
+        # Items that have a profile are known to exist; only the rest need a lookup.
+        known_item_ids = {item_id for item_id, _ in defaults}
+        unknown_item_ids = {line.item_id for line in quote_in.lines} - known_item_ids
+        if unknown_item_ids:
+            item_service.validate_ids(db, item_ids=unknown_item_ids)
+
+        resolved_lines = []
+        for line in quote_in.lines:
+            profile = defaults.get((line.item_id, line.transaction_type), {})
+            resolved_lines.append(QuoteLinePublic(
+                item_id=line.item_id,
+                transaction_type=line.transaction_type,
+                weight_count=line.weight_count,
+                unit_price=line.unit_price,
+                karat=line.karat if line.karat is not None else profile.get("karat"),
+                ojrat=line.ojrat if line.ojrat is not None else profile.get("ojrat"),
+                profit=line.profit if line.profit is not None else profile.get("profit"),
+                tax=line.tax if line.tax is not None else profile.get("tax"),
+                total_price=0,
+            ))
+
+        for line, total_price in zip(resolved_lines, self._price_lines(resolved_lines)):
+            line.total_price = total_price
+
+        total_price = sum(
+            transaction_service._signed_price(line.transaction_type, line.total_price)
+            for line in resolved_lines
+        ) - quote_in.discount
+        return QuotePublic(lines=resolved_lines, discount=quote_in.discount, total_price=total_price)
+
+    def _price_lines(self, lines: Sequence[QuoteLinePublic]) -> List[int]:
+        """
+        Vectorized version of `TransactionItemService._calculate_item_total_price`.
+
+        Inputs carry at most two decimals (like the Numeric columns), so they are loaded as
+        exact integers in hundredths and the formula is evaluated in float64 for all lines
+        at once. A float result is only trusted when it is far enough from an integer that
+        truncation cannot differ from the Decimal result; lines without ojrat, profit and
+        tax are computed exactly in fixed point. Every other line is priced with the Decimal
+        formula itself, so the totals match it to the rial.
+        """
+        count = len(lines)
+        unit_price = np.fromiter((line.unit_price for line in lines), dtype=np.float64, count=count)
+        weight_count = self._to_hundredths(lines, "weight_count")
+        ojrat = self._to_hundredths(lines, "ojrat")
+        profit = self._to_hundredths(lines, "profit")
+        tax = self._to_hundredths(lines, "tax")
+        fits = (unit_price < _MAX_EXACT) & (weight_count < _MAX_EXACT)
+
+        # Same steps as the Decimal formula
+        price_after_wage = unit_price + unit_price * (ojrat / (_SCALE * 100))
+        price_after_profit = price_after_wage + price_after_wage * (profit / (_SCALE * 100))
+        net_price = unit_price * (weight_count / _SCALE)
+        gross_price = price_after_profit * (weight_count / _SCALE)
+        total_price = gross_price + (gross_price - net_price) * (tax / (_SCALE * 100))
+
+        tolerance = total_price * _RELATIVE_ERROR + 1e-9
+        trusted = fits & (np.abs(total_price - np.rint(total_price)) > tolerance) & (total_price < _MAX_EXACT)
+        totals = np.floor(np.where(trusted, total_price, 0)).astype(np.int64)
+
+        # Without ojrat, profit and tax the total is unit_price * weight_count, exact in int64.
+        plain = fits & (ojrat == 0) & (profit == 0) & (tax == 0) & (unit_price * weight_count < _MAX_EXACT)
+        plain_total = np.where(plain, unit_price, 0).astype(np.int64) * np.where(plain, weight_count, 0).astype(np.int64) // _SCALE
+        totals = np.where(plain, plain_total, totals).tolist()
+
+        for i in np.flatnonzero(~(trusted | plain)):
+            totals[i] = transaction_item_service._calculate_item_total_price(lines[i])
+        return totals
+
+    def _to_hundredths(self, lines: Sequence[QuoteLinePublic], field: str) -> np.ndarray:
+        """Loads one decimal field of every line as whole hundredths (missing values are zero)."""
+        values = np.fromiter((getattr(line, field) or 0 for line in lines), dtype=np.float64, count=len(lines))
+        return np.rint(values * _SCALE)
+
+quote_service = QuoteService()
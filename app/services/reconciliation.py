@@ -0,0 +1,146 @@
+import bisect
+import csv
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import AppException
+from app.models.enums.payment import PaymentDirection
+from app.repository.payment import payment_repo
+from app.schema.reconciliation import (
+    ReconciliationAmbiguity,
+    ReconciliationMatch,
+    ReconciliationResult,
+    StatementLine,
+)
+from app.services.saved_bank_account import saved_bank_account_service
+
+# Statement lines are matched this many at a time, with one candidate query per chunk.
+CHUNK_SIZE = 1000
+REQUIRED_COLUMNS = {"date", "amount"}
+
+CandidateKey = Tuple[int, PaymentDirection]
+
+
+class ReconciliationService:
+    """
+    Matches bank statement lines to payments.
+
+    A line fits a payment with the same amount and direction created within `window_days`
+    business days of the line's date (and on the given bank account, if any). A line with
+    exactly one fitting payment is matched and that payment is not offered to later lines;
+    several fitting payments make the line ambiguous; none leaves it unmatched.
+    """
+
+    def reconcile(
+        self,
+        db: Session,
+        *,
+        lines: Iterable[StatementLine],
+        window_days: int,
+        saved_bank_account_id: Optional[uuid.UUID] = None,
+    ) -> ReconciliationResult:
+        if saved_bank_account_id:
+            saved_bank_account_service.get_by_id(db, account_id=saved_bank_account_id)
+
+        result = ReconciliationResult(total_lines=0, matched=[], ambiguous=[], unmatched=[])
+        claimed: Set[uuid.UUID] = set()
+        chunk: List[StatementLine] = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) == CHUNK_SIZE:
+                self._reconcile_chunk(db, chunk, window_days, saved_bank_account_id, claimed, result)
+                chunk = []
+        if chunk:
+            self._reconcile_chunk(db, chunk, window_days, saved_bank_account_id, claimed, result)
+        return result
+
+    def parse_statement(self, file: IO[str]) -> Iterator[StatementLine]:
+        """
+        Reads a CSV statement line by line. Required columns are `date` (YYYY-MM-DD, an ISO
+        datetime is cut to its date) and `amount` (Rials; negative for withdrawals, thousands
+        separators allowed); `description` is optional. Raises 400 on the first bad line.
+        """
+        reader = csv.DictReader(file)
+        columns = {(name or "").strip().lower(): name for name in (reader.fieldnames or [])}
+        missing = REQUIRED_COLUMNS - columns.keys()
+        if missing:
+            raise AppException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Statement is missing the column(s): {', '.join(sorted(missing))}.",
+            )
+
+        for row in reader:
+            line_number = reader.line_num
+            raw_date = (row[columns["date"]] or "").strip()
+            raw_amount = (row[columns["amount"]] or "").strip().replace(",", "")
+            try:
+                line_date = datetime.fromisoformat(raw_date).date()
+                amount = int(raw_amount)
+            except ValueError:
+                raise AppException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Line {line_number}: invalid date '{raw_date}' or amount '{raw_amount}'.",
+                )
+            if amount == 0:
+                raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Line {line_number}: amount cannot be zero.")
+
+            description = row.get(columns["description"]) if "description" in columns else None
+            yield StatementLine(
+                line_number=line_number,
+                date=line_date,
+                amount=abs(amount),
+                direction=PaymentDirection.INCOMING if amount > 0 else PaymentDirection.OUTGOING,
+                description=description or None,
+            )
+
+    def _reconcile_chunk(
+        self,
+        db: Session,
+        chunk: List[StatementLine],
+        window_days: int,
+        saved_bank_account_id: Optional[uuid.UUID],
+        claimed: Set[uuid.UUID],
+        result: ReconciliationResult,
+    ):
+        """Loads the candidates of a whole chunk in one query, then matches each line by bisecting its window."""
+        window = timedelta(days=window_days)
+        rows = payment_repo.get_reconciliation_candidates(
+            db,
+            amounts=list({line.amount for line in chunk}),
+            start_time=self._day_start(min(line.date for line in chunk) - window),
+            end_time=self._day_start(max(line.date for line in chunk) + window + timedelta(days=1)),
+            saved_bank_account_id=saved_bank_account_id,
+        )
+
+        # Candidates per (amount, direction), already ordered by created_at.
+        candidates: Dict[CandidateKey, Tuple[List[datetime], List[uuid.UUID]]] = {}
+        for payment_id, amount, direction, created_at in rows:
+            times, ids = candidates.setdefault((amount, direction), ([], []))
+            times.append(created_at)
+            ids.append(payment_id)
+
+        for line in chunk:
+            result.total_lines += 1
+            times, ids = candidates.get((line.amount, line.direction), ([], []))
+            low = bisect.bisect_left(times, self._day_start(line.date - window))
+            high = bisect.bisect_left(times, self._day_start(line.date + window + timedelta(days=1)))
+            fitting = [payment_id for payment_id in ids[low:high] if payment_id not in claimed]
+
+            if len(fitting) == 1:
+                claimed.add(fitting[0])
+                result.matched.append(ReconciliationMatch(line=line, payment_id=fitting[0]))
+            elif fitting:
+                result.ambiguous.append(ReconciliationAmbiguity(line=line, candidate_payment_ids=fitting))
+            else:
+                result.unmatched.append(line)
+
+    def _day_start(self, day: date) -> datetime:
+        """Midnight at the start of a business day, in the configured timezone."""
+        return datetime.combine(day, time.min, tzinfo=ZoneInfo(settings.TIMEZONE))
+
+reconciliation_service = ReconciliationService()
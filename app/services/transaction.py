@@ -1,5 +1,5 @@
 import uuid
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import status
@@ -7,11 +7,17 @@ from fastapi import status
 from app.core.exceptions import AppException
 from app.models.user import User, UserRole
 from app.models.transaction import Transaction
+from app.models.transaction_item import TransactionItem
 from app.models.enums.transaction import TransactionType
 from app.models.enums.shared import ApprovalStatus
 from app.repository.transaction import transaction_repo
+from app.schema.bulk import BulkActionResponse
 from app.schema.transaction import TransactionCreate, TransactionUpdate
 from app.services.inventory import inventory_service
+from app.services.inventory_writer import inventory_writer
+from app.services.contact_rollup import contact_rollup_service
+from app.services.daily_summary import daily_summary_service
+from app.services.bulk import bulk_action_service
 from app.services.contact import contact_service # Import contact service for validation
 
 class TransactionService:
@@ -40,6 +46,8 @@ class TransactionService:
         
         create_data = transaction_in.model_dump()
         create_data["recorder_id"] = current_user.id
+        # total_price is maintained incrementally from here on, starting from the discount alone
+        create_data["total_price"] = -transaction_in.discount
         return transaction_repo.create(db, obj_in=create_data)
 
     def update(self, db: Session, *, transaction_id: uuid.UUID, transaction_in: TransactionUpdate, current_user: User) -> Transaction:
@@ -51,8 +59,12 @@ class TransactionService:
         if transaction_in.contact_id:
             contact_service.get_contact_by_id(db, contact_id=transaction_in.contact_id)
 
-        updated_transaction = transaction_repo.update(db, db_obj=transaction, obj_in=transaction_in)
-        self._recalculate_total_price(db, transaction=updated_transaction)
+        old_discount = transaction.discount
+        updated_transaction = transaction_repo.update(db, db_obj=transaction, obj_in=transaction_in, commit=False)
+        if updated_transaction.discount != old_discount:
+            transaction_repo.apply_total_delta(db, transaction_id=transaction.id, delta=old_discount - updated_transaction.discount)
+        db.commit()
+        db.refresh(updated_transaction)
         return updated_transaction
 
 
@@ -63,42 +75,100 @@ class TransactionService:
         
         return transaction_repo.remove(db, id=transaction.id)
 
-    def _recalculate_total_price(self, db: Session, transaction: Transaction):
-        total = 0
-        # This ensures items are loaded if they aren't already
-        db.refresh(transaction, attribute_names=['items'])
+    def apply_item_change(
+        self,
+        db: Session,
+        *,
+        transaction: Transaction,
+        old_signed_price: int = 0,
+        new_item: Optional[TransactionItem] = None,
+    ) -> int:
+        """
+        Maintains the transaction total incrementally after one item was created, updated or deleted.
+        Only the item's signed difference is applied, in one atomic UPDATE, so the cost does not
+        depend on how many items the transaction has. The caller commits.
+        """
+        new_signed_price = self._signed_price(new_item.transaction_type, new_item.total_price) if new_item else 0
+        delta = new_signed_price - old_signed_price
+        if delta:
+            return transaction_repo.apply_total_delta(db, transaction_id=transaction.id, delta=delta)
+        return transaction.total_price
+
+    def _signed_price(self, transaction_type: TransactionType, total_price: int) -> int:
+        """An item's contribution to the transaction total: SELL items are added and BUY items subtracted."""
+        if transaction_type == TransactionType.SELL:
+            return total_price
+        return -total_price # BUY
+
+    def _calculate_total_price(self, items: Iterable[TransactionItem], discount: int) -> int:
+        """Sums the items' prices in one pass and applies the discount."""
+        return sum(self._signed_price(item.transaction_type, item.total_price) for item in items) - discount
+
+    def approve(self, db: Session, *, transaction_id: uuid.UUID, current_user: User) -> Transaction:
+        transaction = self.get_by_id(db, transaction_id=transaction_id, current_user=current_user, with_items=True)
+        self._apply_approve(db, transaction=transaction, current_user=current_user)
 
-        for item in transaction.items:
-            if item.transaction_type == TransactionType.SELL:
-                total += item.total_price
-            else: # BUY
-                total -= item.total_price
-        
-        transaction.total_price = total - transaction.discount
-        db.add(transaction)
         db.commit()
+        # Fold the queued inventory change (together with any concurrent approvals).
+        inventory_writer.flush(db)
         db.refresh(transaction)
+        return transaction
 
-    def approve(self, db: Session, *, transaction_id: uuid.UUID, current_user: User) -> Transaction:
+    def reject(self, db: Session, *, transaction_id: uuid.UUID, current_user: User) -> Transaction:
         transaction = self.get_by_id(db, transaction_id=transaction_id, current_user=current_user, with_items=True)
-        
+        self._apply_reject(db, transaction=transaction, current_user=current_user)
+
+        db.commit()
+        inventory_writer.flush(db)
+        db.refresh(transaction)
+        return transaction
+
+    def bulk_approve(self, db: Session, *, transaction_ids: List[uuid.UUID], current_user: User) -> BulkActionResponse:
+        """Approves many transactions in one DB transaction, with one combined inventory snapshot."""
+        return bulk_action_service.run(
+            db,
+            ids=transaction_ids,
+            entities=self._get_many_for_bulk(db, transaction_ids=transaction_ids, current_user=current_user),
+            action=lambda transaction: self._apply_approve(db, transaction=transaction, current_user=current_user),
+            entity_name="Transaction",
+        )
+
+    def bulk_reject(self, db: Session, *, transaction_ids: List[uuid.UUID], current_user: User) -> BulkActionResponse:
+        """Rejects many transactions in one DB transaction, with one combined inventory snapshot."""
+        return bulk_action_service.run(
+            db,
+            ids=transaction_ids,
+            entities=self._get_many_for_bulk(db, transaction_ids=transaction_ids, current_user=current_user),
+            action=lambda transaction: self._apply_reject(db, transaction=transaction, current_user=current_user),
+            entity_name="Transaction",
+        )
+
+    def _get_many_for_bulk(self, db: Session, *, transaction_ids: List[uuid.UUID], current_user: User) -> Dict[uuid.UUID, Transaction]:
+        """Loads all targets with their items in one go; transactions the user may not see count as missing."""
+        transactions = transaction_repo.get_many_with_items(db, ids=transaction_ids)
+        return {
+            transaction.id: transaction
+            for transaction in transactions
+            if current_user.role == UserRole.ADMIN or transaction.recorder_id == current_user.id
+        }
+
+    def _apply_approve(self, db: Session, *, transaction: Transaction, current_user: User):
+        """Advances the status and queues the side effects of an approval. The caller commits."""
         if current_user.role == UserRole.ADMIN:
             if transaction.status not in [ApprovalStatus.DRAFT, ApprovalStatus.APPROVED_BY_USER]:
                 raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="This transaction cannot be approved by an admin at its current status.")
             transaction.status = ApprovalStatus.APPROVED_BY_ADMIN
             inventory_service.update_from_transaction(db, transaction=transaction)
+            daily_summary_service.apply_transaction(db, transaction=transaction)
+            contact_rollup_service.apply_transaction(db, transaction=transaction)
 
         else: # Regular user
             if transaction.status != ApprovalStatus.DRAFT:
                 raise AppException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only transactions in 'draft' status can be approved.")
             transaction.status = ApprovalStatus.APPROVED_BY_USER
 
-        db.commit()
-        db.refresh(transaction)
-        return transaction
-
-    def reject(self, db: Session, *, transaction_id: uuid.UUID, current_user: User) -> Transaction:
-        transaction = self.get_by_id(db, transaction_id=transaction_id, current_user=current_user, with_items=True)
+    def _apply_reject(self, db: Session, *, transaction: Transaction, current_user: User):
+        """Returns the transaction to draft and queues the reversal of its side effects. The caller commits."""
         original_status = transaction.status
 
         if current_user.role == UserRole.ADMIN:
@@ -114,10 +184,8 @@ class TransactionService:
         # If the transaction was previously admin approved, its inventory changes must be reversed.
         if original_status == ApprovalStatus.APPROVED_BY_ADMIN:
             inventory_service.revert_from_transaction(db, transaction=transaction)
-
-        db.commit()
-        db.refresh(transaction)
-        return transaction
+            daily_summary_service.apply_transaction(db, transaction=transaction, is_reversal=True)
+            contact_rollup_service.apply_transaction(db, transaction=transaction, is_reversal=True)
 
 transaction_service = TransactionService()
 
@@ -5,13 +5,17 @@ from fastapi import status
 
 from app.core.exceptions import AppException
 from app.models.user import User
+from app.models.transaction import Transaction
 from app.models.transaction_item import TransactionItem
 from app.models.enums.transaction import TransactionType
 from app.models.enums.shared import ApprovalStatus
+from app.repository.transaction import transaction_repo
 from app.repository.transaction_item import transaction_item_repo
-from app.schema.transaction_item import TransactionItemCreate, TransactionItemUpdate
+from app.schema.transaction import TransactionWithItemsCreate
+from app.schema.transaction_item import TransactionItemCreate, TransactionItemUpdate, TransactionItemsBulkModify
 from app.services.transaction import transaction_service
 from app.services.item import item_service # Import item service for validation
+from app.services.contact import contact_service
 
 class TransactionItemService:
 
@@ -28,7 +32,7 @@ class TransactionItemService:
         return item
 
     def create_item(self, db: Session, *, item_in: TransactionItemCreate, current_user: User) -> TransactionItem:
-        transaction = transaction_service.get_by_id(db, transaction_id=item_in.transaction_id, current_user=current_user, with_items=True)
+        transaction = transaction_service.get_by_id(db, transaction_id=item_in.transaction_id, current_user=current_user)
         if transaction.status != ApprovalStatus.DRAFT:
             raise AppException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,8 +46,10 @@ class TransactionItemService:
         
         create_data["total_price"] = self._calculate_item_total_price(item_in)
         
-        new_item = transaction_item_repo.create(db, obj_in=create_data)
-        transaction_service._recalculate_total_price(db, transaction=transaction)
+        new_item = transaction_item_repo.create(db, obj_in=create_data, commit=False)
+        transaction_service.apply_item_change(db, transaction=transaction, new_item=new_item)
+        db.commit()
+        db.refresh(new_item)
         return new_item
 
     def update_item(self, db: Session, *, item_id: uuid.UUID, item_in: TransactionItemUpdate, current_user: User) -> TransactionItem:
@@ -57,19 +63,21 @@ class TransactionItemService:
             )
         
         if item_in.item_id: # check if new item exist
-            item_service.get_by_id(db, item_id=item_id)
+            item_service.get_by_id(db, item_id=item_in.item_id)
         
-        updated_item = transaction_item_repo.update(db, db_obj=item_to_update, obj_in=item_in)
+        # Captured before the update, so only this item's signed difference touches the total
+        old_signed_price = transaction_service._signed_price(item_to_update.transaction_type, item_to_update.total_price)
+        updated_item = transaction_item_repo.update(db, db_obj=item_to_update, obj_in=item_in, commit=False)
         
         # Recalculate total price if relevant fields changed
         update_data = item_in.model_dump(exclude_unset=True)
         recalc_fields = {'unit_price', 'weight_count', 'ojrat', 'profit', 'tax'}
         if any(field in update_data for field in recalc_fields):
             updated_item.total_price = self._calculate_item_total_price(updated_item)
-            db.commit()
-            db.refresh(updated_item)
             
-        transaction_service._recalculate_total_price(db, transaction=transaction)
+        transaction_service.apply_item_change(db, transaction=transaction, old_signed_price=old_signed_price, new_item=updated_item)
+        db.commit()
+        db.refresh(updated_item)
         return updated_item
         
     def delete_item(self, db: Session, *, item_id: uuid.UUID, current_user: User) -> TransactionItem:
@@ -82,10 +90,80 @@ class TransactionItemService:
                 detail="Items can only be deleted if the transaction is in 'draft' status."
             )
             
-        deleted_item = transaction_item_repo.remove(db, id=item_id)
-        transaction_service._recalculate_total_price(db, transaction=transaction)
+        old_signed_price = transaction_service._signed_price(item_to_delete.transaction_type, item_to_delete.total_price)
+        deleted_item = transaction_item_repo.remove(db, id=item_id, commit=False)
+        transaction_service.apply_item_change(db, transaction=transaction, old_signed_price=old_signed_price)
+        db.commit()
         return deleted_item
 
+    def create_transaction_with_items(self, db: Session, *, transaction_in: TransactionWithItemsCreate, current_user: User) -> Transaction:
+        """
+        Creates a draft transaction together with all of its items in a single DB transaction.
+        Item templates are validated in one query and every line is priced in one pass.
+        """
+        contact_service.get_contact_by_id(db, contact_id=transaction_in.contact_id)
+        item_service.validate_ids(db, item_ids={line.item_id for line in transaction_in.items})
+
+        items_data = []
+        for line in transaction_in.items:
+            item_data = line.model_dump()
+            item_data["total_price"] = self._calculate_item_total_price(line)
+            items_data.append(item_data)
+
+        transaction_data = transaction_in.model_dump(exclude={"items"})
+        transaction_data["recorder_id"] = current_user.id
+        transaction_data["total_price"] = sum(
+            transaction_service._signed_price(item_data["transaction_type"], item_data["total_price"])
+            for item_data in items_data
+        ) - transaction_in.discount
+
+        return transaction_repo.create_with_items(db, obj_in=transaction_data, items_in=items_data)
+
+    def bulk_modify_items(self, db: Session, *, transaction_id: uuid.UUID, items_in: TransactionItemsBulkModify, current_user: User) -> Transaction:
+        """
+        Creates, updates and deletes items of a draft transaction and recalculates its total,
+        all in a single DB transaction.
+        """
+        transaction = transaction_service.get_by_id(db, transaction_id=transaction_id, current_user=current_user, with_items=True)
+        if transaction.status != ApprovalStatus.DRAFT:
+            raise AppException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Items can only be modified if the transaction is in 'draft' status."
+            )
+
+        items_by_id = {item.id: item for item in transaction.items}
+        unknown_ids = ({item_update.id for item_update in items_in.update} | set(items_in.delete)) - items_by_id.keys()
+        if unknown_ids:
+            raise AppException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Transaction items {', '.join(sorted(str(i) for i in unknown_ids))} not found in this transaction."
+            )
+
+        # Validate every referenced item template in one query
+        item_service.validate_ids(
+            db,
+            item_ids={line.item_id for line in items_in.create}
+            | {item_update.item_id for item_update in items_in.update if item_update.item_id},
+        )
+
+        for item_id in items_in.delete:
+            # delete-orphan cascade removes the row on commit
+            transaction.items.remove(items_by_id[item_id])
+
+        for item_update in items_in.update:
+            item = items_by_id[item_update.id]
+            for field, value in item_update.model_dump(exclude_unset=True, exclude={"id"}).items():
+                setattr(item, field, value)
+            item.total_price = self._calculate_item_total_price(item)
+
+        for line in items_in.create:
+            transaction.items.append(TransactionItem(**line.model_dump(), total_price=self._calculate_item_total_price(line)))
+
+        transaction.total_price = transaction_service._calculate_total_price(transaction.items, transaction.discount)
+        db.commit()
+        db.refresh(transaction)
+        return transaction
+
     def _calculate_item_total_price(self, item: TransactionItem) -> int:
         """
         BUY: When we want to buy something, tax, profit, and labor (ojrat) are currently calculated as zero
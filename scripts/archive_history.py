@@ -0,0 +1,145 @@
+"""
+Command-line entry point for moving old audit_log and inventory rows out of the database into
+compressed, columnar archive files (see app/core/archive.py), and for querying those archives
+without restoring them. Archives live in ARCHIVE_DIR unless --archive-dir is given.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import uuid
+
+# --- Add project root to Python path ---
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+# ---
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+
+from app.db import base  # Registers all models with SQLAlchemy
+from app.core.exceptions import AppException
+from app.core.serialization import json_dumps
+from app.db.session import SessionLocal
+from app.models.enums.audit_log import OperationType
+from app.services.archive import archive_service
+
+console = Console()
+
+# Accepted date and time formats; without an offset, the local time zone applies.
+DATETIME_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f%z"]
+
+app = typer.Typer(
+    help="A utility for archiving old history rows and querying the archives.",
+    add_completion=False
+)
+
+def _aware(moment: Optional[datetime]) -> Optional[datetime]:
+    """Archives store UTC times, so naive input is read as local time."""
+    return moment.astimezone() if moment is not None and moment.tzinfo is None else moment
+
+def _confirm(message: str, yes: bool) -> bool:
+    if yes:
+        return True
+    confirm = console.input(f"[bold red]WARNING: {message} Continue? (yes/no): [/bold red]")
+    if confirm.lower() != "yes":
+        console.print("Operation cancelled.", style="green")
+        return False
+    return True
+
+@app.command("audit-log")
+def archive_audit_log(
+    before: datetime = typer.Option(..., formats=DATETIME_FORMATS, help="Archive the entries created before this time."),
+    archive_dir: Optional[Path] = typer.Option(None, help="Archive directory (default: ARCHIVE_DIR)."),
+    yes: bool = typer.Option(False, "--yes", help="Do not ask for confirmation."),
+):
+    """Moves the audit entries created before the cutoff into the archive."""
+    if not _confirm(f"Audit entries created before {before} will be moved out of the database.", yes):
+        return
+    with SessionLocal() as db:
+        archived = archive_service.archive_audit_log(db, before=_aware(before), directory=archive_dir)
+    console.print(f"Archived {archived} audit entries.", style="bold green")
+
+@app.command("inventory")
+def archive_inventory(
+    before: datetime = typer.Option(..., formats=DATETIME_FORMATS, help="Archive the snapshots created before this time."),
+    archive_dir: Optional[Path] = typer.Option(None, help="Archive directory (default: ARCHIVE_DIR)."),
+    yes: bool = typer.Option(False, "--yes", help="Do not ask for confirmation."),
+):
+    """Moves the inventory snapshots created before the cutoff (except the latest) and their changes into the archive."""
+    if not _confirm(f"Inventory snapshots created before {before} will be moved out of the database.", yes):
+        return
+    with SessionLocal() as db:
+        archived = archive_service.archive_inventory(db, before=_aware(before), directory=archive_dir)
+    console.print(f"Archived {archived['inventory']} snapshots and {archived['inventory_change']} changes.", style="bold green")
+
+@app.command("search-audit-log")
+def search_audit_log(
+    start_time: Optional[datetime] = typer.Option(None, formats=DATETIME_FORMATS, help="Only entries created at or after this time."),
+    end_time: Optional[datetime] = typer.Option(None, formats=DATETIME_FORMATS, help="Only entries created before this time."),
+    table_name: Optional[str] = typer.Option(None, help="Filter by table name (exact match)."),
+    record_id: Optional[uuid.UUID] = typer.Option(None, parser=uuid.UUID, help="Filter by the ID of the changed record."),
+    operation: Optional[OperationType] = typer.Option(None, help="Filter by the type of operation."),
+    user_id: Optional[uuid.UUID] = typer.Option(None, parser=uuid.UUID, help="Filter by the user who performed the action."),
+    archive_dir: Optional[Path] = typer.Option(None, help="Archive directory (default: ARCHIVE_DIR)."),
+):
+    """Prints the matching archived audit entries as NDJSON, oldest first."""
+    try:
+        entries = archive_service.search_audit_log(
+            directory=archive_dir,
+            start_time=_aware(start_time),
+            end_time=_aware(end_time),
+            table_name=table_name,
+            record_id=record_id,
+            operation=operation,
+            user_id=user_id,
+        )
+        for entry in entries:
+            sys.stdout.write(json_dumps(entry) + "\n")
+    except AppException as e:
+        console.print(e.detail, style="bold red")
+        raise typer.Exit(code=1)
+
+@app.command("inventory-at")
+def inventory_at(
+    at: datetime = typer.Argument(..., formats=DATETIME_FORMATS, help="The moment to look at."),
+    archive_dir: Optional[Path] = typer.Option(None, help="Archive directory (default: ARCHIVE_DIR)."),
+):
+    """Prints the inventory snapshot in effect at a moment, from the database or the archive."""
+    try:
+        with SessionLocal() as db:
+            snapshot = archive_service.get_inventory_at(db, at=_aware(at), directory=archive_dir)
+    except AppException as e:
+        console.print(e.detail, style="bold red")
+        raise typer.Exit(code=1)
+    console.print_json(json_dumps(snapshot))
+
+@app.command("info")
+def info(
+    archive_dir: Optional[Path] = typer.Option(None, help="Archive directory (default: ARCHIVE_DIR)."),
+):
+    """Lists the archives with their chunks, rows, time range and size."""
+    table = Table(title="Archives")
+    table.add_column("Archive")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Rows", justify="right")
+    table.add_column("Oldest")
+    table.add_column("Newest")
+    table.add_column("Size (kB)", justify="right")
+    for name, summary in archive_service.describe(archive_dir).items():
+        table.add_row(
+            name,
+            str(summary["chunks"]),
+            str(summary["rows"]),
+            f"{summary['oldest']:%Y-%m-%d %H:%M}" if summary["oldest"] else "-",
+            f"{summary['newest']:%Y-%m-%d %H:%M}" if summary["newest"] else "-",
+            f"{summary['size_bytes'] / 1024:.0f}",
+        )
+    console.print(table)
+
+if __name__ == "__main__":
+    env_path = root_dir.parent / ".env"
+    load_dotenv(dotenv_path=env_path)
+    app()
@@ -0,0 +1,88 @@
+"""
+Command-line entry point for maintaining the monthly partitions of audit_log: listing them,
+creating future months ahead of time and applying the retention period to old months.
+Run `ensure` and `retain` from cron (e.g. daily) on servers that run for months without a restart.
+"""
+import sys
+from pathlib import Path
+from typing import Optional
+
+# --- Add project root to Python path ---
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+# ---
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+
+from app.db import base  # Registers all models with SQLAlchemy
+from app.core.exceptions import AppException
+from app.db.session import SessionLocal
+from app.services.audit_log_partition import RetentionAction, audit_log_partition_service
+
+console = Console()
+
+app = typer.Typer(
+    help="A utility for maintaining the monthly audit_log partitions.",
+    add_completion=False
+)
+
+@app.command("list")
+def list_partitions():
+    """Lists the partitions with their time range, estimated rows and size."""
+    with SessionLocal() as db:
+        partitions = audit_log_partition_service.list_partitions(db)
+    table = Table(title="audit_log partitions")
+    table.add_column("Partition")
+    table.add_column("From")
+    table.add_column("To")
+    table.add_column("Rows (est.)", justify="right")
+    table.add_column("Size (kB)", justify="right")
+    for partition in partitions:
+        table.add_row(
+            partition.name,
+            f"{partition.range_start:%Y-%m-%d}" if partition.range_start else "-",
+            f"{partition.range_end:%Y-%m-%d}" if partition.range_end else "-",
+            str(partition.estimated_rows),
+            f"{partition.size_bytes / 1024:.0f}",
+        )
+    console.print(table)
+
+@app.command("ensure")
+def ensure(
+    months_ahead: Optional[int] = typer.Option(None, help="Months created ahead of the current one (default: AUDIT_LOG_PARTITION_MONTHS_AHEAD)."),
+):
+    """Creates the current and upcoming monthly partitions that are missing."""
+    with SessionLocal() as db:
+        created = audit_log_partition_service.ensure_partitions(db, months_ahead=months_ahead)
+    console.print(f"Created {len(created)} partitions: {', '.join(created) or '-'}", style="bold green")
+
+@app.command("retain")
+def retain(
+    action: RetentionAction = typer.Option(..., help="detach: keep old months as standalone tables; archive: write them to gzipped CSV and drop them; drop: delete them."),
+    keep_months: Optional[int] = typer.Option(None, help="Whole months kept besides the current one (default: AUDIT_LOG_RETENTION_MONTHS)."),
+    archive_dir: Optional[Path] = typer.Option(None, help="Directory for the archive files (required with --action archive)."),
+    yes: bool = typer.Option(False, "--yes", help="Do not ask for confirmation."),
+):
+    """Detaches, archives or drops the partitions older than the retention period."""
+    if action != RetentionAction.DETACH and not yes:
+        confirm = console.input(
+            f"[bold red]WARNING: Old audit log partitions will be removed from the database ({action.value}). Continue? (yes/no): [/bold red]"
+        )
+        if confirm.lower() != "yes":
+            console.print("Operation cancelled.", style="green")
+            return
+    try:
+        with SessionLocal() as db:
+            handled = audit_log_partition_service.apply_retention(db, action=action, keep_months=keep_months, archive_dir=archive_dir)
+    except AppException as e:
+        console.print(e.detail, style="bold red")
+        raise typer.Exit(code=1)
+    console.print(f"{action.value}: {len(handled)} partitions: {', '.join(handled) or '-'}", style="bold green")
+
+if __name__ == "__main__":
+    env_path = root_dir.parent / ".env"
+    load_dotenv(dotenv_path=env_path)
+    app()
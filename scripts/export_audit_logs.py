@@ -0,0 +1,59 @@
+"""
+Command-line entry point for exporting the audit log as NDJSON (one JSON object per line),
+optionally gzip-compressed. Rows are streamed from a server-side cursor straight to the
+file, so extracts covering months run in constant memory.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import uuid
+
+# --- Add project root to Python path ---
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+# ---
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+
+from app.db import base  # Registers all models with SQLAlchemy
+from app.models.enums.audit_log import OperationType
+from app.services.export import export_service
+
+console = Console()
+
+# Accepted --start-time/--end-time formats; without an offset, the database time zone applies.
+DATETIME_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f%z"]
+
+
+def main(
+    output: Path = typer.Argument(..., help="File to write; a name ending in .gz is gzip-compressed."),
+    start_time: Optional[datetime] = typer.Option(None, formats=DATETIME_FORMATS, help="Only entries created at or after this time."),
+    end_time: Optional[datetime] = typer.Option(None, formats=DATETIME_FORMATS, help="Only entries created before this time."),
+    table_name: Optional[str] = typer.Option(None, help="Filter by table name (case-insensitive, partial match)."),
+    operation: Optional[OperationType] = typer.Option(None, help="Filter by the type of operation."),
+    user_id: Optional[uuid.UUID] = typer.Option(None, parser=uuid.UUID, help="Filter by the user who performed the action."),
+):
+    """Exports the matching audit entries, oldest first."""
+    content = export_service.stream_audit_logs(
+        compress=output.suffix == ".gz",
+        user_id=user_id,
+        operation=operation,
+        table_name=table_name,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    written = 0
+    with open(output, "wb") as file:
+        for chunk in content:
+            file.write(chunk)
+            written += len(chunk)
+    console.print(f"Audit log exported to {output} ({written / 1024:.0f} kB).", style="bold green")
+
+
+if __name__ == "__main__":
+    env_path = root_dir.parent / ".env"
+    load_dotenv(dotenv_path=env_path)
+    typer.run(main)
@@ -0,0 +1,51 @@
+"""
+Command-line entry point for rebuilding the precomputed read models (report tables)
+from the source tables. The API keeps them up to date incrementally; a rebuild is only
+needed after data was changed outside of it, e.g. by a manual fix or a restore.
+"""
+import sys
+from pathlib import Path
+
+# --- Add project root to Python path ---
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+# ---
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+
+from app.db import base  # Registers all models with SQLAlchemy
+from app.db.session import SessionLocal
+from app.services.contact_rollup import contact_rollup_service
+from app.services.daily_summary import daily_summary_service
+
+console = Console()
+
+app = typer.Typer(
+    help="A utility for rebuilding the precomputed read models.",
+    add_completion=False
+)
+
+@app.callback()
+def main():
+    """Rebuilds one read model from the source tables, in a single DB transaction."""
+
+@app.command("daily-summary")
+def daily_summary():
+    """Rebuilds the daily sales and purchase summary."""
+    with SessionLocal() as db:
+        rows = daily_summary_service.rebuild(db)
+    console.print(f"Daily summary rebuilt with {rows} rows.", style="bold green")
+
+@app.command("contact-rollup")
+def contact_rollup():
+    """Rebuilds the per-contact financial rollup."""
+    with SessionLocal() as db:
+        rows = contact_rollup_service.rebuild(db)
+    console.print(f"Contact rollup rebuilt with {rows} rows.", style="bold green")
+
+if __name__ == "__main__":
+    env_path = root_dir.parent / ".env"
+    load_dotenv(dotenv_path=env_path)
+    app()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the change capture of the audit listener and its JSON encoding.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.audit_listener import get_changes, get_record_id
+from app.core.serialization import json_dumps
+from app.core.utils import json_serializer
+from app.models.contact import Contact
+from app.models.enums.contact import ContactType
+from app.models.user import User
+
+def _loaded_contact() -> Contact:
+    """A contact that looks freshly loaded from the database."""
+    contact = Contact(id=uuid.uuid4())
+    for key, value in {"first_name": "Old", "last_name": "Doe", "type": ContactType.CUSTOMER, "phone_number": None}.items():
+        set_committed_value(contact, key, value)
+    make_transient_to_detached(contact)
+    return contact
+
+def test_get_changes_keeps_only_changed_columns_and_the_primary_key():
+    """
+    Unchanged and re-assigned columns and relationships are left out of the diff.
+    """
+    contact = _loaded_contact()
+    contact.first_name = "New"
+    contact.last_name = "Doe"
+    contact.creator = User(username="clerk")
+
+    before_state, after_state = get_changes(contact)
+
+    assert before_state == {"id": contact.id, "first_name": "Old"}
+    assert after_state == {"id": contact.id, "first_name": "New"}
+
+def test_get_changes_returns_none_without_column_changes():
+    contact = _loaded_contact()
+    contact.last_name = "Doe"
+
+    assert get_changes(contact) is None
+
+def test_get_changes_takes_the_primary_key_of_an_expired_instance_from_its_identity():
+    """
+    After a commit (expire_on_commit) the instance's dict no longer holds its id.
+    """
+    contact = _loaded_contact()
+    contact_id = contact.id
+    session = Session()
+    session.add(contact)
+    session.expire(contact)
+    contact.first_name = "New"
+
+    before_state, after_state = get_changes(contact)
+
+    assert before_state["id"] == after_state["id"] == contact_id
+    assert after_state["first_name"] == "New"
+    # Read without a refresh, which would fail in this unbound session.
+    assert get_record_id(contact) == contact_id
+
+def test_json_dumps_matches_the_audit_json_serializer():
+    """
+    The single-pass encoder writes raw column values exactly like the previous two-pass conversion.
+    """
+    state = {
+        "id": uuid.uuid4(),
+        "weight_count": Decimal("2.50"),
+        "created_at": datetime(2025, 10, 1, 8, 30, 0, 125, tzinfo=timezone.utc),
+        "type": ContactType.SUPPLIER,
+        "item_deltas": {"new_gold": "-2.50"},
+        "note": None,
+    }
+
+    assert json.loads(json_dumps(state)) == json.loads(json.dumps(state, default=json_serializer))
@@ -0,0 +1,46 @@
+"""
+Unit tests for the idempotency middleware helpers.
+
+These tests do not touch the idempotency store; they cover how callers are identified
+and how an existing record is turned into a response for a retry.
+"""
+
+from starlette.datastructures import Headers
+
+from app.core.idempotency import REPLAYED_HEADER, IdempotencyMiddleware
+from app.core.security import create_access_token
+from app.schema.idempotency import StoredResponse
+
+middleware = IdempotencyMiddleware(app=None)
+
+def test_get_caller_uses_token_subject():
+    """
+    Tests that two different tokens of the same user share a caller scope.
+    """
+    first = Headers({"authorization": f"Bearer {create_access_token('user-1')}"})
+    second = Headers({"authorization": f"Bearer {create_access_token('user-1')}x"})
+
+    assert middleware._get_caller(first) == "user:user-1"
+    # A token with a broken signature is scoped to the raw header, never to the user.
+    assert middleware._get_caller(second).startswith("authorization:")
+    assert middleware._get_caller(Headers({})) == "anonymous"
+
+def test_build_existing_response():
+    """
+    Tests replay of a stored response and the errors for busy or reused keys.
+    """
+    stored = StoredResponse(
+        fingerprint="f",
+        status_code=201,
+        headers=[("content-type", "application/json")],
+        body=b'{"id": 1}',
+    )
+
+    replayed = middleware._build_existing_response(stored, fingerprint="f")
+    assert replayed.status_code == 201
+    assert replayed.body == b'{"id": 1}'
+    assert replayed.headers[REPLAYED_HEADER] == "true"
+
+    assert middleware._build_existing_response(stored, fingerprint="other").status_code == 422
+    in_progress = StoredResponse(fingerprint="f")
+    assert middleware._build_existing_response(in_progress, fingerprint="f").status_code == 409
@@ -2,11 +2,11 @@
 Unit tests for the utility functions in app/core/utils.py.
 """
 import pytest
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 import uuid
 from enum import Enum
-from app.core.utils import json_serializer
+from app.core.utils import gregorian_to_jalali, json_serializer
 
 def test_json_serializer_with_sqlalchemy_model():
     """
@@ -41,6 +41,12 @@ def test_json_serializer_with_datetime():
     now = datetime.now()
     assert json_serializer(now) == now.isoformat()
 
+def test_json_serializer_with_date():
+    """
+    Ensures that date objects (e.g. daily_summary.day) are serialized to YYYY-MM-DD.
+    """
+    assert json_serializer(date(2025, 10, 1)) == "2025-10-01"
+
 def test_json_serializer_with_uuid():
     """
     Ensures that UUID objects are correctly serialized to their string representation.
@@ -75,3 +81,12 @@ def test_json_serializer_with_unsupported_type():
     with pytest.raises(TypeError):
         json_serializer(UnsupportedType())
 
+
+def test_gregorian_to_jalali():
+    """
+    Checks Nowruz (the first day of the Jalali year), the last day of the first half
+    of the year and the last day of a leap year.
+    """
+    assert gregorian_to_jalali(date(2025, 3, 21)) == "1404-01-01"
+    assert gregorian_to_jalali(date(2025, 9, 22)) == "1404-06-31"
+    assert gregorian_to_jalali(date(2025, 3, 20)) == "1403-12-30"
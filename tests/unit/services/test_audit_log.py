@@ -0,0 +1,29 @@
+"""
+Unit tests for rebuilding a record's state from its audit entries.
+"""
+
+from app.models.audit_log import AuditLog
+from app.models.enums.audit_log import OperationType
+from app.services.audit_log import fold_states
+
+def _entry(operation, before_state=None, after_state=None) -> AuditLog:
+    return AuditLog(operation=operation, table_name="contact", before_state=before_state, after_state=after_state)
+
+def test_fold_states_applies_updates_over_the_created_state():
+    """
+    Each update overwrites only the columns it changed.
+    """
+    state, complete = fold_states([
+        _entry(OperationType.CREATE, after_state={"id": "c1", "first_name": "A", "phone_number": None}),
+        _entry(OperationType.UPDATE, before_state={"id": "c1", "first_name": "A"}, after_state={"id": "c1", "first_name": "B"}),
+        _entry(OperationType.UPDATE, before_state={"id": "c1", "phone_number": None}, after_state={"id": "c1", "phone_number": "0912"}),
+    ])
+
+    assert state == {"id": "c1", "first_name": "B", "phone_number": "0912"}
+    assert complete
+
+def test_fold_states_without_the_creation_is_partial_and_a_deletion_clears_it():
+    updates = [_entry(OperationType.UPDATE, before_state={"id": "c1", "first_name": "A"}, after_state={"id": "c1", "first_name": "B"})]
+
+    assert fold_states(updates) == ({"id": "c1", "first_name": "B"}, False)
+    assert fold_states(updates + [_entry(OperationType.DELETE, before_state={"id": "c1", "first_name": "B"})]) == (None, True)
@@ -0,0 +1,33 @@
+"""
+Unit tests for the month arithmetic behind the audit_log partitions.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.services.audit_log_partition import PARTITION_NAME_PATTERN, add_months, month_start, partition_name
+
+def test_month_start_uses_the_utc_month():
+    """
+    A moment early on the 1st in Tehran still belongs to the previous UTC month,
+    which is the partition its row is routed to.
+    """
+    tehran = timezone(timedelta(hours=3, minutes=30))
+
+    assert month_start(datetime(2026, 11, 1, 2, 0, tzinfo=tehran)) == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert month_start(datetime(2026, 11, 1, 4, 0, tzinfo=tehran)) == datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+def test_add_months_crosses_year_boundaries_both_ways():
+    month = datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+    assert add_months(month, 3) == datetime(2027, 2, 1, tzinfo=timezone.utc)
+    assert add_months(month, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert add_months(month, -12) == datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+def test_partition_names_match_the_pattern_left_out_of_autogenerate():
+    name = partition_name(datetime(2027, 2, 1, tzinfo=timezone.utc))
+
+    assert name == "audit_log_p2027_02"
+    assert PARTITION_NAME_PATTERN.match(name)
+    assert PARTITION_NAME_PATTERN.match("audit_log_default")
+    assert not PARTITION_NAME_PATTERN.match("audit_log")
+    assert not PARTITION_NAME_PATTERN.match("audit_outbox")
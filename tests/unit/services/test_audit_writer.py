@@ -0,0 +1,42 @@
+"""
+Unit tests for the queueing and row conversion of the AuditWriter.
+"""
+
+import queue
+import uuid
+
+from app.models.enums.audit_log import OperationType
+from app.services.audit_writer import AuditWriter
+
+def test_enqueue_defers_to_the_sweep_when_the_queue_is_full():
+    """
+    A full queue never blocks the caller; the extra rows are counted and a sweep is requested.
+    """
+    writer = AuditWriter()
+    writer._queue = queue.Queue(maxsize=2)
+
+    writer.enqueue([uuid.uuid4(), uuid.uuid4(), uuid.uuid4()])
+
+    stats = writer.stats()
+    assert (stats["queue_size"], stats["enqueued"], stats["deferred"]) == (2, 2, 1)
+    assert writer._sweep_requested.is_set()
+
+def test_to_row_restores_column_values_and_leaves_missing_states_out():
+    """
+    Outbox entries keep their capture time and enum name; a missing state is omitted so it stays SQL NULL.
+    """
+    user_id = uuid.uuid4()
+    row = AuditWriter()._to_row({
+        "user_id": str(user_id),
+        "operation": "CREATE",
+        "table_name": "contact",
+        "before_state": None,
+        "after_state": {"last_name": "Doe"},
+        "created_at": "2025-10-01T08:30:00+00:00",
+    })
+
+    assert row["user_id"] == user_id
+    assert row["operation"] is OperationType.CREATE
+    assert row["created_at"] == row["updated_at"]
+    assert row["created_at"].isoformat() == "2025-10-01T08:30:00+00:00"
+    assert "before_state" not in row and row["after_state"] == {"last_name": "Doe"}
@@ -0,0 +1,36 @@
+"""
+Unit tests for the streaming encoder of JSON backups.
+"""
+
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from app.core.utils import json_serializer
+from app.models.enums.item_type import ItemType
+from app.services.backup import encode_backup
+
+def test_encode_backup_matches_json_dumps_of_the_whole_document():
+    """
+    Rows split over several batches, empty tables, nested JSON, non-ASCII text and the
+    types handled by json_serializer come out exactly as json.dumps writes them.
+    """
+    columns = ["id", "created_at", "day", "item_type", "amount", "description", "item_deltas"]
+    rows = [
+        (uuid.uuid4(), datetime(2025, 10, 1, 8, 30, tzinfo=timezone.utc), date(2025, 10, 1), ItemType.NEW_GOLD, Decimal("12.50"), "طلای نو\n\"18\"", {"new_gold": "1.5", "nested": {"a": [1, {}, []]}}),
+        (uuid.uuid4(), datetime(2025, 10, 2, tzinfo=timezone.utc), date(2025, 10, 2), ItemType.DOLLAR, Decimal("-3"), None, {}),
+        (uuid.uuid4(), datetime(2025, 10, 3, tzinfo=timezone.utc), date(2025, 10, 3), ItemType.EURO, Decimal("0"), "", []),
+    ]
+    tables = [
+        ("inventory_change", columns, [rows[:2], rows[2:]]),
+        ("payment", ["id"], []),
+        ("user_permission", ["user_id", "permission_id"], [[(rows[0][0], rows[1][0])]]),
+    ]
+    expected = json.dumps(
+        {name: [dict(zip(names, row)) for batch in batches for row in batch] for name, names, batches in tables},
+        indent=4, default=json_serializer,
+    )
+
+    assert "".join(encode_backup(tables)) == expected
+    assert "".join(encode_backup([])) == json.dumps({}, indent=4)
@@ -0,0 +1,107 @@
+"""
+Unit tests for the deltas the ContactRollupService applies to a contact's rollup.
+"""
+
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.enums.payment import PaymentDirection
+from app.models.enums.transaction import TransactionType
+from app.services import account_ledger as account_ledger_module
+from app.services import contact_rollup as contact_rollup_module
+from app.services.account_ledger import account_ledger_service
+from app.services.contact_rollup import contact_rollup_service
+
+CONTACT_ID = uuid.uuid4()
+CREATED_AT = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+@pytest.fixture
+def applied(monkeypatch):
+    """Records every apply_deltas call instead of upserting: [(contact_id, deltas, activity_at)]."""
+    calls = []
+    monkeypatch.setattr(
+        contact_rollup_module.contact_rollup_repo, "apply_deltas",
+        lambda db, *, contact_id, deltas, activity_at=None: calls.append((contact_id, deltas, activity_at)),
+    )
+    return calls
+
+def _totals(calls) -> Counter:
+    totals = Counter()
+    for _, deltas, _ in calls:
+        totals.update(deltas)
+    return totals
+
+def test_transaction_approval_and_its_reversal_net_to_zero(applied):
+    transaction = SimpleNamespace(contact_id=CONTACT_ID, created_at=CREATED_AT, items=[
+        SimpleNamespace(transaction_type=TransactionType.SELL, total_price=1000),
+        SimpleNamespace(transaction_type=TransactionType.BUY, total_price=300),
+        SimpleNamespace(transaction_type=TransactionType.SELL, total_price=50),
+    ])
+
+    contact_rollup_service.apply_transaction(None, transaction=transaction)
+    assert applied == [(CONTACT_ID, {"sold_total": 1050, "bought_total": 300, "transaction_count": 1}, CREATED_AT)]
+
+    contact_rollup_service.apply_transaction(None, transaction=transaction, is_reversal=True)
+    # A reversal never moves last_activity_at.
+    assert applied[1][2] is None
+    assert set(_totals(applied).values()) == {0}
+
+def test_payment_approval_and_its_reversal_net_to_zero(applied):
+    incoming = SimpleNamespace(contact_id=CONTACT_ID, created_at=CREATED_AT, direction=PaymentDirection.INCOMING, amount=700)
+    outgoing = SimpleNamespace(contact_id=CONTACT_ID, created_at=CREATED_AT, direction=PaymentDirection.OUTGOING, amount=200)
+
+    contact_rollup_service.apply_payment(None, payment=incoming)
+    contact_rollup_service.apply_payment(None, payment=outgoing)
+    assert _totals(applied) == {"incoming_total": 700, "outgoing_total": 200, "payment_count": 2}
+
+    contact_rollup_service.apply_payment(None, payment=incoming, is_reversal=True)
+    contact_rollup_service.apply_payment(None, payment=outgoing, is_reversal=True)
+    assert set(_totals(applied).values()) == {0}
+
+def test_internal_transfers_and_payments_without_a_contact_are_ignored(applied):
+    transfer = SimpleNamespace(contact_id=CONTACT_ID, created_at=CREATED_AT, direction=PaymentDirection.INTERNAL_TRANSFER, amount=500)
+    anonymous = SimpleNamespace(contact_id=None, created_at=CREATED_AT, direction=PaymentDirection.INCOMING, amount=500)
+
+    for payment in (transfer, anonymous):
+        contact_rollup_service.apply_payment(None, payment=payment)
+        contact_rollup_service.apply_payment(None, payment=payment, is_reversal=True)
+
+    assert applied == []
+
+def test_ledger_debt_follows_the_ledger_through_its_lifecycle(applied, monkeypatch):
+    """
+    Creating, updating and deleting a ledger, and approving and rejecting a payment against
+    it, move the rollup's debt exactly as the ledger's own debt moves.
+    """
+    ledger = SimpleNamespace(id=uuid.uuid4(), contact_id=CONTACT_ID, debt=0)
+    db = SimpleNamespace(info={})
+
+    def update(db, *, db_obj, obj_in):
+        db_obj.debt = obj_in.debt
+        return db_obj
+
+    monkeypatch.setattr(account_ledger_module.contact_repo, "get", lambda db, id: SimpleNamespace(id=id))
+    monkeypatch.setattr(account_ledger_module.account_ledger_repo, "get", lambda db, id: ledger)
+    monkeypatch.setattr(account_ledger_module.account_ledger_repo, "create", lambda db, obj_in: setattr(ledger, "debt", obj_in.debt) or ledger)
+    monkeypatch.setattr(account_ledger_module.account_ledger_repo, "update", update)
+    monkeypatch.setattr(account_ledger_module.account_ledger_repo, "remove", lambda db, id: ledger)
+
+    account_ledger_service.create(db, ledger_in=SimpleNamespace(contact_id=CONTACT_ID, debt=1000))
+    account_ledger_service.update(db, ledger_id=ledger.id, ledger_in=SimpleNamespace(debt=1500))
+    assert _totals(applied)["ledger_debt"] == ledger.debt == 1500
+
+    payment = SimpleNamespace(account_ledger_id=ledger.id, direction=PaymentDirection.OUTGOING, amount=400)
+    account_ledger_service.update_debt_from_payment(db, payment=payment)
+    assert _totals(applied)["ledger_debt"] == ledger.debt == 1100
+    account_ledger_service.revert_debt_from_payment(db, payment=payment)
+    assert _totals(applied)["ledger_debt"] == ledger.debt == 1500
+
+    # An incoming payment does not change the ledger's debt.
+    account_ledger_service.update_debt_from_payment(db, payment=SimpleNamespace(account_ledger_id=ledger.id, direction=PaymentDirection.INCOMING, amount=400))
+    account_ledger_service.delete(db, ledger_id=ledger.id)
+    assert _totals(applied)["ledger_debt"] == 0
+    assert all(contact_id == CONTACT_ID for contact_id, _, _ in applied)
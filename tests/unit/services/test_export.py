@@ -0,0 +1,32 @@
+"""
+Unit tests for the NDJSON encoding and gzip streaming of the ExportService.
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+
+from app.services.export import ExportService
+
+def test_stream_ndjson_embeds_json_text_and_gzips_the_whole_stream():
+    """
+    JSON columns arrive as text and are written unparsed; SQL NULL stays null. The gzip
+    stream of several batches decompresses to the same lines.
+    """
+    service = ExportService()
+    batches = [
+        [("a1", datetime(2025, 10, 1, 8, 30, tzinfo=timezone.utc), None, '{"id": "c1", "amount": "12.50"}')],
+        [("a2", datetime(2025, 10, 2, tzinfo=timezone.utc), '{"id": "c1"}', None)],
+    ]
+    service._iter_batches = lambda build_query: iter(batches)
+    names = ["id", "created_at", "before_state", "after_state"]
+
+    plain = b"".join(service._stream_ndjson(None, names, {"before_state", "after_state"}))
+    compressed = b"".join(service._gzip(service._stream_ndjson(None, names, {"before_state", "after_state"})))
+
+    lines = [json.loads(line) for line in plain.splitlines()]
+    assert lines == [
+        {"id": "a1", "created_at": "2025-10-01T08:30:00+00:00", "before_state": None, "after_state": {"id": "c1", "amount": "12.50"}},
+        {"id": "a2", "created_at": "2025-10-02T00:00:00+00:00", "before_state": {"id": "c1"}, "after_state": None},
+    ]
+    assert gzip.decompress(compressed) == plain
@@ -0,0 +1,53 @@
+"""
+Unit tests for the delta calculations the InventoryService queues for the inventory writer.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models.enums.payment import PaymentDirection
+from app.models.enums.transaction import TransactionType
+from app.services.inventory import inventory_service
+
+def _trans_item(name: str, transaction_type: TransactionType, weight_count: str):
+    return SimpleNamespace(
+        item=SimpleNamespace(name=name),
+        transaction_type=transaction_type,
+        weight_count=Decimal(weight_count),
+    )
+
+def test_item_deltas_from_transaction():
+    """
+    SELL lines remove items and BUY lines add them; lines of the same item are summed.
+    """
+    transaction = SimpleNamespace(items=[
+        _trans_item("new_gold", TransactionType.SELL, "2.5"),
+        _trans_item("new_gold", TransactionType.BUY, "1.0"),
+        _trans_item("used_gold", TransactionType.BUY, "3.25"),
+    ])
+
+    deltas = inventory_service._calculate_item_deltas_from_transaction(transaction, is_reversal=False)
+
+    assert deltas == {"new_gold": Decimal("-1.5"), "used_gold": Decimal("3.25")}
+
+def test_item_deltas_from_transaction_reversal():
+    """
+    A reversal produces exactly the negated deltas.
+    """
+    transaction = SimpleNamespace(items=[_trans_item("new_gold", TransactionType.SELL, "2.5")])
+
+    deltas = inventory_service._calculate_item_deltas_from_transaction(transaction, is_reversal=True)
+
+    assert deltas == {"new_gold": Decimal("2.5")}
+
+def test_money_delta_from_payment():
+    """
+    Incoming payments add money, outgoing ones remove it, internal transfers change nothing.
+    """
+    def payment(direction):
+        return SimpleNamespace(amount=1000, direction=direction)
+
+    assert inventory_service._calculate_money_delta_from_payment(payment(PaymentDirection.INCOMING), is_reversal=False) == 1000
+    assert inventory_service._calculate_money_delta_from_payment(payment(PaymentDirection.OUTGOING), is_reversal=False) == -1000
+    assert inventory_service._calculate_money_delta_from_payment(payment(PaymentDirection.OUTGOING), is_reversal=True) == 1000
+    assert inventory_service._calculate_money_delta_from_payment(payment(PaymentDirection.INTERNAL_TRANSFER), is_reversal=False) == 0
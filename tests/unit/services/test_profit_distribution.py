@@ -0,0 +1,36 @@
+"""
+Unit tests for the time weighting and rounding of the ProfitDistributionService.
+"""
+
+import numpy as np
+
+from app.services.profit_distribution import allocate, compute_time_weights
+
+def test_compute_time_weights_counts_capital_from_the_later_of_investment_and_period_start():
+    """
+    Capital invested before the period counts for all of it, later capital only for the rest,
+    and capital invested after the period end not at all.
+    """
+    weights = compute_time_weights(
+        investor_index=np.array([0, 1, 1, 2]),
+        amounts=np.array([100.0, 100.0, 50.0, 1000.0]),
+        invested_at=np.array([-50.0, 50.0, 0.0, 150.0]),
+        period_start=0.0,
+        period_end=100.0,
+        investor_count=3,
+    )
+
+    # Capital-time: 100*100 = 10000, 100*50 + 50*100 = 10000, 0
+    assert weights.tolist() == [0.5, 0.5, 0.0]
+
+def test_allocate_hands_leftover_rials_to_the_largest_remainders():
+    """
+    The shares always add up to the total, and the rials lost to flooring go to the
+    largest fractional parts, ties broken by position.
+    """
+    shares = allocate(100, np.array([1, 1, 1]) / 3)
+    assert shares.tolist() == [34, 33, 33]
+    assert allocate(10, np.array([0.55, 0.45])).tolist() == [6, 4]
+
+    weights = np.random.default_rng(7).random(1000)
+    assert allocate(987_654_321, weights / weights.sum()).sum() == 987_654_321
@@ -0,0 +1,34 @@
+"""
+Unit tests for the vectorized pricing in the QuoteService.
+"""
+
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.services.quote import quote_service
+from app.services.transaction_item import transaction_item_service
+
+def _line(unit_price, weight_count, ojrat=None, profit=None, tax=None):
+    return SimpleNamespace(unit_price=unit_price, weight_count=weight_count, ojrat=ojrat, profit=profit, tax=tax)
+
+def test_price_lines_matches_decimal_formula():
+    """
+    The vectorized totals must equal the Decimal formula to the rial, including lines
+    that land exactly on an integer and lines too large for float64.
+    """
+    rng = random.Random(42)
+    percent = lambda: Decimal(rng.randint(0, 3000)) / 100
+    lines = [
+        _line(1000, Decimal("2.00"), Decimal("10"), Decimal("5"), Decimal("9")),  # 2337.9 -> 2337
+        _line(500, Decimal("10.00")),                                             # exactly 5000
+        _line(1000, Decimal("1.00"), Decimal("10"), Decimal("0"), Decimal("0")),  # exactly 1100
+        _line(2 ** 60, Decimal("1.50"), Decimal("1.25")),                         # beyond float64
+    ] + [
+        _line(rng.randint(0, 10 ** 9), Decimal(rng.randint(1, 100000)) / 100, percent(), percent(), percent())
+        for _ in range(2000)
+    ]
+
+    expected = [transaction_item_service._calculate_item_total_price(line) for line in lines]
+
+    assert quote_service._price_lines(lines) == expected
@@ -0,0 +1,40 @@
+"""
+Unit tests for bank statement parsing in the ReconciliationService.
+"""
+
+import io
+from datetime import date
+
+import pytest
+
+from app.core.exceptions import AppException
+from app.models.enums.payment import PaymentDirection
+from app.services.reconciliation import reconciliation_service
+
+def test_parse_statement_reads_signed_amounts():
+    """
+    Positive amounts are deposits, negative ones withdrawals; separators and extra columns are ignored.
+    """
+    statement = io.StringIO(
+        "Date,Amount,Description,Balance\n"
+        "2025-10-01,\"1,500,000\",salary,9\n"
+        "2025-10-02T13:45:00,-20000,,9\n"
+    )
+
+    lines = list(reconciliation_service.parse_statement(statement))
+
+    assert [(line.line_number, line.date, line.amount, line.direction, line.description) for line in lines] == [
+        (2, date(2025, 10, 1), 1_500_000, PaymentDirection.INCOMING, "salary"),
+        (3, date(2025, 10, 2), 20_000, PaymentDirection.OUTGOING, None),
+    ]
+
+def test_parse_statement_rejects_bad_lines():
+    """
+    A malformed line stops the upload with the line number in the error.
+    """
+    with pytest.raises(AppException) as exc_info:
+        list(reconciliation_service.parse_statement(io.StringIO("date,amount\n2025-10-01,10\n2025-10-01,ten\n")))
+    assert exc_info.value.detail.startswith("Line 3:")
+
+    with pytest.raises(AppException):
+        list(reconciliation_service.parse_statement(io.StringIO("date,description\n")))
@@ -0,0 +1,21 @@
+"""
+Unit tests for isolated business logic within the TransactionService.
+"""
+
+from types import SimpleNamespace
+
+from app.models.enums.transaction import TransactionType
+from app.services.transaction import transaction_service
+
+def test_calculate_total_price_signs_items_and_applies_discount():
+    """
+    SELL items are added to the total, BUY items are subtracted, then the discount is applied.
+    """
+    items = [
+        SimpleNamespace(transaction_type=TransactionType.SELL, total_price=2000),
+        SimpleNamespace(transaction_type=TransactionType.BUY, total_price=500),
+        SimpleNamespace(transaction_type=TransactionType.SELL, total_price=30),
+    ]
+
+    # 2000 - 500 + 30 - 100 = 1430
+    assert transaction_service._calculate_total_price(items, discount=100) == 1430